@@ -0,0 +1,131 @@
+# backend/application_counters.py
+"""
+Care application counts read from the trigger-maintained counter tables
+(migrations/004_care_application_counters.sql) instead of recounting
+care_applications on every call:
+
+  * status_counts()   - per (care_request_id, status), for the dashboards
+  * caregiver_count() - applications a caregiver holds, for the limit check
+
+Both are primary-key lookups. `reconcile()` recounts the source rows and
+reports (or, with fix=True, repairs) any drift. From backend/:
+    python application_counters.py --reconcile [--fix]
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import db_pool
+
+logger = logging.getLogger("careconnect.application_counters")
+
+# A caregiver may hold at most APPLICATION_LIMIT applications in these statuses
+APPLICATION_LIMIT = 3
+ACTIVE_STATUSES = ("pending", "accepted", "interview_scheduled")
+
+# counter table -> the care_applications column it is keyed on (with status)
+COUNTER_TABLES = {
+    "care_application_counts": "care_request_id",
+    "care_application_caregiver_counts": "caregiver_user_id",
+}
+
+
+async def status_counts(
+    conn,
+    care_request_ids: Optional[List[str]] = None,
+    careseeker_user_id: Optional[str] = None
+) -> List[dict]:
+    """
+    [{"care_request_id", "status", "count"}] for non-zero counters. With
+    careseeker_user_id, only requests owned by that user.
+    """
+    joins, conditions, args = "", ["c.count > 0"], []
+    if careseeker_user_id:
+        args.append(careseeker_user_id)
+        joins = f"JOIN public.care_requests r ON r.id = c.care_request_id AND r.user_id = ${len(args)}::uuid"
+    if care_request_ids is not None:
+        args.append(care_request_ids)
+        conditions.append(f"c.care_request_id = ANY(${len(args)}::uuid[])")
+
+    rows = await conn.fetch(f"""
+        SELECT c.care_request_id::text AS care_request_id, c.status, c.count
+        FROM public.care_application_counts c {joins}
+        WHERE {' AND '.join(conditions)}
+    """, *args)
+    return [dict(row) for row in rows]
+
+
+async def caregiver_count(conn, caregiver_user_id: str, statuses: Optional[Sequence[str]] = None) -> int:
+    """Applications held by a caregiver, optionally only those in `statuses`."""
+    query = ("SELECT coalesce(sum(count), 0)::int FROM public.care_application_caregiver_counts "
+             "WHERE caregiver_user_id = $1::uuid")
+    if statuses is None:
+        return await conn.fetchval(query, caregiver_user_id)
+    return await conn.fetchval(query + " AND status = ANY($2::text[])", caregiver_user_id, list(statuses))
+
+
+def _drift_query(table: str, key: str) -> str:
+    return f"""
+        WITH actual AS (
+            SELECT {key}::text AS key, status::text AS status, count(*)::int AS count
+            FROM public.care_applications
+            WHERE {key} IS NOT NULL AND status IS NOT NULL
+            GROUP BY {key}, status
+        ), stored AS (
+            SELECT {key}::text AS key, status, count FROM public.{table}
+        )
+        SELECT coalesce(a.key, s.key) AS key, coalesce(a.status, s.status) AS status,
+               coalesce(a.count, 0) AS expected, coalesce(s.count, 0) AS stored
+        FROM actual a FULL JOIN stored s ON s.key = a.key AND s.status = a.status
+        WHERE coalesce(a.count, 0) <> coalesce(s.count, 0)
+    """
+
+
+async def reconcile(fix: bool = False) -> Dict[str, List[dict]]:
+    """
+    Compare every counter with a fresh count of care_applications; returns the
+    mismatches per table. With fix=True the counter tables are rebuilt while
+    application writes are held off, so nothing slips in between.
+    """
+    pool = await db_pool.get_pool()
+    drift: Dict[str, List[dict]] = {}
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            if fix:
+                await conn.execute("LOCK TABLE public.care_applications IN SHARE ROW EXCLUSIVE MODE")
+            for table, key in COUNTER_TABLES.items():
+                drift[table] = [dict(row) for row in await conn.fetch(_drift_query(table, key))]
+                if drift[table]:
+                    logger.warning("%s: %d counters out of step", table, len(drift[table]))
+                if fix:
+                    await conn.execute(f"TRUNCATE public.{table}")
+                    await conn.execute(f"""
+                        INSERT INTO public.{table} ({key}, status, count)
+                        SELECT {key}, status::text, count(*)
+                        FROM public.care_applications
+                        WHERE {key} IS NOT NULL AND status IS NOT NULL
+                        GROUP BY {key}, status
+                    """)
+    return drift
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check care application counters against the source rows")
+    parser.add_argument("--reconcile", action="store_true", help="Recount and report drifted counters")
+    parser.add_argument("--fix", action="store_true", help="Also rebuild the counter tables (implies --reconcile)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def _main():
+        try:
+            if args.reconcile or args.fix:
+                for table, rows in (await reconcile(fix=args.fix)).items():
+                    print(f"{table}: {len(rows)} drifted{' (rebuilt)' if args.fix else ''}")
+                    for row in rows[:20]:
+                        print(f"  {row['key']} {row['status']}: stored {row['stored']}, actual {row['expected']}")
+        finally:
+            await db_pool.close_pool()
+
+    asyncio.run(_main())
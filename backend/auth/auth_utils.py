@@ -2,36 +2,97 @@
 
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import hashlib
+import logging
 import os
-from jwt import decode, PyJWKClient
+import threading
+import time
+from collections import OrderedDict
+import jwt
 from dotenv import load_dotenv
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 security = HTTPBearer()
 
-from fastapi import Depends, HTTPException
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import os
-import jwt
+# key=value auth logging, silent unless AUTH_DEBUG_LOG is set
+logger = logging.getLogger("careconnect.auth")
+if os.getenv("AUTH_DEBUG_LOG", "").lower() in ("1", "true", "yes"):
+    logger.setLevel(logging.DEBUG)
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+
+# Verified-token cache: sha256(token) -> (sub, exp, cached_until)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+JWT_CACHE_MAX_TTL = int(os.getenv("JWT_CACHE_MAX_TTL", "300"))  # seconds, for tokens without exp
+
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_get(digest: str, now: float):
+    with _token_cache_lock:
+        entry = _token_cache.get(digest)
+        if entry is None:
+            _token_cache_stats["misses"] += 1
+            return None
+        sub, exp, cached_until = entry
+        if (exp is not None and exp <= now) or cached_until <= now:
+            del _token_cache[digest]
+            _token_cache_stats["misses"] += 1
+            if exp is not None and exp <= now:
+                raise jwt.ExpiredSignatureError("Signature has expired")
+            return None
+        _token_cache.move_to_end(digest)
+        _token_cache_stats["hits"] += 1
+        return sub
+
+
+def _cache_put(digest: str, sub: str, exp, now: float):
+    cached_until = now + JWT_CACHE_MAX_TTL if exp is None else exp
+    with _token_cache_lock:
+        _token_cache[digest] = (sub, exp, cached_until)
+        _token_cache.move_to_end(digest)
+        while len(_token_cache) > JWT_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def clear_token_cache():
+    with _token_cache_lock:
+        _token_cache.clear()
+        _token_cache_stats["hits"] = _token_cache_stats["misses"] = 0
+
+
+def token_cache_stats() -> dict:
+    with _token_cache_lock:
+        return {"size": len(_token_cache), "max_size": JWT_CACHE_SIZE, **_token_cache_stats}
+
 
-security = HTTPBearer()
-SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
-print(SUPABASE_JWT_SECRET);
 def get_authenticated_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     try:
         token = credentials.credentials
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        now = time.time()
+
+        sub = _cache_get(digest, now)
+        if sub is not None:
+            logger.debug("jwt verified sub=%s cached=true", sub)
+            return sub
 
         # Decode using HS256 (HMAC) with Supabase JWT secret
-        payload = jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=["HS256"],audience="authenticated")
+        payload = jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=["HS256"], audience="authenticated")
 
-        print("✅ JWT Decoded:", payload)
-        return payload.get("sub")
+        sub = payload.get("sub")
+        if sub is not None:
+            _cache_put(digest, sub, payload.get("exp"), now)
+        logger.debug("jwt verified sub=%s cached=false exp=%s", sub, payload.get("exp"))
+        return sub
     except jwt.ExpiredSignatureError:
-        print("❌ Token expired")
+        logger.debug("jwt rejected reason=expired")
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError as e:
-        print("❌ JWT Decode Error:", str(e))
+        logger.debug("jwt rejected reason=%r", str(e))
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-
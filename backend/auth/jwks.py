@@ -0,0 +1,147 @@
+# auth/jwks.py
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from config import settings
+
+logger = logging.getLogger("careconnect.auth")
+security = HTTPBearer()
+
+
+class JWKSCache:
+    """
+    Process-wide cache of the signing keys published at a JWKS endpoint.
+
+    Keys are fetched once and served from memory; a daemon thread refreshes
+    them every `ttl` seconds so requests never wait on the network. A token
+    carrying an unknown `kid` (key rotation) triggers one synchronous refetch,
+    rate-limited by `min_refetch_interval` so random kids cannot hammer the
+    endpoint; the first fetch is limited the same way, so an endpoint that is
+    down at boot costs one request per interval rather than every request.
+    If a refresh fails the last good key set keeps being served.
+    """
+
+    def __init__(self, url: str, ttl: float = 600.0, min_refetch_interval: float = 30.0, timeout: float = 5.0):
+        self.url = url
+        self.ttl = ttl
+        self.min_refetch_interval = min_refetch_interval
+        self.timeout = timeout
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at = 0.0
+        self._last_attempt = float("-inf")
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.fetches = 0
+
+    def _fetch(self):
+        self._last_attempt = time.monotonic()
+        self.fetches += 1
+        response = httpx.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        keys = {}
+        for jwk in jwt.PyJWKSet.from_dict(response.json()).keys:
+            if jwk.key_id:
+                keys[jwk.key_id] = jwk
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        logger.debug("jwks refreshed url=%s kids=%s", self.url, ",".join(sorted(keys)))
+
+    def refresh(self) -> bool:
+        """Refetch the key set now; keep the previous one on failure."""
+        with self._lock:
+            try:
+                self._fetch()
+                return True
+            except Exception as e:
+                logger.warning("jwks refresh failed: %s", e)
+                return False
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.ttl):
+            self.refresh()
+
+    def start(self):
+        """Start the background refresher (idempotent)."""
+        with self._lock:
+            if self._refresher is None or not self._refresher.is_alive():
+                self._stop.clear()
+                self._refresher = threading.Thread(target=self._refresh_loop, name="jwks-refresh", daemon=True)
+                self._refresher.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=1)
+            self._refresher = None
+
+    def _may_refetch(self) -> bool:
+        return time.monotonic() - self._last_attempt >= self.min_refetch_interval
+
+    def get_signing_key(self, kid: str) -> jwt.PyJWK:
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        # Inside the refetch window (including while the endpoint is down at
+        # boot), fail fast rather than queueing on the lock behind a fetch
+        if not self._may_refetch():
+            raise jwt.InvalidTokenError(f"Unknown signing key id: {kid}")
+
+        with self._lock:
+            # Another thread may have fetched while we waited on the lock
+            key = self._keys.get(kid)
+            if key is None and self._may_refetch():
+                try:
+                    self._fetch()
+                except Exception as e:
+                    logger.warning("jwks fetch failed: %s", e)
+                key = self._keys.get(kid)
+
+        if self._refresher is None:
+            self.start()
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key id: {kid}")
+        return key
+
+    def get_signing_key_from_jwt(self, token: str) -> jwt.PyJWK:
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            raise jwt.InvalidTokenError("Token header has no kid")
+        return self.get_signing_key(kid)
+
+
+_jwks_cache: Optional[JWKSCache] = None
+_jwks_cache_lock = threading.Lock()
+
+
+def get_jwks_cache() -> JWKSCache:
+    global _jwks_cache
+    if _jwks_cache is None:
+        with _jwks_cache_lock:
+            if _jwks_cache is None:
+                base_url = os.getenv("SUPABASE_URL") or settings.SUPABASE_DB_URL
+                _jwks_cache = JWKSCache(
+                    settings.JWKS_URL or f"{base_url.rstrip('/')}/auth/v1/keys",
+                    ttl=settings.JWKS_TTL,
+                    min_refetch_interval=settings.JWKS_MIN_REFETCH_INTERVAL,
+                )
+    return _jwks_cache
+
+
+def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    try:
+        token = credentials.credentials
+        signing_key = get_jwks_cache().get_signing_key_from_jwt(token)
+        payload = jwt.decode(token, signing_key.key, algorithms=["RS256"])
+        return payload["sub"]
+    except Exception as e:
+        logger.debug("jwt rejected reason=%r", str(e))
+        raise HTTPException(status_code=401, detail="Invalid JWT token")
@@ -0,0 +1,483 @@
+# backend/bench_endpoints.py
+"""
+Load-test the hot endpoints in-process against the Supabase stand-in
+(supabase_stub.py) and compare the run with a saved baseline.
+
+Usage (from backend/):
+    python bench_endpoints.py                                  # run and print
+    python bench_endpoints.py --save-baseline bench_baseline.json
+    python bench_endpoints.py --baseline bench_baseline.json --threshold 0.25
+    python bench_endpoints.py --concurrency 32 --requests 1000 available_care_requests
+
+Each scenario seeds deterministic data, warms up, then drives its endpoint
+with `--concurrency` concurrent clients until `--requests` responses are in.
+Reported per scenario: p50 / p95 / p99 / mean latency (ms), throughput
+(req/s) and error count. With --baseline the run fails (exit code 1) if
+p50 or p95 latency grows, or throughput drops, by more than --threshold
+(a fraction; 0.25 = 25%), or if a scenario starts returning errors.
+
+Upstream calls go to the in-memory stand-in with `--upstream-latency-ms`
+added per call; asyncpg-backed routes get a canned in-memory connection
+with `--db-latency-ms` per query. Scenarios whose optional dependencies
+(OpenCV, wkhtmltopdf, ...) are missing are reported as skipped.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from supabase_stub import SupabaseStub, configure_environment, make_access_token, use_stub_async
+
+configure_environment()
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+import metrics  # noqa: E402
+import tracing  # noqa: E402
+import db_pool  # noqa: E402
+
+SEEKER_ID = "00000000-0000-0000-0000-00000000a001"
+CAREGIVER_ID = "00000000-0000-0000-0000-00000000c001"
+LOCATIONS = ["Kochi", "Thrissur", "Kozhikode", "Trivandrum", "Bangalore", "Chennai", "Mumbai", "Delhi"]
+SERVICES = ["bathing", "meals", "medication", "mobility", "companionship", "night_care"]
+STATUSES = ["pending", "shortlisted", "interview_scheduled", "accepted", "rejected", "withdrawn"]
+
+
+class SkipScenario(Exception):
+    pass
+
+
+def _timestamp(rng: random.Random) -> str:
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return (base + timedelta(minutes=rng.randrange(0, 500_000))).isoformat()
+
+
+def _care_request(rng: random.Random, user_id: str) -> dict:
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "user_id": user_id,
+        "location": rng.choice(LOCATIONS),
+        "recipient_age_range": rng.choice(["50-60", "60-70", "70-80", "80+"]),
+        "care_services_needed": rng.sample(SERVICES, rng.randint(1, 3)),
+        "primary_location_type": rng.choice(["home", "hospital"]),
+        "care_duration": rng.choice(["short_term", "long_term"]),
+        "care_start_date_preference": "immediately",
+        "specific_start_date": None,
+        "caregiver_requirements": None,
+        "transportation_provided": rng.random() < 0.3,
+        "accommodation_provided": rng.random() < 0.5,
+        "food_provided": rng.random() < 0.7,
+        "daily_working_hours": rng.choice(["4", "8", "12"]),
+        "excluded_schedule_days": None,
+        "estimated_budget": str(rng.randrange(10_000, 40_000, 1000)),
+        "special_needs": None,
+        "additional_expectations": None,
+        "status": "open",
+        "created_at": _timestamp(rng),
+    }
+
+
+def _jpeg(rng: random.Random, size: int = 320) -> bytes:
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise SkipScenario(f"PIL not installed: {e}")
+    image = Image.new("RGB", (size, size))
+    pixels = image.load()
+    shade = rng.randrange(60, 200)
+    for x in range(size):
+        for y in range(size):
+            pixels[x, y] = ((x + shade) % 256, (y + shade) % 256, shade)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class _BenchConnection:
+    """Stands in for an asyncpg connection on read-only routes: canned rows plus fixed latency."""
+
+    def __init__(self, tables: dict, latency: float):
+        self.tables = tables
+        self.latency = latency
+
+    async def fetch(self, query, *args, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if "direct_messages" in query:
+            user_id = args[0]
+            rows = [m for m in self.tables["direct_messages"] if user_id in (m["sender_id"], m["receiver_id"])]
+            return sorted(rows, key=lambda m: m["created_at"], reverse=True)
+        if "FROM public.care_application_counts" in query:
+            seeker = args[0] if "JOIN public.care_requests" in query else None
+            request_ids = args[-1] if "ANY(" in query else None
+            counts = {}
+            for a in self.tables["care_applications"]:
+                if (seeker is None or a["careseeker_user_id"] == seeker) and \
+                        (request_ids is None or a["care_request_id"] in request_ids):
+                    key = (a["care_request_id"], a["status"])
+                    counts[key] = counts.get(key, 0) + 1
+            return [{"care_request_id": r, "status": s, "count": n} for (r, s), n in counts.items()]
+        return []
+
+
+class _BenchPool:
+    """Stands in for the asyncpg pool on routes that acquire their own connection."""
+
+    def __init__(self, connection: _BenchConnection):
+        self.connection = connection
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield self.connection
+
+
+# ========= Scenarios =========
+# Each builder gets (app, stub, tables, rng, face_image) and returns a request factory: rng -> dict(method, url, ...)
+
+def scenario_available_care_requests(app, stub, tables, rng, face_image):
+    from routers import care_requests
+    app.include_router(care_requests.router, prefix="/api/care_requests")
+    stub.seed("care_requests", [_care_request(rng, f"seeker-{i % 200}") for i in range(2000)])
+    headers = {"Authorization": f"Bearer {make_access_token(CAREGIVER_ID)}"}
+
+    def request(r):
+        params = {}
+        if r.random() < 0.6:
+            params["location"] = r.choice(LOCATIONS)[:4]
+        if r.random() < 0.4:
+            params["care_services_needed"] = r.choice(SERVICES)
+        if r.random() < 0.3:
+            params["food_provided"] = "true"
+        return {"method": "GET", "url": "/api/care_requests/available-care-requests", "params": params,
+                "headers": headers}
+    return request
+
+
+def scenario_status_count(app, stub, tables, rng, face_image):
+    from routers import count_care_applications_by_status
+    app.include_router(count_care_applications_by_status.care_app_status_router, prefix="/api")
+    request_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(20)]
+    tables["care_applications"] = [{
+        "careseeker_user_id": SEEKER_ID if i % 4 else f"seeker-{i}",
+        "caregiver_user_id": f"caregiver-{i % 97}",
+        "care_request_id": rng.choice(request_ids),
+        "status": rng.choice(STATUSES),
+        "created_at": _timestamp(rng),
+    } for i in range(3000)]
+    headers = {"Authorization": f"Bearer {make_access_token(SEEKER_ID)}"}
+
+    def request(r):
+        roll = r.random()
+        if roll < 0.4:
+            params = {"care_request_id": r.choice(request_ids)}
+        elif roll < 0.7:
+            params = {"care_request_ids": ",".join(r.sample(request_ids, 8))}
+        else:
+            params = {}
+        return {"method": "GET", "url": "/api/care-applications/status-count", "params": params, "headers": headers}
+    return request
+
+
+def scenario_careseeker_dashboard(app, stub, tables, rng, face_image):
+    from routers import dashboard
+    app.include_router(dashboard.router, prefix="/api/dashboard")
+    requests = stub.seed("care_requests", [_care_request(rng, SEEKER_ID if i % 10 == 0 else f"seeker-{i % 200}")
+                                           for i in range(2000)])
+    mine = [r["id"] for r in requests if r["user_id"] == SEEKER_ID]
+    tables["care_applications"] = [{
+        "careseeker_user_id": SEEKER_ID,
+        "caregiver_user_id": f"caregiver-{i % 97}",
+        "care_request_id": rng.choice(mine),
+        "status": rng.choice(STATUSES),
+        "created_at": _timestamp(rng),
+    } for i in range(600)]
+    stub.seed("care_services", [{"id": f"service-{i}", "care_request_id": rng.choice(mine),
+                                 "caregiver_user_id": f"caregiver-{i % 97}", "status": "active",
+                                 "start_date": "2025-03-01"} for i in range(40)])
+    stub.seed("interview_requests", [{"id": f"interview-{i}", "care_request_id": rng.choice(mine),
+                                      "requester_id": SEEKER_ID, "caregiver_id": f"caregiver-{i % 97}",
+                                      "status": "scheduled", "created_at": _timestamp(rng)} for i in range(60)])
+    stub.seed("agreements", [{"id": f"agreement-{i}", "care_request_id": rng.choice(mine),
+                              "care_seeker_user_id": SEEKER_ID, "caregiver_user_id": f"caregiver-{i % 97}",
+                              "created_on": _timestamp(rng)} for i in range(20)])
+    headers = {"Authorization": f"Bearer {make_access_token(SEEKER_ID)}"}
+
+    def request(r):
+        return {"method": "GET", "url": "/api/dashboard/careseeker", "headers": headers}
+    return request
+
+def scenario_direct_messages_query(app, stub, tables, rng, face_image):
+    from routers import direct_messages
+    app.include_router(direct_messages.router, prefix="/api/direct-messages")
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    tables["direct_messages"] = [{
+        "id": uuid.UUID(int=rng.getrandbits(128)),
+        "sender_id": SEEKER_ID if i % 2 else f"user-{i % 50}",
+        "receiver_id": f"user-{i % 50}" if i % 2 else SEEKER_ID,
+        "content": "Hello, following up on the care request " * rng.randint(1, 4),
+        "created_at": base + timedelta(minutes=i),
+        "read_at": None,
+    } for i in range(400)]
+    headers = {"Authorization": f"Bearer {make_access_token(SEEKER_ID)}"}
+
+    def request(r):
+        return {"method": "GET", "url": "/api/direct-messages/api/direct_messages/query", "headers": headers}
+    return request
+
+def scenario_match_requests_for_me(app, stub, tables, rng, face_image):
+    try:
+        from routers import matching
+        matching.get_engine()
+    except ImportError as e:
+        raise SkipScenario(f"matching unavailable: {e}")
+    import geocoding
+    app.include_router(matching.router, prefix="/api/match")
+    gazetteer = geocoding.get_geocoder()
+    rows = []
+    for i in range(20000):
+        row = _care_request(rng, f"seeker-{i % 500}")
+        row["latitude"], row["longitude"] = gazetteer.geocode(row["location"]) or (None, None)
+        rows.append(row)
+    stub.seed("care_requests", rows)
+    stub.seed("caregiver_profiles", [{
+        "user_id": CAREGIVER_ID, "care_services": SERVICES[:3], "availability_locations": "Kochi, Thrissur",
+        "expected_charges": "15,000 - 20,000", "start_immediately": True, "age_range": "60-80",
+    }])
+    headers = {"Authorization": f"Bearer {make_access_token(CAREGIVER_ID)}"}
+
+    def request(r):
+        return {"method": "GET", "url": "/api/match/requests-for-me", "params": {"limit": 20}, "headers": headers}
+    return request
+
+
+def _face_router(app):
+    try:
+        from routers import face_recognition
+        face_recognition.get_face_cascade()
+    except Exception as e:
+        raise SkipScenario(f"face recognition unavailable: {type(e).__name__}: {e}")
+    if not any(getattr(r, "path", "") == "/upload-face/" for r in app.router.routes):
+        app.include_router(face_recognition.router)
+    return face_recognition
+
+
+def scenario_upload_face(app, stub, tables, rng, face_image):
+    _face_router(app)
+    image = face_image or _jpeg(rng)
+    headers = {"Authorization": f"Bearer {make_access_token(SEEKER_ID)}"}
+
+    def request(r):
+        return {"method": "POST", "url": "/upload-face/", "headers": headers,
+                "data": {"userId": SEEKER_ID, "angle": r.choice(["front", "left", "right"])},
+                "files": {"file": ("face.jpg", image, "image/jpeg")}}
+    return request
+
+
+def scenario_validate_face(app, stub, tables, rng, face_image):
+    face_recognition = _face_router(app)
+    image = face_image or _jpeg(rng)
+    for angle in ("front", "left", "right"):
+        stub.put_object(face_recognition.SUPABASE_BUCKET, f"{SEEKER_ID}/{angle}/{angle}.jpg", image, "image/jpeg")
+    headers = {"Authorization": f"Bearer {make_access_token(SEEKER_ID)}"}
+
+    def request(r):
+        return {"method": "POST", "url": "/validate-face/", "headers": headers, "data": {"userId": SEEKER_ID},
+                "files": {"file": ("probe.jpg", image, "image/jpeg")}}
+    return request
+
+
+def scenario_generate_pdf(app, stub, tables, rng, face_image):
+    try:
+        from routers import agreementgeneration
+        agreementgeneration.get_pdfkit_config()
+        import jinja2  # noqa: F401
+    except Exception as e:
+        raise SkipScenario(f"PDF generation unavailable: {type(e).__name__}: {e}")
+    app.include_router(agreementgeneration.router, prefix="/api/agreementsgeneration")
+    agreement_ids = [r["id"] for r in stub.seed("agreements", [{"status": "draft"} for _ in range(50)])]
+    headers = {"Authorization": f"Bearer {make_access_token(SEEKER_ID)}"}
+
+    def request(r):
+        return {"method": "POST", "url": "/api/agreementsgeneration/generate-pdf", "headers": headers,
+                "json": {"agreement_id": r.choice(agreement_ids), "agreement_type": "caregiver",
+                         "version": "1.0", "placeholders": {}}}
+    return request
+
+
+SCENARIOS = {
+    "available_care_requests": (scenario_available_care_requests, {200}),
+    "status_count": (scenario_status_count, {200}),
+    "careseeker_dashboard": (scenario_careseeker_dashboard, {200}),
+    "direct_messages_query": (scenario_direct_messages_query, {200}),
+    "match_requests_for_me": (scenario_match_requests_for_me, {200}),
+    # A synthetic image has no face, so 400 is the expected answer unless --face-image is given
+    "upload_face": (scenario_upload_face, {200, 400}),
+    "validate_face": (scenario_validate_face, {200, 400}),
+    "generate_pdf": (scenario_generate_pdf, {200}),
+}
+
+
+# ========= Driver =========
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _drive(client, make_request, expected, total, concurrency, seed):
+    latencies, errors = [], 0
+    issued = 0
+
+    async def worker(worker_id):
+        nonlocal issued, errors
+        rng = random.Random(seed * 1000 + worker_id)
+        while issued < total:
+            issued += 1
+            spec = make_request(rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(**spec)
+                ok = response.status_code in expected
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def run_scenario(name, args, face_image):
+    builder, expected = SCENARIOS[name]
+    app = FastAPI()
+    app.add_middleware(tracing.ServerTimingMiddleware)
+    app.add_middleware(metrics.MetricsMiddleware)
+    tables = {}
+    app.dependency_overrides[db_pool.get_db_connection] = \
+        lambda: _BenchConnection(tables, args.db_latency_ms / 1000)
+    pool = _BenchPool(_BenchConnection(tables, args.db_latency_ms / 1000))
+
+    async def bench_pool():
+        return pool
+
+    stub = SupabaseStub(latency=args.upstream_latency_ms / 1000)
+    rng = random.Random(args.seed)
+    real_get_pool, db_pool.get_pool = db_pool.get_pool, bench_pool
+    try:
+        async with use_stub_async(stub):
+            try:
+                make_request = builder(app, stub, tables, rng, face_image)
+            except (SkipScenario, ImportError) as e:
+                return {"scenario": name, "skipped": str(e)}
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                await _drive(client, make_request, expected, args.warmup, min(args.concurrency, args.warmup or 1),
+                             args.seed)
+                latencies, errors, wall = await _drive(client, make_request, expected, args.requests,
+                                                       args.concurrency, args.seed + 1)
+    finally:
+        db_pool.get_pool = real_get_pool
+
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return a list of human-readable regressions against a baseline run."""
+    regressions = []
+    previous = {row["scenario"]: row for row in baseline.get("scenarios", [])}
+    for row in results:
+        old = previous.get(row["scenario"])
+        if not old or "skipped" in row or "skipped" in old:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if old[key] and row[key] > old[key] * (1 + threshold):
+                regressions.append(f"{row['scenario']}: {key} {old[key]} -> {row[key]}")
+        if old["rps"] and row["rps"] < old["rps"] * (1 - threshold):
+            regressions.append(f"{row['scenario']}: rps {old['rps']} -> {row['rps']}")
+        if row["errors"] > old["errors"]:
+            regressions.append(f"{row['scenario']}: errors {old['errors']} -> {row['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot endpoints against the Supabase stand-in")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--upstream-latency-ms", type=float, default=5.0, help="Added to every stand-in call")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Added to every canned DB query")
+    parser.add_argument("--face-image", help="JPEG containing a real face for the face scenarios")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save-baseline", help="Write this run to a JSON baseline file")
+    parser.add_argument("--baseline", help="Compare with this JSON baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    face_image = None
+    if args.face_image:
+        with open(args.face_image, "rb") as f:
+            face_image = f.read()
+
+    results = [asyncio.run(run_scenario(name, args, face_image)) for name in (args.scenarios or SCENARIOS)]
+
+    print(f"{'scenario':26} {'req':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for row in results:
+        if "skipped" in row:
+            print(f"{row['scenario']:26} skipped: {row['skipped']}")
+            continue
+        print(f"{row['scenario']:26} {row['requests']:>6} {row['errors']:>5} {row['rps']:>9.1f} "
+              f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+
+    run = {
+        "python": sys.version.split()[0],
+        "config": {k: getattr(args, k) for k in ("requests", "warmup", "concurrency", "upstream_latency_ms",
+                                                  "db_latency_ms", "seed")},
+        "scenarios": results,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != run["config"]:
+            print("warning: baseline was recorded with different settings", baseline.get("config"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"FAILED: regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"OK: no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
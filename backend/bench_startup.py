@@ -0,0 +1,106 @@
+# backend/bench_startup.py
+"""
+Measure worker boot cost: how long each router takes to import in a fresh
+interpreter, plus the full `main` app.
+
+Usage (from backend/):
+    python bench_startup.py
+    python bench_startup.py --repeat 5 --json startup.json
+    python bench_startup.py routers.face_recognition routers.care_requests
+
+Every module is imported in its own subprocess so shared imports
+(fastapi, pydantic, ...) are not hidden by an earlier import. The
+`fastapi` baseline is subtracted to show what the router itself adds.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_MODULE = "fastapi"
+
+_SNIPPET = """
+import importlib, json, sys, time
+start = time.perf_counter()
+error = None
+try:
+    importlib.import_module(sys.argv[1])
+except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+print(json.dumps({"ms": (time.perf_counter() - start) * 1000, "error": error}))
+"""
+
+
+def discover_modules():
+    routers_dir = os.path.join(BACKEND_DIR, "routers")
+    modules = []
+    for filename in sorted(os.listdir(routers_dir)):
+        name, ext = os.path.splitext(filename)
+        if ext == ".py" and name.isidentifier() and "backup" not in name and name != "__init__":
+            modules.append(f"routers.{name}")
+    modules.append("main")
+    return modules
+
+
+def time_import(module: str):
+    result = subprocess.run(
+        [sys.executable, "-c", _SNIPPET, module],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    if not lines:
+        return {"ms": None, "error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no output"}
+    return json.loads(lines[-1])
+
+
+def measure(module: str, repeat: int):
+    samples, error = [], None
+    for _ in range(repeat):
+        run = time_import(module)
+        if run["error"]:
+            error = run["error"]
+            break
+        samples.append(run["ms"])
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(samples), 1) if samples else None,
+        "min_ms": round(min(samples), 1) if samples else None,
+        "error": error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time per router")
+    parser.add_argument("modules", nargs="*", help="Modules to time (default: every router plus main)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh-interpreter runs per module")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    baseline = measure(BASELINE_MODULE, args.repeat)
+    baseline_ms = baseline["median_ms"] or 0.0
+    results = [measure(module, args.repeat) for module in (args.modules or discover_modules())]
+    for row in results:
+        row["over_baseline_ms"] = round(row["median_ms"] - baseline_ms, 1) if row["median_ms"] is not None else None
+
+    results.sort(key=lambda r: -(r["median_ms"] or 0))
+    print(f"baseline: import {BASELINE_MODULE} = {baseline_ms} ms (median of {args.repeat})")
+    print(f"{'module':45} {'median ms':>10} {'+baseline':>10}  error")
+    for row in results:
+        median = "-" if row["median_ms"] is None else f"{row['median_ms']:.1f}"
+        extra = "-" if row["over_baseline_ms"] is None else f"{row['over_baseline_ms']:.1f}"
+        print(f"{row['module']:45} {median:>10} {extra:>10}  {row['error'] or ''}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat,
+                       "baseline": baseline, "modules": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ from typing import Optional
 from auth.auth_utils import get_authenticated_user_id
 from utils import make_supabase_request
 from models import ApplyRequest
+from db_pool import get_pool
+from routers.count_care_applications_by_status import by_status, parse_request_ids
+from application_counters import ACTIVE_STATUSES, APPLICATION_LIMIT, caregiver_count, status_counts
 
 router = APIRouter()
 
@@ -13,30 +16,10 @@ async def get_application_status_counts(
     user_id_from_token: str = Depends(get_authenticated_user_id)
 ):
     """Get application status counts for a care request"""
-    try:
-        response = await make_supabase_request(
-            "GET",
-            "care_applications",
-            params={"care_request_id": f"eq.{care_request_id}"}
-        )
-        
-        if response.status_code == 200:
-            applications = response.json()
-            
-            # Count applications by status
-            status_counts = {}
-            for app in applications:
-                status = app.get("status", "pending")
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            # Convert to list format
-            result = [{"status": status, "count": count} for status, count in status_counts.items()]
-            return result
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        print(f"❌ Error fetching application status counts: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    ids = parse_request_ids(care_request_id)
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        return by_status(await status_counts(conn, ids))
 
 @router.get("/api/user-applications")
 async def get_user_applications(
@@ -66,31 +49,15 @@ async def check_application_limit(
     user_id_from_token: str = Depends(get_authenticated_user_id)
 ):
     """Check if caregiver has reached application limit"""
-    try:
-        response = await make_supabase_request(
-            "GET",
-            "care_applications",
-            params={
-                "caregiver_user_id": f"eq.{caregiver_user_id}",
-                "status": f"in.(pending,accepted,interview_scheduled)"
-            }
-        )
-        
-        if response.status_code == 200:
-            applications = response.json()
-            current_count = len(applications)
-            limit_reached = current_count >= 3
-            
-            return {
-                "limit_reached": limit_reached,
-                "current_count": current_count,
-                "max_limit": 3
-            }
-        else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except Exception as e:
-        print(f"❌ Error checking application limit: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        current_count = await caregiver_count(conn, caregiver_user_id, ACTIVE_STATUSES)
+
+    return {
+        "limit_reached": current_count >= APPLICATION_LIMIT,
+        "current_count": current_count,
+        "max_limit": APPLICATION_LIMIT
+    }
 
 @router.post("/api/apply-care-request")
 async def apply_care_request(
@@ -115,19 +82,11 @@ async def apply_care_request(
                 return {"error": "You have already applied for this care request"}
         
         # Check application limit
-        limit_response = await make_supabase_request(
-            "GET",
-            "care_applications",
-            params={
-                "caregiver_user_id": f"eq.{request.user_id}",
-                "status": f"in.(pending,accepted,interview_scheduled)"
-            }
-        )
-        
-        if limit_response.status_code == 200:
-            applications = limit_response.json()
-            if len(applications) >= 3:
-                return {"error": "You have reached the maximum of 3 applications"}
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            active = await caregiver_count(conn, request.user_id, ACTIVE_STATUSES)
+        if active >= APPLICATION_LIMIT:
+            return {"error": f"You have reached the maximum of {APPLICATION_LIMIT} applications"}
         
         # Create application
         application_data = {
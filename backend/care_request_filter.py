@@ -3,9 +3,11 @@
 from fastapi import APIRouter, Query
 from typing import Optional, List
 from urllib.parse import quote
-import httpx
 import os
 from dotenv import load_dotenv
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
+from query_filters import CARE_REQUEST_FILTERS
 
 
 care_request_filter_router = APIRouter()
@@ -36,57 +38,18 @@ async def filter_care_requests(
     special_needs: Optional[str] = None,
     additional_expectations: Optional[str] = None,
 ):
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-    }
-
-    filters = []
-
-    # Text or exact match fields
-    if location:
-        filters.append(f"care_request_id=eq.{quote(care_request_id)}")
-    if location:
-        filters.append(f"location=eq.{quote(location)}")
-    if care_duration:
-        filters.append(f"care_duration=eq.{quote(care_duration)}")
-    if estimated_budget:
-        filters.append(f"estimated_budget=eq.{quote(estimated_budget)}")
-    if daily_working_hours:
-        filters.append(f"daily_working_hours=eq.{quote(daily_working_hours)}")
-    if excluded_schedule_days:
-        filters.append(f"excluded_schedule_days=eq.{quote(excluded_schedule_days)}")
-    if recipient_age_range:
-        filters.append(f"recipient_age_range=eq.{quote(recipient_age_range)}")
-    if primary_location_type:
-        filters.append(f"primary_location_type=eq.{quote(primary_location_type)}")
-    if caregiver_requirements:
-        filters.append(f"caregiver_requirements=eq.{quote(caregiver_requirements)}")
-    if transportation_provided is not None:
-        filters.append(f"transportation_provided=is.{str(transportation_provided).lower()}")
-    if accommodation_provided is not None:
-        filters.append(f"accommodation_provided=is.{str(accommodation_provided).lower()}")
-    if food_provided is not None:
-        filters.append(f"food_provided=is.{str(food_provided).lower()}")
-    if special_needs:
-        filters.append(f"special_needs=eq.{quote(special_needs)}")
-    if additional_expectations:
-        filters.append(f"additional_expectations=eq.{quote(additional_expectations)}")
-
-    # Array field - care_services_needed
-    if care_services_needed:
-        for service in care_services_needed:
-            filters.append(f"care_services_needed=cs.{{{quote(service)}}}")
-
-    # Combine all filters
-    filter_query = "&".join(filters)
-    if filter_query:
-        url = f"{SUPABASE_URL}/rest/v1/care_requests?{filter_query}&order=created_at.desc"
-    else:
-        url = f"{SUPABASE_URL}/rest/v1/care_requests?order=created_at.desc"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
+    """Care requests matching every given filter, newest first (same semantics as the listing endpoints)"""
+    filters = CARE_REQUEST_FILTERS.parse(dict(locals()))
+    clauses = filters.to_postgrest()
+    request_id = care_request_id or id
+    if request_id:
+        clauses.append(f"id=eq.{quote(request_id, safe='')}")
+    clauses.append("order=created_at.desc")
+
+    response = await supabase_rest.get(
+        f"{SUPABASE_URL}/rest/v1/care_requests?{'&'.join(clauses)}",
+        headers=SERVICE_HEADERS
+    )
 
     if response.status_code == 200:
         return response.json()
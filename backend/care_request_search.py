@@ -0,0 +1,138 @@
+# backend/care_request_search.py
+"""
+Ranked full-text search over care requests (the `q=` mode of the listing endpoints).
+
+PostgREST can filter on a tsvector but cannot order by relevance or build
+highlights, so searches run as one SQL statement on the shared asyncpg pool
+against the `search_vector` column and GIN index from
+migrations/001_care_requests_search.sql:
+
+  * `q` is parsed with websearch_to_tsquery (quoted phrases, `or`, `-word`)
+  * results are ordered by ts_rank_cd, then created_at/id for stable paging
+  * ts_headline runs only for the rows on the returned page
+  * paging uses an opaque (rank, created_at, id) keyset cursor
+
+Each returned row carries `search_rank` and `highlights` (matched fields
+only, matches wrapped in <mark>...</mark>; the surrounding text is not
+HTML-escaped).
+"""
+
+import base64
+import json
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+import db_pool
+from query_filters import FilterSet
+
+TS_CONFIG = "english"
+HIGHLIGHT_FIELDS = ("caregiver_requirements", "special_needs", "additional_expectations", "excluded_schedule_days")
+HIGHLIGHT_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=25, MinWords=8, MaxFragments=2"
+
+_RANK = "ts_rank_cd(r.search_vector, query.tsq, 32)::real"
+
+
+def encode_cursor(rank: float, created_at: str, row_id: str) -> str:
+    raw = json.dumps([rank, created_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        rank, created_at, row_id = json.loads(raw)
+        if not isinstance(rank, (int, float)) or not isinstance(created_at, str) or not isinstance(row_id, str):
+            raise ValueError
+        return float(rank), created_at, row_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def build_filters(filters: FilterSet, user_id: Optional[str], values: list) -> List[str]:
+    """SQL conditions for the endpoint filters, appending their arguments to `values`."""
+    conditions = []
+    if user_id:
+        values.append(user_id)
+        conditions.append(f"r.user_id = ${len(values)}::uuid")
+    filter_conditions, args = filters.to_sql(start=len(values) + 1, alias="r")
+    values.extend(args)
+    return conditions + filter_conditions
+
+
+def build_search_query(q: str, filters: FilterSet, limit: int,
+                       user_id: Optional[str] = None, cursor: Optional[str] = None) -> Tuple[str, list]:
+    """
+    One page of ranked matches; `filters` are the endpoint's parsed filters
+    (query_filters.CARE_REQUEST_FILTERS).
+    """
+    values: list = [q]
+    conditions = ["r.search_vector @@ query.tsq"] + build_filters(filters, user_id, values)
+    if cursor:
+        rank, created_at, row_id = decode_cursor(cursor)
+        values += [rank, created_at, row_id]
+        n = len(values)
+        conditions.append(f"({_RANK}, r.created_at, r.id) < (${n - 2}::real, ${n - 1}::timestamptz, ${n}::uuid)")
+    values.append(limit)
+
+    highlights = ", ".join(
+        f"'{field}', CASE WHEN to_tsvector('{TS_CONFIG}', coalesce(r.{field}, '')) @@ query.tsq "
+        f"THEN ts_headline('{TS_CONFIG}', r.{field}, query.tsq, '{HIGHLIGHT_OPTIONS}') END"
+        for field in HIGHLIGHT_FIELDS
+    )
+    sql = f"""
+        WITH query AS (SELECT websearch_to_tsquery('{TS_CONFIG}', $1) AS tsq),
+        page AS (
+            SELECT r.id, r.created_at, {_RANK} AS rank
+            FROM public.care_requests r, query
+            WHERE {' AND '.join(conditions)}
+            ORDER BY rank DESC, r.created_at DESC, r.id DESC
+            LIMIT ${len(values)}
+        )
+        SELECT to_jsonb(r) - 'search_vector' AS row, page.rank,
+               jsonb_strip_nulls(jsonb_build_object({highlights})) AS highlights
+        FROM page
+        JOIN public.care_requests r ON r.id = page.id
+        CROSS JOIN query
+        ORDER BY page.rank DESC, page.created_at DESC, page.id DESC
+    """
+    return sql, values
+
+
+def build_count_query(q: str, filters: FilterSet, user_id: Optional[str] = None) -> Tuple[str, list]:
+    values: list = [q]
+    conditions = [f"r.search_vector @@ websearch_to_tsquery('{TS_CONFIG}', $1)"] + build_filters(filters, user_id, values)
+    return f"SELECT count(*) FROM public.care_requests r WHERE {' AND '.join(conditions)}", values
+
+
+async def search(q: str, filters: FilterSet, limit: int, user_id: Optional[str] = None,
+                 cursor: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+                 with_count: bool = False) -> Tuple[List[dict], Optional[str], Optional[int]]:
+    """
+    Returns (rows, next_cursor, total). `columns` projects each row (None keeps
+    every column); `total` is only computed when `with_count` is set.
+    """
+    sql, values = build_search_query(q, filters, limit + 1, user_id=user_id, cursor=cursor)
+    pool = await db_pool.get_pool()
+    async with pool.acquire() as conn:
+        records = await conn.fetch(sql, *values)
+        total = None
+        if with_count:
+            count_sql, count_values = build_count_query(q, filters, user_id=user_id)
+            total = await conn.fetchval(count_sql, *count_values)
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        next_cursor = encode_cursor(last["rank"], last["row"]["created_at"], str(last["row"]["id"]))
+
+    rows = []
+    for record in records:
+        row = record["row"]
+        if columns is not None:
+            row = {c: row.get(c) for c in columns}
+        row["search_rank"] = record["rank"]
+        row["highlights"] = record["highlights"]
+        rows.append(row)
+    return rows, next_cursor, total
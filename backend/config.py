@@ -1,5 +1,6 @@
 # backend/config.py
 from pydantic import BaseSettings
+from typing import Optional
 from dotenv import load_dotenv
 import os
 
@@ -11,6 +12,56 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_ROLE_KEY: str
     SUPABASE_JWT_SECRET: str
     SUPABASE_DB: str
+
+    # Shared PostgREST / Storage HTTP client (see supabase_rest.py)
+    REST_HTTP2: bool = True
+    REST_MAX_CONNECTIONS: int = 100
+    REST_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    REST_KEEPALIVE_EXPIRY: float = 30.0
+    REST_CONNECT_TIMEOUT: float = 5.0
+    REST_TIMEOUT: float = 30.0
+
+    # Shared asyncpg pool on SUPABASE_DB (see db_pool.py)
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_QUERIES: int = 50000
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+    DB_COMMAND_TIMEOUT: float = 30.0
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Face recognition, PDF generation and Google session routers import their
+    # heavy dependencies on first use. Set to warm them up during startup instead.
+    PRELOAD_HEAVY_ROUTERS: bool = False
+
+    # RS256 signing keys (see auth/jwks.py); JWKS_URL defaults to <SUPABASE_URL>/auth/v1/keys
+    JWKS_URL: Optional[str] = None
+    JWKS_TTL: float = 600.0
+    JWKS_MIN_REFETCH_INTERVAL: float = 30.0
+
+    # available-care-requests response cache (see feed_cache.py): memory | redis | none
+    FEED_CACHE_BACKEND: str = "memory"
+    FEED_CACHE_TTL: float = 15.0
+    FEED_CACHE_MAX_ENTRIES: int = 1024
+    FEED_CACHE_REDIS_URL: Optional[str] = None
+
+    # Location geocoding (see geocoding.py): gazetteer | none | <module>:<callable>
+    GEOCODER: str = "gazetteer"
+    GEOCODER_GAZETTEER_PATH: Optional[str] = None  # defaults to data/gazetteer.csv
+    GEOCODE_CACHE_SIZE: int = 2048
+
+    # Caregiver <-> care request matching (see matching.py): feature index rebuild interval
+    MATCH_INDEX_TTL: float = 60.0
+
+    # ETag / If-None-Match on polled single-entity reads (see etag_cache.py); TTL 0 disables the server-side cache
+    ETAG_CACHE_TTL: float = 5.0
+    ETAG_CACHE_MAX_ENTRIES: int = 4096
+
+    # Streaming exports (see routers/export.py): rows per upstream page, and the
+    # user_roles roles allowed to export (comma-separated; empty: any signed-in user)
+    EXPORT_PAGE_SIZE: int = 1000
+    EXPORT_ROLES: str = "admin"
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,32 @@
+# backend/conftest.py
+"""
+Shared pytest fixtures. Routers read their Supabase settings at import time,
+so the environment is pointed at the in-process stand-in before any test
+module imports them.
+"""
+
+import pytest
+
+from supabase_stub import SupabaseStub, configure_environment, make_access_token, use_stub
+
+configure_environment()
+
+
+@pytest.fixture
+def supabase_stub():
+    """Fresh in-memory Supabase; supabase_rest and get_supabase() talk to it for the test."""
+    import etag_cache
+    import feed_cache
+    import geocoding
+
+    feed_cache.reset_backend()
+    etag_cache.clear()
+    geocoding.set_geocoder(None)
+    with use_stub(SupabaseStub()) as stub:
+        yield stub
+
+
+@pytest.fixture
+def auth_headers():
+    """Build Authorization headers for a given user id."""
+    return lambda user_id: {"Authorization": f"Bearer {make_access_token(user_id)}"}
@@ -0,0 +1,114 @@
+# backend/db_pool.py
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Optional
+
+import asyncpg
+from config import settings
+import tracing
+
+# Single Postgres DSN for every asyncpg router
+DATABASE_URL = settings.SUPABASE_DB
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+class TracedConnection(asyncpg.Connection):
+    """asyncpg connection that reports every statement to tracing (per table, per request)."""
+
+    async def _traced(self, call, query, *args, **kwargs):
+        start = time.perf_counter()
+        error = True
+        try:
+            result = await call(query, *args, **kwargs)
+            error = False
+            return result
+        finally:
+            target, op = tracing.classify_sql(query)
+            tracing.record("db", target, op, time.perf_counter() - start, error=error)
+
+    async def execute(self, query, *args, **kwargs):
+        return await self._traced(super().execute, query, *args, **kwargs)
+
+    async def executemany(self, command, args, **kwargs):
+        return await self._traced(super().executemany, command, args, **kwargs)
+
+    async def fetch(self, query, *args, **kwargs):
+        return await self._traced(super().fetch, query, *args, **kwargs)
+
+    async def fetchrow(self, query, *args, **kwargs):
+        return await self._traced(super().fetchrow, query, *args, **kwargs)
+
+    async def fetchval(self, query, *args, **kwargs):
+        return await self._traced(super().fetchval, query, *args, **kwargs)
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Per-connection setup: decode json/jsonb to Python objects and back."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog",
+        )
+
+
+async def open_pool() -> asyncpg.Pool:
+    """Create the app-wide pool. Called from the FastAPI lifespan."""
+    global _pool
+    async with _pool_lock:
+        if _pool is not None:
+            return _pool
+        _pool = await asyncpg.create_pool(
+            dsn=DATABASE_URL,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_queries=settings.DB_POOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+            command_timeout=settings.DB_COMMAND_TIMEOUT,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            server_settings={"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)},
+            init=_init_connection,
+            connection_class=TracedConnection,
+        )
+        return _pool
+
+
+async def close_pool():
+    """Close every pooled connection. Called from the FastAPI lifespan."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the shared pool, creating it lazily outside the app lifespan (scripts, tests)."""
+    if _pool is None:
+        await open_pool()
+    return _pool
+
+
+async def get_db_connection() -> AsyncIterator[asyncpg.Connection]:
+    """FastAPI dependency: borrow a pooled connection for the duration of a request."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        yield conn
+
+
+def pool_stats() -> dict:
+    """Pool configuration and current occupancy, for the health endpoint."""
+    if _pool is None:
+        return {"open": False}
+    return {
+        "open": True,
+        "min_size": _pool.get_min_size(),
+        "max_size": _pool.get_max_size(),
+        "size": _pool.get_size(),
+        "idle": _pool.get_idle_size(),
+        "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+    }
@@ -0,0 +1,118 @@
+# backend/etag_cache.py
+"""
+Strong ETags and conditional GETs for single-entity reads that clients poll.
+
+`conditional_json(request, key, fetch)` renders the body returned by
+`fetch()` exactly as FastAPI would, tags it with a strong ETag (a hash of
+those bytes, so any column change - updated_at included - changes it) and
+answers `If-None-Match` with 304 Not Modified.
+
+The rendered body and its ETag are also kept in a per-worker LRU for
+ETAG_CACHE_TTL seconds, keyed by (resource, id, variant). While an entry is
+fresh, a matching If-None-Match gets its 304 - and any other request its
+200 - without calling `fetch()`, i.e. without an upstream round trip.
+Writes call invalidate(resource, id); writes on other workers or outside
+this API show up once the TTL runs out. ETAG_CACHE_TTL=0 turns the cache
+off (ETags and 304s still work, computed after the fetch).
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from config import settings
+import metrics
+
+CACHE_LOOKUPS = metrics.REGISTRY.counter(
+    "etag_cache_requests_total", "Conditional GETs by outcome (hit: served from the cache)", ("result",))
+NOT_MODIFIED = metrics.REGISTRY.counter(
+    "etag_not_modified_total", "Conditional GETs answered with 304", ("resource",))
+
+# Clients may keep the body but must revalidate before every use
+CACHE_CONTROL = "private, no-cache"
+
+Key = Tuple[str, str, str]  # (resource, id, variant)
+
+_entries: "OrderedDict[Key, Tuple[float, str, bytes]]" = OrderedDict()  # key -> (expires_at, etag, body)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored, `*` matches anything."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _lookup(key: Key) -> Optional[Tuple[str, bytes]]:
+    item = _entries.get(key)
+    if item is None:
+        return None
+    expires_at, etag, body = item
+    if expires_at <= time.monotonic():
+        del _entries[key]
+        return None
+    _entries.move_to_end(key)
+    return etag, body
+
+
+def _store(key: Key, etag: str, body: bytes):
+    if settings.ETAG_CACHE_TTL <= 0:
+        return
+    _entries[key] = (time.monotonic() + settings.ETAG_CACHE_TTL, etag, body)
+    _entries.move_to_end(key)
+    while len(_entries) > settings.ETAG_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+def invalidate(resource: str, resource_id: Any):
+    """Forget every cached variant of one entity after it was written."""
+    for key in [k for k in _entries if k[0] == resource and k[1] == str(resource_id)]:
+        del _entries[key]
+
+
+def clear():
+    _entries.clear()
+
+
+def _respond(request: Request, resource: str, etag: str, body: bytes) -> Response:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        NOT_MODIFIED.inc(resource=resource)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def conditional_json(request: Request, key: Key, fetch: Callable[[], Awaitable[Any]]) -> Response:
+    """
+    Serve `fetch()`'s body with an ETag, honouring If-None-Match. `fetch` may
+    raise HTTPException; errors are neither tagged nor cached.
+    """
+    key = (key[0], str(key[1]), key[2])
+    cached = _lookup(key)
+    CACHE_LOOKUPS.inc(result="hit" if cached else "miss")
+    if cached:
+        return _respond(request, key[0], *cached)
+
+    body = JSONResponse(content=jsonable_encoder(await fetch())).body
+    etag = make_etag(body)
+    _store(key, etag, body)
+    return _respond(request, key[0], etag, body)
+
+
+def cache_stats() -> dict:
+    hits, misses = CACHE_LOOKUPS.value(result="hit"), CACHE_LOOKUPS.value(result="miss")
+    return {"entries": len(_entries), "max_entries": settings.ETAG_CACHE_MAX_ENTRIES, "ttl_s": settings.ETAG_CACHE_TTL,
+            "hits": hits, "misses": misses, "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0}
@@ -0,0 +1,189 @@
+# backend/feed_cache.py
+"""
+Response cache for the caregiver home feed (available-care-requests).
+
+Entries are keyed by the normalised filter set plus paging/projection
+parameters, live for FEED_CACHE_TTL seconds and are bounded in number.
+Backends (FEED_CACHE_BACKEND):
+  * "memory" - per-worker LRU (default)
+  * "redis"  - shared across workers via FEED_CACHE_REDIS_URL (needs `redis`)
+  * "none"   - caching disabled
+
+Writes call invalidate_rows(): the memory backend drops only entries whose
+filters could match a written row or that already contain it; the redis
+backend bumps a generation number, which retires every entry at once.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import settings
+import metrics
+from query_filters import CARE_REQUEST_FILTERS
+
+CACHE_LOOKUPS = metrics.REGISTRY.counter(
+    "feed_cache_requests_total", "Feed cache lookups by result", ("result",))
+CACHE_INVALIDATIONS = metrics.REGISTRY.counter(
+    "feed_cache_invalidated_entries_total", "Feed cache entries dropped by writes")
+CACHE_SIZE = metrics.REGISTRY.gauge(
+    "feed_cache_entries", "Entries currently held by the per-worker feed cache")
+
+def make_key(filters: Dict[str, Any], **params) -> str:
+    """Stable key for a filter set plus paging/projection parameters."""
+    payload = json.dumps({"f": filters, "p": params}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def could_match(filters: Dict[str, Any], row: Dict[str, Any]) -> bool:
+    """Conservatively decide whether `row` could appear in a feed filtered by `filters`."""
+    return CARE_REQUEST_FILTERS.parse(filters).matches(row)
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, entry)
+
+    async def get(self, key: str) -> Optional[dict]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            CACHE_SIZE.dec()
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: dict):
+        if key not in self._entries:
+            CACHE_SIZE.inc()
+        self._entries[key] = (time.monotonic() + self.ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            CACHE_SIZE.dec()
+
+    async def invalidate_rows(self, rows: List[dict]) -> int:
+        ids = {str(r.get("id")) for r in rows if r.get("id") is not None}
+        stale = [key for key, (_, entry) in self._entries.items()
+                 if ids & set(entry["ids"]) or any(could_match(entry["filters"], r) for r in rows)]
+        for key in stale:
+            del self._entries[key]
+        CACHE_SIZE.dec(len(stale))
+        return len(stale)
+
+    async def clear(self):
+        CACHE_SIZE.dec(len(self._entries))
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "entries": len(self._entries), "max_entries": self.max_entries, "ttl_s": self.ttl}
+
+
+class RedisBackend:
+    """Shared cache; invalidation retires the whole feed by bumping a generation key."""
+
+    PREFIX = "careconnect:feed"
+
+    def __init__(self, url: str, ttl: float):
+        import redis.asyncio as redis  # optional dependency, only needed for this backend
+
+        self.ttl = ttl
+        self._redis = redis.from_url(url)
+
+    async def _generation(self) -> int:
+        return int(await self._redis.get(f"{self.PREFIX}:gen") or 0)
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._redis.get(f"{self.PREFIX}:{await self._generation()}:{key}")
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, entry: dict):
+        await self._redis.set(f"{self.PREFIX}:{await self._generation()}:{key}", json.dumps(entry, default=str),
+                              px=int(self.ttl * 1000))
+
+    async def invalidate_rows(self, rows: List[dict]) -> int:
+        await self._redis.incr(f"{self.PREFIX}:gen")
+        return 1
+
+    async def clear(self):
+        await self._redis.incr(f"{self.PREFIX}:gen")
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "ttl_s": self.ttl}
+
+
+_backend = None
+_backend_lock = asyncio.Lock()
+
+
+async def get_backend():
+    global _backend
+    if _backend is None:
+        async with _backend_lock:
+            if _backend is None:
+                kind = settings.FEED_CACHE_BACKEND
+                if kind == "redis":
+                    if not settings.FEED_CACHE_REDIS_URL:
+                        raise RuntimeError("FEED_CACHE_BACKEND=redis needs FEED_CACHE_REDIS_URL")
+                    _backend = RedisBackend(settings.FEED_CACHE_REDIS_URL, settings.FEED_CACHE_TTL)
+                elif kind == "memory":
+                    _backend = MemoryBackend(settings.FEED_CACHE_MAX_ENTRIES, settings.FEED_CACHE_TTL)
+                else:
+                    _backend = False  # disabled
+    return _backend or None
+
+
+def reset_backend():
+    """Forget the current backend (tests, or after changing settings)."""
+    global _backend
+    if isinstance(_backend, MemoryBackend):
+        CACHE_SIZE.dec(len(_backend._entries))
+    _backend = None
+
+
+async def lookup(key: str) -> Optional[dict]:
+    backend = await get_backend()
+    if backend is None:
+        return None
+    entry = await backend.get(key)
+    CACHE_LOOKUPS.inc(result="hit" if entry is not None else "miss")
+    return entry
+
+
+async def store(key: str, filters: Dict[str, Any], rows: List[dict], headers: Dict[str, str]) -> bool:
+    """Cache one feed page; False when caching is disabled."""
+    backend = await get_backend()
+    if backend is None:
+        return False
+    entry = {"filters": filters, "rows": rows, "headers": headers,
+             "ids": [str(r["id"]) for r in rows if r.get("id") is not None]}
+    await backend.set(key, entry)
+    return True
+
+
+async def invalidate_rows(rows: Iterable[dict]):
+    """Drop cached feed pages that a created/updated care request could affect."""
+    backend = await get_backend()
+    if backend is None:
+        return
+    rows = [r for r in rows if isinstance(r, dict)]
+    dropped = await backend.invalidate_rows(rows) if rows else 0
+    if not rows:
+        await backend.clear()
+    CACHE_INVALIDATIONS.inc(dropped)
+
+
+def cache_stats() -> dict:
+    """Backend configuration, size and hit ratio, for the health endpoint."""
+    hits, misses = CACHE_LOOKUPS.value(result="hit"), CACHE_LOOKUPS.value(result="miss")
+    stats = _backend.stats() if _backend else {"backend": settings.FEED_CACHE_BACKEND, "open": False}
+    return {**stats, "hits": hits, "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0}
@@ -0,0 +1,305 @@
+# backend/geocoding.py
+"""
+Turn free-text care request locations into coordinates for radius search.
+
+Geocoders are pluggable (settings.GEOCODER):
+  * "gazetteer"          - offline lookup in data/gazetteer.csv (default)
+  * "none"               - never resolves anything
+  * "<module>:<callable>" - any factory returning an object with a
+                           `geocode(text) -> Optional[(lat, lon)]` method;
+                           it runs in a worker thread, so it may block
+
+Results, including misses, are cached per (provider, normalised text) in a
+per-worker LRU and persisted in the `geocode_cache` table, so a place is
+resolved once however many requests mention it.
+
+Stored points carry a geohash (GEOHASH_PRECISION chars, ~150 m cells).
+Radius queries select the handful of geohash prefixes covering the circle
+(an indexed LIKE 'prefix%' scan), then compute exact distances in Python.
+
+Backfill rows created before the geo columns existed (from backend/):
+    python geocoding.py --backfill
+"""
+
+import argparse
+import asyncio
+import csv
+import importlib
+import logging
+import math
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
+
+logger = logging.getLogger("careconnect.geocoding")
+
+GEOHASH_PRECISION = 7
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+# Upper bound on prefixes per radius query; fewer, coarser cells beyond this
+MAX_COVER_CELLS = 32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DEFAULT_GAZETTEER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.csv")
+
+Point = Tuple[float, float]
+
+
+# ========= Geohash / distance =========
+
+def geohash_encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of a geohash cell in degrees."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def covering_prefixes(lat: float, lon: float, radius_km: float) -> List[str]:
+    """Geohash prefixes whose cells together cover the circle around (lat, lon)."""
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = min(radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01)), 180.0)
+    lat_min, lat_max = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(precision)
+        cells = (math.floor((lat_max - lat_min) / height) + 2) * (math.floor(2 * dlon / width) + 2)
+        if cells <= MAX_COVER_CELLS:
+            break
+
+    def steps(start, stop, step):
+        values = [start + i * step for i in range(int((stop - start) / step) + 1)]
+        return values + [stop]
+
+    prefixes = set()
+    for a in steps(lat_min, lat_max, height):
+        for b in steps(lon - dlon, lon + dlon, width):
+            prefixes.add(geohash_encode(min(a, 89.999999), (b + 180.0) % 360.0 - 180.0, precision))
+    return sorted(prefixes)
+
+
+def haversine_km(a: Point, b: Point) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+# ========= Geocoders =========
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+class NullGeocoder:
+    name = "none"
+
+    def geocode(self, text: str) -> Optional[Point]:
+        return None
+
+
+class GazetteerGeocoder:
+    """
+    Offline lookup of place names (and aliases) from a CSV with columns
+    name,latitude,longitude,aliases (aliases separated by `|`). The longest
+    place name found anywhere in the text wins, earliest first, so
+    "Flat 4, MG Road, Kochi, Kerala" resolves to Kochi.
+    """
+
+    name = "gazetteer"
+    MAX_NAME_WORDS = 3
+
+    def __init__(self, path: str):
+        self.places: Dict[str, Point] = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                point = (float(row["latitude"]), float(row["longitude"]))
+                for alias in [row["name"]] + (row.get("aliases") or "").split("|"):
+                    if alias.strip():
+                        self.places[normalize(alias)] = point
+
+    def geocode(self, text: str) -> Optional[Point]:
+        words = normalize(text).split()
+        for size in range(min(self.MAX_NAME_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                point = self.places.get(" ".join(words[start:start + size]))
+                if point is not None:
+                    return point
+        return None
+
+
+GEOCODERS = {
+    "gazetteer": lambda: GazetteerGeocoder(settings.GEOCODER_GAZETTEER_PATH or _DEFAULT_GAZETTEER),
+    "none": NullGeocoder,
+}
+
+_geocoder = None
+
+
+def get_geocoder():
+    global _geocoder
+    if _geocoder is None:
+        spec = settings.GEOCODER
+        if spec in GEOCODERS:
+            _geocoder = GEOCODERS[spec]()
+        else:
+            module, _, attr = spec.partition(":")
+            _geocoder = getattr(importlib.import_module(module), attr)()
+    return _geocoder
+
+
+def set_geocoder(geocoder):
+    """Swap the active geocoder (None: rebuild from settings) and forget cached lookups."""
+    global _geocoder
+    _geocoder = geocoder
+    _memory_cache.clear()
+
+
+# ========= Cache =========
+
+_memory_cache: "OrderedDict[Tuple[str, str], Optional[Point]]" = OrderedDict()
+
+
+def _remember(key: Tuple[str, str], point: Optional[Point]):
+    _memory_cache[key] = point
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > settings.GEOCODE_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+
+async def _load_cached(provider: str, query: str):
+    """(found, point) from the geocode_cache table; a missing table counts as a miss."""
+    response = await supabase_rest.get(
+        f"{supabase_rest.SUPABASE_URL}/rest/v1/geocode_cache"
+        f"?select=latitude,longitude&provider=eq.{quote(provider)}&query=eq.{quote(query)}",
+        headers=SERVICE_HEADERS,
+    )
+    if response.status_code >= 400:
+        logger.warning("geocode_cache lookup failed (%s): %s", response.status_code, response.text)
+        return False, None
+    rows = response.json()
+    if not rows:
+        return False, None
+    row = rows[0]
+    return True, (row["latitude"], row["longitude"]) if row["latitude"] is not None else None
+
+
+async def _save_cached(provider: str, query: str, point: Optional[Point]):
+    response = await supabase_rest.post(
+        f"{supabase_rest.SUPABASE_URL}/rest/v1/geocode_cache?on_conflict=provider,query",
+        json={"provider": provider, "query": query,
+              "latitude": point[0] if point else None, "longitude": point[1] if point else None},
+        headers={**SERVICE_HEADERS, "Prefer": "resolution=merge-duplicates,return=minimal"},
+    )
+    if response.status_code >= 400:
+        logger.warning("geocode_cache store failed (%s): %s", response.status_code, response.text)
+
+
+async def geocode(text: Optional[str]) -> Optional[Point]:
+    """Coordinates for a free-text location, or None when it can't be resolved."""
+    query = normalize(text or "")
+    if not query:
+        return None
+    geocoder = get_geocoder()
+    key = (geocoder.name, query)
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+
+    found, point = await _load_cached(geocoder.name, query)
+    if not found:
+        point = await run_in_threadpool(geocoder.geocode, text)
+        await _save_cached(geocoder.name, query, point)
+    _remember(key, point)
+    return point
+
+
+async def location_columns(text: Optional[str]) -> dict:
+    """latitude / longitude / geohash values to store alongside a care request's location."""
+    try:
+        point = await geocode(text)
+    except Exception:
+        # A geocoding failure must never block saving the request itself
+        logger.exception("Geocoding failed for %r", text)
+        point = None
+    if point is None:
+        return {"latitude": None, "longitude": None, "geohash": None}
+    return {"latitude": point[0], "longitude": point[1], "geohash": geohash_encode(*point)}
+
+
+# ========= Backfill =========
+
+async def backfill(batch_size: int = 500) -> int:
+    """Geocode care requests that have a location but no geohash yet; returns rows updated."""
+    updated, last_id = 0, None
+    while True:
+        url = (f"{supabase_rest.SUPABASE_URL}/rest/v1/care_requests?select=id,location"
+               f"&geohash=is.null&location=not.is.null&order=id.asc&limit={batch_size}")
+        if last_id:
+            url += f"&id=gt.{last_id}"
+        response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
+        response.raise_for_status()
+        rows = response.json()
+        if not rows:
+            return updated
+        last_id = rows[-1]["id"]
+
+        by_location: Dict[str, List[str]] = {}
+        for row in rows:
+            by_location.setdefault(row["location"], []).append(row["id"])
+        for location, ids in by_location.items():
+            columns = await location_columns(location)
+            if columns["geohash"] is None:
+                continue
+            response = await supabase_rest.patch(
+                f"{supabase_rest.SUPABASE_URL}/rest/v1/care_requests?id=in.({','.join(ids)})",
+                json=columns, headers=SERVICE_HEADERS,
+            )
+            response.raise_for_status()
+            updated += len(ids)
+        logger.info("Backfilled %d care requests so far", updated)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Geocode care request locations")
+    parser.add_argument("--backfill", action="store_true", help="Fill latitude/longitude/geohash on existing rows")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("text", nargs="*", help="Locations to look up (without --backfill)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def _main():
+        try:
+            if args.backfill:
+                print(f"updated {await backfill(args.batch_size)} care requests")
+            for text in args.text:
+                print(f"{text!r}: {await geocode(text)}")
+        finally:
+            await supabase_rest.close_client()
+
+    asyncio.run(_main())
@@ -1,4 +1,6 @@
 # backend/main.py
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routers import interview_requests
 from config import settings
@@ -39,16 +41,53 @@ from routers import face_capture
 from fastapi.staticfiles import StaticFiles
 from routers import face_capture
 from fastapi.responses import HTMLResponse
+from routers import face_recognition
 from routers.face_recognition import router as face_recognition_router
 from routers.digital_signatures import router as digital_signatures_router
-if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+from routers import matching
+from routers import export
+from routers import dashboard
+from fastapi.responses import Response
+import supabase_rest
+import db_pool
+import metrics
+import tracing
+import feed_cache
+import etag_cache
+
+logger = logging.getLogger("careconnect")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled PostgREST/Storage client for the whole worker
+    await supabase_rest.open_client()
+    # One asyncpg pool shared by every Postgres-backed router. An unreachable
+    # database must not keep the PostgREST-only routes down: the pool is then
+    # retried lazily by get_pool() on the first request that needs it.
+    try:
+        await db_pool.open_pool()
+    except Exception as e:
+        logger.error("Postgres pool unavailable at startup, pool-backed routes will fail until it is: %s", e)
+    if settings.PRELOAD_HEAVY_ROUTERS:
+        # Trade a slower boot for no first-request import cost
+        face_recognition.get_face_cascade()
+        agreementgeneration.get_pdfkit_config()
+        sessiongoogle.get_session_factory()
+        matching.get_engine()
+    # A custom lifespan replaces the default one, so run router on_event hooks here
+    await app.router.startup()
+    yield
+    await app.router.shutdown()
+    await db_pool.close_pool()
+    await supabase_rest.close_client()
 
 
 app = FastAPI(
     title="CareConnect Backend",
     description="APIs for Caregiver platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 origins = ["*"]  # Customize this for production
@@ -59,7 +98,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors/totals, ETags and upstream timings travel in response headers
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Results-Truncated", "ETag", "Server-Timing"],
 )
+# Per-request PostgREST / storage / db time, returned as a Server-Timing header
+app.add_middleware(tracing.ServerTimingMiddleware)
+# Outermost, so latency covers CORS and every other middleware
+app.add_middleware(metrics.MetricsMiddleware)
 
 # Optional: print to verify
 print("SUPABASE_DB_URL =", settings.SUPABASE_DB_URL)
@@ -194,9 +239,58 @@ app.include_router(
     tags=["User Roles"]
 )
 app.include_router(user_roles_util.router, tags=["User Roles Utility"])
+app.include_router(
+    matching.router,
+    prefix="/api/match",
+    tags=["Matching"]
+)
+app.include_router(
+    export.router,
+    prefix="/api/export",
+    tags=["Export"]
+)
+app.include_router(
+    dashboard.router,
+    prefix="/api/dashboard",
+    tags=["Dashboard"]
+)
+
+# Pool sizes, timeouts and per-call latency of the shared Supabase REST client
+@app.get("/health/rest-client", tags=["Health"])
+def rest_client_health():
+    return supabase_rest.client_stats()
+
+# Size and occupancy of the shared asyncpg pool
+@app.get("/health/db-pool", tags=["Health"])
+def db_pool_health():
+    return db_pool.pool_stats()
+
+# Backend, size and hit ratio of the available-care-requests cache
+@app.get("/health/feed-cache", tags=["Health"])
+def feed_cache_health():
+    return feed_cache.cache_stats()
+
+# Size and hit ratio of the ETag cache behind conditional single-entity reads
+@app.get("/health/etag-cache", tags=["Health"])
+def etag_cache_health():
+    return etag_cache.cache_stats()
+
+# Size and age of the matching feature indexes
+@app.get("/health/matching", tags=["Health"])
+def matching_health():
+    return matching.index_stats()
+
+# Prometheus scrape target: per-route latency, status and size counters
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 # Serve the camera-based HTML at "/"
 @app.get("/", response_class=HTMLResponse)
 def serve_face_capture_ui():
     with open("static/capture.html", "r") as f:
-        return f.read()
\ No newline at end of file
+        return f.read()
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,363 @@
+# backend/matching.py
+"""
+Caregiver <-> care request matching.
+
+Open care requests and caregiver profiles are loaded once per
+MATCH_INDEX_TTL seconds into column-wise NumPy feature arrays
+(multi-hot services, parsed age ranges and amounts, coordinates in
+radians, start preference). A recommendation then scores every row in a
+handful of vectorised operations and picks the top K with argpartition,
+so ranking tens of thousands of rows takes milliseconds.
+
+Each score is a weighted sum of per-feature scores in [0, 1] (WEIGHTS):
+  services - share of the request's needed services the caregiver offers
+  location - exp(-distance / LOCATION_SCALE_KM) to the nearest of the
+             caregiver's availability_locations (geocoded, see geocoding.py)
+  budget   - 1 when the caregiver's lowest charge fits the budget, falling
+             with the shortfall
+  age      - overlap of recipient_age_range with the caregiver's age_range
+  start    - a request wanting an immediate start needs start_immediately
+A feature either side leaves blank or unparseable scores UNKNOWN.
+"""
+
+import asyncio
+import math
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+import geocoding
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
+
+WEIGHTS = {"services": 0.40, "location": 0.25, "budget": 0.15, "age": 0.10, "start": 0.10}
+UNKNOWN = 0.5
+LOCATION_SCALE_KM = 25.0
+MAX_CAREGIVER_LOCATIONS = 8
+OPEN_AGE = 120.0
+CLOSED_STATUSES = {"closed", "cancelled", "canceled", "completed", "filled", "withdrawn"}
+
+REQUEST_COLUMNS = (
+    "id", "user_id", "status", "created_at", "location", "latitude", "longitude", "recipient_age_range",
+    "care_services_needed", "care_duration", "care_start_date_preference", "daily_working_hours", "estimated_budget",
+)
+CAREGIVER_COLUMNS = (
+    "user_id", "full_name", "avatar_url", "care_services", "availability_locations", "expected_charges",
+    "start_immediately", "age_range",
+)
+FETCH_BATCH = 1000
+GEOCODE_CONCURRENCY = 8
+
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)\s*(k|lakhs?|l)?\b", re.IGNORECASE)
+_MULTIPLIERS = {"k": 1e3, "l": 1e5, "lakh": 1e5, "lakhs": 1e5}
+_IMMEDIATE = re.compile(r"immediate|asap|urgent|right away|\bnow\b", re.IGNORECASE)
+_LOCATION_SEPARATORS = re.compile(r"[,;/|\n]|\band\b", re.IGNORECASE)
+_NAN2 = (math.nan, math.nan)
+
+
+# ========= Parsing =========
+
+def parse_amounts(text) -> Tuple[float, float]:
+    """(lowest, highest) amount in free text like "15k - 20,000/month"; NaN when none."""
+    if text is None:
+        return _NAN2
+    values = [float(number) * _MULTIPLIERS.get(unit.lower(), 1.0)
+              for number, unit in _NUMBER.findall(str(text).replace(",", ""))]
+    return (min(values), max(values)) if values else _NAN2
+
+
+def parse_age_range(text) -> Tuple[float, float]:
+    """ "60-70" -> (60, 70), "80+" -> (80, OPEN_AGE), "65" -> (65, 65); NaN when none."""
+    numbers = [float(n) for n in re.findall(r"\d+", str(text or ""))]
+    if not numbers:
+        return _NAN2
+    low = numbers[0]
+    high = numbers[1] if len(numbers) > 1 else (OPEN_AGE if "+" in str(text) else low)
+    return min(low, high), max(low, high)
+
+
+def wants_immediate_start(text) -> bool:
+    return bool(_IMMEDIATE.search(str(text or "")))
+
+
+def split_locations(text) -> List[str]:
+    parts = [geocoding.normalize(p) for p in _LOCATION_SEPARATORS.split(str(text or ""))]
+    return list(dict.fromkeys(p for p in parts if p))[:MAX_CAREGIVER_LOCATIONS]
+
+
+def _services(values) -> List[str]:
+    return [str(s).strip().lower() for s in (values or []) if str(s).strip()]
+
+
+def _multi_hot(rows_services: Sequence[List[str]], vocab: Dict[str, int]) -> np.ndarray:
+    matrix = np.zeros((len(rows_services), max(len(vocab), 1)), dtype=np.float32)
+    for i, services in enumerate(rows_services):
+        for service in services:
+            j = vocab.get(service)
+            if j is not None:
+                matrix[i, j] = 1.0
+    return matrix
+
+
+def _vocabulary(rows_services: Sequence[List[str]]) -> Dict[str, int]:
+    vocab: Dict[str, int] = {}
+    for services in rows_services:
+        for service in services:
+            vocab.setdefault(service, len(vocab))
+    return vocab
+
+
+# ========= Feature matrices =========
+
+class RequestMatrix:
+    """Feature arrays for open care requests, one row per request."""
+
+    def __init__(self, rows: List[dict]):
+        self.rows = rows
+        services = [_services(r.get("care_services_needed")) for r in rows]
+        self.vocab = _vocabulary(services)
+        self.services = _multi_hot(services, self.vocab)
+        self.needed = self.services.sum(axis=1)
+        ages = np.array([parse_age_range(r.get("recipient_age_range")) for r in rows], dtype=np.float64).reshape(-1, 2)
+        self.age_lo, self.age_hi = ages[:, 0], ages[:, 1]
+        self.budget_hi = np.array([parse_amounts(r.get("estimated_budget"))[1] for r in rows], dtype=np.float64)
+        self.lat = np.radians(np.array([_coord(r.get("latitude")) for r in rows], dtype=np.float64))
+        self.lon = np.radians(np.array([_coord(r.get("longitude")) for r in rows], dtype=np.float64))
+        self.immediate = np.array([wants_immediate_start(r.get("care_start_date_preference")) for r in rows], dtype=bool)
+
+
+class CaregiverMatrix:
+    """Feature arrays for caregiver profiles; locations are NaN-padded to the widest profile."""
+
+    def __init__(self, rows: List[dict], points: Dict[str, Optional[geocoding.Point]]):
+        self.rows = rows
+        services = [_services(r.get("care_services")) for r in rows]
+        self.vocab = _vocabulary(services)
+        self.services = _multi_hot(services, self.vocab)
+        ages = np.array([parse_age_range(r.get("age_range")) for r in rows], dtype=np.float64).reshape(-1, 2)
+        self.age_lo, self.age_hi = ages[:, 0], ages[:, 1]
+        self.charges_lo = np.array([parse_amounts(r.get("expected_charges"))[0] for r in rows], dtype=np.float64)
+        self.start_immediately = np.array([bool(r.get("start_immediately")) for r in rows], dtype=bool)
+
+        located = [[points[p] for p in split_locations(r.get("availability_locations")) if points.get(p)]
+                   for r in rows]
+        width = max((len(p) for p in located), default=0) or 1
+        self.lat = np.full((len(rows), width), np.nan)
+        self.lon = np.full((len(rows), width), np.nan)
+        for i, caregiver_points in enumerate(located):
+            for j, (lat, lon) in enumerate(caregiver_points):
+                self.lat[i, j], self.lon[i, j] = math.radians(lat), math.radians(lon)
+
+
+def _coord(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+# ========= Scoring =========
+
+def _age_score(req_lo, req_hi, cg_lo, cg_hi) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        overlap = np.minimum(req_hi, cg_hi) - np.maximum(req_lo, cg_lo) + 1
+        score = np.clip(overlap / (req_hi - req_lo + 1), 0.0, 1.0)
+    return np.where(np.isnan(score), UNKNOWN, score)
+
+
+def _budget_score(budget_hi, charge_lo) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = np.clip(budget_hi / charge_lo, 0.0, 1.0)
+    return np.where(np.isnan(score), UNKNOWN, score)
+
+
+def _location_score(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Score against the nearest point along the last axis; inputs in radians, NaN = unknown."""
+    with np.errstate(invalid="ignore"):
+        h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        distance = 2 * geocoding.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+    nearest = np.where(np.isnan(distance), np.inf, distance).min(axis=-1)
+    return np.where(np.isinf(nearest), UNKNOWN, np.exp(-nearest / LOCATION_SCALE_KM))
+
+
+def _combine(parts: Dict[str, np.ndarray]) -> np.ndarray:
+    return sum(WEIGHTS[name] * values for name, values in parts.items())
+
+
+def score_requests(requests: RequestMatrix, caregiver: dict,
+                   points: List[geocoding.Point]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Scores of every request in `requests` for one caregiver profile."""
+    n = len(requests.rows)
+    offered = np.zeros(requests.services.shape[1], dtype=np.float32)
+    for service in _services(caregiver.get("care_services")):
+        if service in requests.vocab:
+            offered[requests.vocab[service]] = 1.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        services = np.where(requests.needed > 0, (requests.services @ offered) / requests.needed, UNKNOWN)
+
+    age_lo, age_hi = parse_age_range(caregiver.get("age_range"))
+    if points:
+        lat2 = np.radians(np.array([p[0] for p in points]))[None, :]
+        lon2 = np.radians(np.array([p[1] for p in points]))[None, :]
+        location = _location_score(requests.lat[:, None], requests.lon[:, None], lat2, lon2)
+    else:
+        location = np.full(n, UNKNOWN)
+    parts = {
+        "services": services,
+        "location": location,
+        "budget": _budget_score(requests.budget_hi, parse_amounts(caregiver.get("expected_charges"))[0]),
+        "age": _age_score(requests.age_lo, requests.age_hi, age_lo, age_hi),
+        "start": np.where(requests.immediate, float(bool(caregiver.get("start_immediately"))), 1.0),
+    }
+    return _combine(parts), parts
+
+
+def score_caregivers(caregivers: CaregiverMatrix, request: dict,
+                     point: Optional[geocoding.Point]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Scores of every caregiver in `caregivers` for one care request."""
+    m = len(caregivers.rows)
+    needed = _services(request.get("care_services_needed"))
+    if needed:
+        columns = [caregivers.vocab[s] for s in needed if s in caregivers.vocab]
+        services = caregivers.services[:, columns].sum(axis=1) / len(needed)
+    else:
+        services = np.full(m, UNKNOWN)
+
+    age_lo, age_hi = parse_age_range(request.get("recipient_age_range"))
+    if point is not None:
+        location = _location_score(math.radians(point[0]), math.radians(point[1]), caregivers.lat, caregivers.lon)
+    else:
+        location = np.full(m, UNKNOWN)
+    immediate = wants_immediate_start(request.get("care_start_date_preference"))
+    parts = {
+        "services": services,
+        "location": location,
+        "budget": _budget_score(parse_amounts(request.get("estimated_budget"))[1], caregivers.charges_lo),
+        "age": _age_score(age_lo, age_hi, caregivers.age_lo, caregivers.age_hi),
+        "start": caregivers.start_immediately.astype(np.float64) if immediate else np.ones(m),
+    }
+    return _combine(parts), parts
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k best scores, best first (ties keep load order)."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.lexsort((best, -scores[best]))]
+
+
+def _results(key: str, rows: List[dict], scores: np.ndarray, parts: Dict[str, np.ndarray], k: int) -> List[dict]:
+    return [{
+        key: rows[i],
+        "score": round(float(scores[i]), 4),
+        "breakdown": {name: round(float(values[i]), 3) for name, values in parts.items()},
+    } for i in top_k(scores, k)]
+
+
+# ========= Loading =========
+
+async def _fetch_all(table: str, columns: Sequence[str], key: str) -> List[dict]:
+    rows: List[dict] = []
+    while True:
+        url = (f"{supabase_rest.SUPABASE_URL}/rest/v1/{table}?select={','.join(columns)}"
+               f"&order={key}.asc&limit={FETCH_BATCH}")
+        if rows:
+            url += f"&{key}=gt.{rows[-1][key]}"
+        response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
+        if response.status_code >= 400:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        batch = response.json()
+        rows.extend(batch)
+        if len(batch) < FETCH_BATCH:
+            return rows
+
+
+async def _geocode_all(places) -> Dict[str, Optional[geocoding.Point]]:
+    semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+
+    async def one(place):
+        async with semaphore:
+            return place, await geocoding.geocode(place)
+
+    return dict(await asyncio.gather(*(one(p) for p in places)))
+
+
+async def _load_requests() -> RequestMatrix:
+    rows = await _fetch_all("care_requests", REQUEST_COLUMNS, "id")
+    rows = [r for r in rows if str(r.get("status") or "").lower() not in CLOSED_STATUSES]
+    return await run_in_threadpool(RequestMatrix, rows)
+
+
+async def _load_caregivers() -> CaregiverMatrix:
+    rows = await _fetch_all("caregiver_profiles", CAREGIVER_COLUMNS, "user_id")
+    places = {p for r in rows for p in split_locations(r.get("availability_locations"))}
+    points = await _geocode_all(places)
+    return await run_in_threadpool(CaregiverMatrix, rows, points)
+
+
+class _Index:
+    """A feature matrix rebuilt at most once per MATCH_INDEX_TTL, shared by concurrent requests."""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._value = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._value is not None and time.monotonic() - self._built_at < settings.MATCH_INDEX_TTL
+
+    async def get(self):
+        if not self._fresh():
+            async with self._lock:
+                if not self._fresh():
+                    self._value = await self._loader()
+                    self._built_at = time.monotonic()
+        return self._value
+
+    def invalidate(self):
+        self._value = None
+
+    def stats(self) -> dict:
+        if self._value is None:
+            return {"built": False}
+        return {"built": True, "rows": len(self._value.rows), "age_s": round(time.monotonic() - self._built_at, 1)}
+
+
+_requests_index = _Index(_load_requests)
+_caregivers_index = _Index(_load_caregivers)
+
+
+def invalidate():
+    """Drop both indexes; the next recommendation reloads them."""
+    _requests_index.invalidate()
+    _caregivers_index.invalidate()
+
+
+def index_stats() -> dict:
+    return {"requests": _requests_index.stats(), "caregivers": _caregivers_index.stats(),
+            "ttl_s": settings.MATCH_INDEX_TTL}
+
+
+# ========= Recommendations =========
+
+async def requests_for_caregiver(profile: dict, limit: int) -> List[dict]:
+    requests = await _requests_index.get()
+    located = await _geocode_all(split_locations(profile.get("availability_locations")))
+    points = [p for p in located.values() if p]
+    scores, parts = score_requests(requests, profile, points)
+    return _results("care_request", requests.rows, scores, parts, limit)
+
+
+async def caregivers_for_request(request: dict, limit: int) -> List[dict]:
+    caregivers = await _caregivers_index.get()
+    if request.get("latitude") is not None and request.get("longitude") is not None:
+        point = (request["latitude"], request["longitude"])
+    else:
+        point = await geocoding.geocode(request.get("location"))
+    scores, parts = score_caregivers(caregivers, request, point)
+    return _results("caregiver", caregivers.rows, scores, parts, limit)
@@ -0,0 +1,229 @@
+# backend/metrics.py
+"""
+In-process request metrics rendered in the Prometheus text exposition format.
+
+Kept dependency-free on purpose: a handful of counters, gauges and histograms
+with a lock each is all the app needs, and other modules (REST client, DB
+pool) can register their own series on the same REGISTRY. Values are per
+worker process; run one scrape target per uvicorn worker.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, amount: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if amount <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += amount
+
+    def count(self, **labels) -> int:
+        row = self._values.get(self._key(labels))
+        return int(row[-2]) if row else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, row in items:
+            for bound, count in zip(self.buckets + (float("inf"),), row[:-1]):
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(count)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(row[-2])}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(row[-1])}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+REQUESTS_TOTAL = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+RESPONSE_BYTES = REGISTRY.counter(
+    "http_response_size_bytes_total", "Response body bytes sent by route template", ("method", "route"))
+IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served", ("method",))
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def _route_path(route) -> Optional[str]:
+    return getattr(route, "path_format", None) or getattr(route, "path", None)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no response buffering, safe for streaming bodies)
+    that times every HTTP request and labels it with the matched route
+    template, e.g. /api/care_requests/care_requests/{request_id}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes_by_endpoint: Optional[Dict[int, list]] = None
+
+    def _route_template(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return _route_path(route) or UNMATCHED_ROUTE
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._routes_by_endpoint is None:
+            index: Dict[int, list] = {}
+            for r in scope["app"].router.routes:
+                target = getattr(r, "endpoint", None) or getattr(r, "app", None)
+                index.setdefault(id(target), []).append(r)
+            self._routes_by_endpoint = index
+        candidates = self._routes_by_endpoint.get(id(endpoint), [])
+        if len(candidates) == 1:
+            return _route_path(candidates[0]) or UNMATCHED_ROUTE
+        # Same handler mounted under several prefixes: match on the original path
+        probe = {"type": "http", "path": scope["metrics.path"], "method": scope["method"]}
+        for r in candidates:
+            match, _ = r.matches(probe)
+            if match.name == "FULL":
+                return _route_path(r) or UNMATCHED_ROUTE
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        scope["metrics.path"] = scope["path"]
+        status = {"code": 500}
+        sent = {"bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                sent["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec(method=method)
+            route = self._route_template(scope)
+            REQUEST_LATENCY.observe(elapsed, method=method, route=route)
+            REQUESTS_TOTAL.inc(method=method, route=route, status=str(status["code"]))
+            RESPONSE_BYTES.inc(sent["bytes"], method=method, route=route)
@@ -0,0 +1,110 @@
+# backend/migrate.py
+"""
+Apply the SQL files in migrations/ to SUPABASE_DB, in name order, once each.
+
+Usage (from backend/):
+    python migrate.py            # apply pending migrations
+    python migrate.py --list     # show applied / pending
+
+Applied versions are recorded in public.schema_migrations. A file runs in a
+single transaction unless its header contains `-- no-transaction` (needed
+for CREATE INDEX CONCURRENTLY); such files should be idempotent (IF NOT
+EXISTS) so a failed run can simply be repeated.
+"""
+
+import argparse
+import asyncio
+import os
+from typing import List
+
+import asyncpg
+from config import settings
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a script on top-level semicolons, leaving $$-quoted bodies and comments intact."""
+    statements, current, i = [], [], 0
+    dollar_tag = None
+    while i < len(sql):
+        if dollar_tag is None and sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = len(sql) if end == -1 else end
+            current.append(sql[i:end])
+            i = end
+            continue
+        if sql[i] == "$":
+            end = sql.find("$", i + 1)
+            tag = sql[i:end + 1] if end != -1 else None
+            if tag and (tag == "$$" or tag[1:-1].isidentifier()):
+                if dollar_tag is None:
+                    dollar_tag = tag
+                elif tag == dollar_tag:
+                    dollar_tag = None
+                current.append(tag)
+                i = end + 1
+                continue
+        if sql[i] == ";" and dollar_tag is None:
+            statement = "".join(current).strip()
+            if any(line.strip() and not line.strip().startswith("--") for line in statement.splitlines()):
+                statements.append(statement)
+            current = []
+        else:
+            current.append(sql[i])
+        i += 1
+    statement = "".join(current).strip()
+    if any(line.strip() and not line.strip().startswith("--") for line in statement.splitlines()):
+        statements.append(statement)
+    return statements
+
+
+def discover() -> List[str]:
+    return sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql"))
+
+
+async def applied_versions(conn) -> set:
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS public.schema_migrations (
+            version text PRIMARY KEY,
+            applied_at timestamptz NOT NULL DEFAULT now()
+        )
+    """)
+    return {row["version"] for row in await conn.fetch("SELECT version FROM public.schema_migrations")}
+
+
+async def apply(conn, filename: str):
+    with open(os.path.join(MIGRATIONS_DIR, filename)) as f:
+        sql = f.read()
+    header = "\n".join(line for line in sql.splitlines()[:10] if line.startswith("--"))
+    if "no-transaction" in header:
+        for statement in split_statements(sql):
+            await conn.execute(statement)
+        await conn.execute("INSERT INTO public.schema_migrations (version) VALUES ($1)", filename)
+    else:
+        async with conn.transaction():
+            await conn.execute(sql)
+            await conn.execute("INSERT INTO public.schema_migrations (version) VALUES ($1)", filename)
+
+
+async def main(list_only: bool):
+    conn = await asyncpg.connect(settings.SUPABASE_DB)
+    try:
+        done = await applied_versions(conn)
+        for filename in discover():
+            if filename in done:
+                print(f"applied  {filename}")
+            elif list_only:
+                print(f"pending  {filename}")
+            else:
+                print(f"applying {filename} ...")
+                await apply(conn, filename)
+                print(f"applied  {filename}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply SQL migrations to SUPABASE_DB")
+    parser.add_argument("--list", action="store_true", help="Only show applied / pending migrations")
+    asyncio.run(main(parser.parse_args().list))
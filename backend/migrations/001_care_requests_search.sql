@@ -0,0 +1,30 @@
+-- 001: full-text search and trigram location matching for care_requests
+-- no-transaction (CREATE INDEX CONCURRENTLY cannot run inside one)
+--
+-- search_vector is a generated column, so Postgres keeps it current on every
+-- insert/update. Adding it rewrites the table once; run off-peak on large tables.
+-- Weights: caregiver_requirements A, special_needs / additional_expectations B,
+-- excluded_schedule_days C.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE public.care_requests
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(caregiver_requirements, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(special_needs, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(additional_expectations, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(excluded_schedule_days, '')), 'C')
+    ) STORED;
+
+-- Serves q= (search_vector @@ websearch_to_tsquery(...))
+CREATE INDEX CONCURRENTLY IF NOT EXISTS care_requests_search_vector_idx
+    ON public.care_requests USING gin (search_vector);
+
+-- Lets the existing location=ilike.*x* filter use an index instead of a sequential scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS care_requests_location_trgm_idx
+    ON public.care_requests USING gin (location gin_trgm_ops);
+
+-- Keyset pagination order (created_at desc, id desc)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS care_requests_created_at_id_idx
+    ON public.care_requests (created_at DESC, id DESC);
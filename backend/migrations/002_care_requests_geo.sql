@@ -0,0 +1,25 @@
+-- 002: coordinates for care request locations, radius search and the geocode cache
+-- no-transaction (CREATE INDEX CONCURRENTLY cannot run inside one)
+--
+-- latitude / longitude / geohash are filled by the API on create/update
+-- (geocoding.py); existing rows: `python geocoding.py --backfill`.
+
+ALTER TABLE public.care_requests
+    ADD COLUMN IF NOT EXISTS latitude double precision,
+    ADD COLUMN IF NOT EXISTS longitude double precision,
+    ADD COLUMN IF NOT EXISTS geohash text;
+
+-- near= queries scan a few geohash prefixes: geohash LIKE 'tdr1%'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS care_requests_geohash_idx
+    ON public.care_requests (geohash text_pattern_ops)
+    WHERE geohash IS NOT NULL;
+
+-- One row per (provider, normalised location text); NULL coordinates record a miss
+CREATE TABLE IF NOT EXISTS public.geocode_cache (
+    provider text NOT NULL,
+    query text NOT NULL,
+    latitude double precision,
+    longitude double precision,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (provider, query)
+);
@@ -0,0 +1,11 @@
+-- 003: indexes behind the status-count endpoints (GROUP BY status)
+-- no-transaction (CREATE INDEX CONCURRENTLY cannot run inside one)
+--
+-- Counting per care seeker / care request / status becomes an index-only
+-- scan instead of reading (and shipping) every application row.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS care_applications_seeker_request_status_idx
+    ON public.care_applications (careseeker_user_id, care_request_id, status);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS care_applications_request_status_idx
+    ON public.care_applications (care_request_id, status);
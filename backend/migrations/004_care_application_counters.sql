@@ -0,0 +1,82 @@
+-- 004: incrementally maintained care application counters
+--
+-- care_application_counts            (care_request_id, status) -> count
+-- care_application_caregiver_counts  (caregiver_user_id, status) -> count
+--
+-- A trigger on care_applications keeps both current for every insert,
+-- update and delete, whichever client made it. Counters are backfilled
+-- here under a lock that holds off application writes for the duration;
+-- `python application_counters.py --reconcile [--fix]` re-checks them later.
+-- Rows whose count drops to 0 are kept (they are reused on the next change).
+
+CREATE TABLE IF NOT EXISTS public.care_application_counts (
+    care_request_id uuid NOT NULL,
+    status text NOT NULL,
+    count integer NOT NULL DEFAULT 0,
+    PRIMARY KEY (care_request_id, status)
+);
+
+CREATE TABLE IF NOT EXISTS public.care_application_caregiver_counts (
+    caregiver_user_id uuid NOT NULL,
+    status text NOT NULL,
+    count integer NOT NULL DEFAULT 0,
+    PRIMARY KEY (caregiver_user_id, status)
+);
+
+CREATE OR REPLACE FUNCTION public.bump_care_application_counts(
+    p_care_request_id uuid, p_caregiver_user_id uuid, p_status text, p_delta integer
+) RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    IF p_status IS NULL THEN
+        RETURN;
+    END IF;
+    IF p_care_request_id IS NOT NULL THEN
+        INSERT INTO public.care_application_counts AS c (care_request_id, status, count)
+        VALUES (p_care_request_id, p_status, p_delta)
+        ON CONFLICT (care_request_id, status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    IF p_caregiver_user_id IS NOT NULL THEN
+        INSERT INTO public.care_application_caregiver_counts AS c (caregiver_user_id, status, count)
+        VALUES (p_caregiver_user_id, p_status, p_delta)
+        ON CONFLICT (caregiver_user_id, status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.care_applications_maintain_counts() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.bump_care_application_counts(OLD.care_request_id, OLD.caregiver_user_id, OLD.status::text, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.bump_care_application_counts(NEW.care_request_id, NEW.caregiver_user_id, NEW.status::text, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+LOCK TABLE public.care_applications IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS care_applications_maintain_counts ON public.care_applications;
+CREATE TRIGGER care_applications_maintain_counts
+    AFTER INSERT OR DELETE OR UPDATE OF care_request_id, caregiver_user_id, status
+    ON public.care_applications
+    FOR EACH ROW EXECUTE FUNCTION public.care_applications_maintain_counts();
+
+TRUNCATE public.care_application_counts, public.care_application_caregiver_counts;
+
+INSERT INTO public.care_application_counts (care_request_id, status, count)
+SELECT care_request_id, status::text, count(*)
+FROM public.care_applications
+WHERE care_request_id IS NOT NULL AND status IS NOT NULL
+GROUP BY care_request_id, status;
+
+INSERT INTO public.care_application_caregiver_counts (caregiver_user_id, status, count)
+SELECT caregiver_user_id, status::text, count(*)
+FROM public.care_applications
+WHERE caregiver_user_id IS NOT NULL AND status IS NOT NULL
+GROUP BY caregiver_user_id, status;
+
+-- Counts now come from the counter tables, so nothing reads the per-seeker
+-- index from 003 any more; it only added write cost to every application
+DROP INDEX IF EXISTS public.care_applications_seeker_request_status_idx;
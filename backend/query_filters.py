@@ -0,0 +1,270 @@
+# backend/query_filters.py
+"""
+Declarative query filters, compiled to PostgREST clauses and parameterised SQL.
+
+A FilterSpec maps request parameters to a column, an operator and a type.
+`spec.parse(params)` returns a normalised FilterSet: blank values are
+dropped, text is trimmed, timestamps are put in ISO form, case-insensitive
+substrings are lowercased and multi-value alternatives are de-duplicated
+and sorted, so equivalent requests share `FilterSet.key`. A FilterSet renders as
+  * PostgREST clauses: values percent-encoded, and double-quoted where
+    PostgREST syntax needs it (in-lists, array literals, or-groups),
+  * SQL conditions with $n placeholders plus their arguments (asyncpg), and
+  * a Python predicate, `matches(row)`, used to invalidate cached results.
+Templates depend only on the filter shape (which parameters are set and
+how many alternatives each has), so each shape is compiled once and cached.
+
+Operators:
+  eq               exact; several alternatives become in.(...) / = ANY($n)
+  ilike            case-insensitive substring; alternatives are OR-ed
+  ov               array column holds at least one of the values
+  is               boolean
+  gt gte lt lte    ranges, e.g. created_after=... / created_before=...
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+_RANGE_SQL = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+# Characters that force double quotes inside PostgREST lists and logic groups
+_POSTGREST_RESERVED = set(',.:()"\\{} ')
+# Left readable in URLs; everything else in a clause value is percent-encoded
+_URL_SAFE = ",.*():{}"
+
+
+class Field(NamedTuple):
+    column: str
+    op: str = "eq"
+    type: str = "text"   # text | bool | date | timestamptz
+    multi: bool = False  # comma-separated (or list) alternatives allowed
+
+
+def escape_like(value: str) -> str:
+    """Make %, _ and \\ match literally in a LIKE pattern."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def quote_item(value: str) -> str:
+    """Double-quote a value for use inside a PostgREST list or or=(...) group when needed."""
+    if value and not set(value) & _POSTGREST_RESERVED:
+        return value
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "1", "yes"):
+        return True
+    if text in ("false", "0", "no"):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _normalise_timestamp(value: str) -> str:
+    """ISO form of a parseable timestamp ("Z" becomes "+00:00"); anything else is left for the database to reject."""
+    parsed = _as_datetime(value) if value else None
+    return parsed.isoformat() if parsed else value
+
+
+class FilterSpec:
+    def __init__(self, table: str, fields: Dict[str, Field]):
+        self.table = table
+        self.fields = fields
+        self._postgrest_templates: Dict[tuple, list] = {}
+        self._sql_templates: Dict[tuple, List[str]] = {}
+
+    def parse(self, params: Dict[str, Any]) -> "FilterSet":
+        """Normalise the spec's parameters out of `params` (other keys are ignored)."""
+        items = []
+        for name, field in self.fields.items():
+            raw = params.get(name)
+            if raw is None:
+                continue
+            if field.op == "is":
+                values = (_as_bool(raw),)
+            else:
+                parts = raw if isinstance(raw, (list, tuple)) else (str(raw).split(",") if field.multi else [raw])
+                parts = [str(p).strip() for p in parts]
+                if field.type == "timestamptz":
+                    parts = [_normalise_timestamp(p) for p in parts]
+                if field.op == "ilike":
+                    parts = [p.lower() for p in parts]
+                values = tuple(sorted(set(p for p in parts if p)))
+                if not field.multi:
+                    values = values[:1]
+            if values:
+                items.append((name, values))
+        return FilterSet(self, tuple(items))
+
+    # ---- compiled per shape ----
+
+    def postgrest_template(self, shape: tuple) -> List[Tuple[str, str, bool]]:
+        """[(query key, format string, quote values?)] for one filter shape."""
+        template = self._postgrest_templates.get(shape)
+        if template is None:
+            template = []
+            for name, count in shape:
+                field = self.fields[name]
+                slots = ",".join(["{}"] * count)
+                if field.op == "ilike" and count > 1:
+                    group = ",".join([f"{field.column}.ilike.{{}}"] * count)
+                    template.append(("or", f"({group})", True))
+                elif field.op == "eq" and count > 1:
+                    template.append((field.column, f"in.({slots})", True))
+                elif field.op == "ov":
+                    template.append((field.column, f"ov.{{{{{slots}}}}}", True))
+                else:
+                    template.append((field.column, f"{field.op}.{{}}", False))
+            self._postgrest_templates[shape] = template
+        return template
+
+    def sql_template(self, shape: tuple, start: int, alias: str) -> List[str]:
+        """SQL conditions for one filter shape, numbering placeholders from $start."""
+        key = (shape, start, alias)
+        conditions = self._sql_templates.get(key)
+        if conditions is None:
+            conditions, n = [], start
+            for name, count in shape:
+                field = self.fields[name]
+                column = f"{alias}.{field.column}" if alias else field.column
+                if field.op == "ilike":
+                    terms = [f"{column} ILIKE ${n + i}" for i in range(count)]
+                    conditions.append(terms[0] if count == 1 else "(" + " OR ".join(terms) + ")")
+                    n += count
+                    continue
+                if field.op == "eq":
+                    conditions.append(f"{column}::text = ${n}" if count == 1 else f"{column}::text = ANY(${n}::text[])")
+                elif field.op == "ov":
+                    conditions.append(f"{column}::text[] && ${n}::text[]")
+                elif field.op == "is":
+                    conditions.append(f"{column} = ${n}")
+                else:
+                    conditions.append(f"{column} {_RANGE_SQL[field.op]} (${n}::text)::{field.type}")
+                n += 1
+            self._sql_templates[key] = conditions
+        return conditions
+
+
+class FilterSet:
+    """Normalised filter values for one request; immutable and hashable by `key`."""
+
+    def __init__(self, spec: FilterSpec, items: Tuple[Tuple[str, tuple], ...]):
+        self.spec = spec
+        self.items = items
+        self.shape = tuple((name, len(values)) for name, values in items)
+        self.key = json.dumps(items, separators=(",", ":"), default=str)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly {param: value or [alternatives]}; `spec.parse()` reads it back unchanged."""
+        return {name: list(values) if self.spec.fields[name].multi else values[0] for name, values in self.items}
+
+    def to_postgrest(self) -> List[str]:
+        clauses = []
+        for (key, fmt, quoted), (name, values) in zip(self.spec.postgrest_template(self.shape), self.items):
+            field = self.spec.fields[name]
+            if field.op == "ilike":
+                rendered = [f"*{escape_like(v)}*" for v in values]
+            elif field.op == "is":
+                rendered = ["true" if values[0] else "false"]
+            else:
+                rendered = list(values)
+            if quoted:
+                rendered = [quote_item(v) for v in rendered]
+            clauses.append(f"{key}={quote(fmt.format(*rendered), safe=_URL_SAFE)}")
+        return clauses
+
+    def to_sql(self, start: int = 1, alias: str = "") -> Tuple[List[str], list]:
+        """(conditions, args) with placeholders numbered from $start."""
+        args: list = []
+        for name, values in self.items:
+            field = self.spec.fields[name]
+            if field.op == "ilike":
+                args.extend(f"%{escape_like(v)}%" for v in values)
+            elif field.op == "ov" or (field.op == "eq" and len(values) > 1):
+                args.append(list(values))
+            else:
+                args.append(values[0])
+        return self.spec.sql_template(self.shape, start, alias), args
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        """Could `row` satisfy these filters? Columns missing from the row count as matching."""
+        for name, values in self.items:
+            field = self.spec.fields[name]
+            if field.column not in row:
+                continue
+            value = row[field.column]
+            if field.op == "ilike":
+                ok = value is not None and any(v in str(value).lower() for v in values)
+            elif field.op == "ov":
+                ok = bool(set(values) & {str(v) for v in (value or [])})
+            elif field.op == "is":
+                ok = value is values[0]
+            elif field.op == "eq":
+                ok = value is not None and str(value) in values
+            else:
+                ok = _in_range(field.op, value, values[0])
+            if not ok:
+                return False
+        return True
+
+
+def _in_range(op: str, value, bound: str) -> bool:
+    if value is None:
+        return False
+    left, right = _as_datetime(value), _as_datetime(bound)
+    if left is None or right is None or (left.tzinfo is None) != (right.tzinfo is None):
+        left, right = str(value), bound
+    return {"gt": left > right, "gte": left >= right, "lt": left < right, "lte": left <= right}[op]
+
+
+# ========= care_requests =========
+
+CARE_REQUEST_FILTERS = FilterSpec("care_requests", {
+    "location": Field("location", "ilike"),
+    "recipient_age_range": Field("recipient_age_range", multi=True),
+    "care_services_needed": Field("care_services_needed", "ov", multi=True),
+    "primary_location_type": Field("primary_location_type", multi=True),
+    "care_duration": Field("care_duration", multi=True),
+    "care_start_date_preference": Field("care_start_date_preference", multi=True),
+    "specific_start_date": Field("specific_start_date", type="date"),
+    "caregiver_requirements": Field("caregiver_requirements", "ilike"),
+    "transportation_provided": Field("transportation_provided", "is", "bool"),
+    "accommodation_provided": Field("accommodation_provided", "is", "bool"),
+    "food_provided": Field("food_provided", "is", "bool"),
+    "daily_working_hours": Field("daily_working_hours"),
+    "excluded_schedule_days": Field("excluded_schedule_days", "ilike"),
+    "estimated_budget": Field("estimated_budget"),
+    "special_needs": Field("special_needs", "ilike"),
+    "additional_expectations": Field("additional_expectations", "ilike"),
+    "status": Field("status", multi=True),
+    "created_after": Field("created_at", "gte", "timestamptz"),
+    "created_before": Field("created_at", "lt", "timestamptz"),
+})
+
+
+# ========= care_applications =========
+
+CARE_APPLICATION_FILTERS = FilterSpec("care_applications", {
+    "care_request_id": Field("care_request_id", multi=True),
+    "caregiver_user_id": Field("caregiver_user_id", multi=True),
+    "careseeker_user_id": Field("careseeker_user_id", multi=True),
+    "status": Field("status", multi=True),
+    "created_after": Field("created_at", "gte", "timestamptz"),
+    "created_before": Field("created_at", "lt", "timestamptz"),
+})
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Query
-import httpx
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from urllib.parse import quote
 import os
 from dotenv import load_dotenv
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
+from query_filters import quote_item
+from routers.caregiver_profiles import CaregiverProfile
+from routers.care_requests import decode_cursor, encode_cursor
 
 load_dotenv()
 
@@ -10,52 +16,87 @@ review_router = APIRouter()
 SUPABASE_URL = os.getenv("SUPABASE_DB_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-HEADERS = {
-    "apikey": SUPABASE_SERVICE_ROLE_KEY,
-    "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# What the review list renders per applicant; fields=* returns whole profiles
+REVIEW_PROFILE_COLUMNS = (
+    "user_id", "full_name", "avatar_url", "care_services", "experience_description", "certifications",
+    "expected_charges", "availability_locations", "start_immediately", "age_range",
+)
+PROFILE_COLUMNS = ("id", "user_id", "created_at", "updated_at") + tuple(CaregiverProfile.__fields__)
+
+
+def _profile_select(fields: Optional[str]) -> str:
+    if not fields:
+        return ",".join(REVIEW_PROFILE_COLUMNS)
+    if fields == "*":
+        return "*"
+    columns = [c.strip() for c in fields.split(",") if c.strip()]
+    unknown = sorted(set(columns) - set(PROFILE_COLUMNS))
+    if unknown or not columns:
+        return None
+    # Profiles are matched to applications by user_id
+    return ",".join(dict.fromkeys(columns + ["user_id"]))
+
 
 @review_router.get("/api/review-care-applications")
 async def review_applications(
     care_request_id: str = Query(default=None),
-    careseeker_user_id: str = Query(default=None)
+    careseeker_user_id: str = Query(default=None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Profile columns (default: the review card), or *")
 ):
     if not care_request_id and not careseeker_user_id:
         return {"error": "Provide either care_request_id or careseeker_user_id"}
+    select = _profile_select(fields)
+    if select is None:
+        return {"error": f"Unknown profile fields; allowed: {', '.join(PROFILE_COLUMNS)} or *"}
 
-    # Build query for care_applications
-    query_param = ""
-    if care_request_id:
-        query_param = f"care_request_id=eq.{care_request_id}"
-    elif careseeker_user_id:
-        query_param = f"careseeker_user_id=eq.{careseeker_user_id}"
-
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            f"{SUPABASE_URL}/rest/v1/care_applications?{query_param}&select=caregiver_user_id,status",
-            headers=HEADERS
-        )
+    # Step 1: one page of applications, newest first
+    query = [f"care_request_id=eq.{care_request_id}" if care_request_id
+             else f"careseeker_user_id=eq.{careseeker_user_id}"]
+    if cursor:
+        try:
+            created_at, row_id = decode_cursor(cursor)
+        except HTTPException:
+            return {"error": "Invalid cursor"}
+        ts, rid = quote(f'"{created_at}"', safe=""), quote(f'"{row_id}"', safe="")
+        query.append(f"or=(created_at.lt.{ts},and(created_at.eq.{ts},id.lt.{rid}))")
+    query += ["select=id,caregiver_user_id,status,created_at", "order=created_at.desc,id.desc", f"limit={limit + 1}"]
 
+    resp = await supabase_rest.get(f"{SUPABASE_URL}/rest/v1/care_applications?{'&'.join(query)}",
+                                   headers=SERVICE_HEADERS)
     if resp.status_code != 200:
         return {"error": "Failed to query care_applications", "details": resp.text}
 
     care_applications = resp.json()
+    next_cursor = None
+    if len(care_applications) > limit:
+        care_applications = care_applications[:limit]
+        next_cursor = encode_cursor(care_applications[-1])
+
+    # Step 2: every applicant's profile in one user_id=in.(...) request
+    caregiver_ids = list(dict.fromkeys(a["caregiver_user_id"] for a in care_applications if a["caregiver_user_id"]))
+    profiles = {}
+    if caregiver_ids:
+        in_list = quote(",".join(quote_item(i) for i in caregiver_ids), safe=",")
+        profile_resp = await supabase_rest.get(
+            f"{SUPABASE_URL}/rest/v1/caregiver_profiles?user_id=in.({in_list})&select={select}",
+            headers=SERVICE_HEADERS
+        )
+        if profile_resp.status_code != 200:
+            return {"error": "Failed to query caregiver_profiles", "details": profile_resp.text}
+        profiles = {p["user_id"]: p for p in profile_resp.json()}
 
-    # Step 2: For each application, fetch caregiver profile
+    # Step 3: merge in application order; applicants without a profile are left out, as before
     profiles_with_status = []
-    async with httpx.AsyncClient() as client:
-        for app_record in care_applications:
-            caregiver_id = app_record["caregiver_user_id"]
-            status = app_record["status"]
-
-            profile_resp = await client.get(
-                f"{SUPABASE_URL}/rest/v1/caregiver_profiles?user_id=eq.{caregiver_id}&select=*",
-                headers=HEADERS
-            )
-
-            if profile_resp.status_code == 200 and profile_resp.json():
-                profile = profile_resp.json()[0]
-                profile["application_status"] = status
-                profiles_with_status.append(profile)
-
-    return {"caregiver_applications": profiles_with_status}
+    for app_record in care_applications:
+        profile = profiles.get(app_record["caregiver_user_id"])
+        if profile is not None:
+            profiles_with_status.append({**profile, "application_id": app_record["id"],
+                                         "application_status": app_record["status"],
+                                         "applied_at": app_record["created_at"]})
+
+    return {"caregiver_applications": profiles_with_status, "next_cursor": next_cursor}
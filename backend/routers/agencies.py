@@ -1,10 +1,12 @@
 # routers/agencies.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from typing import Optional
-import requests
+import supabase_rest
+import etag_cache
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 import jwt
 from config import settings
 from auth.auth_utils import get_authenticated_user_id
@@ -43,63 +45,53 @@ class AgencyResponse(BaseModel):
 # ======= Insert =======
 
 @router.post("/agencies/insert", tags=["Agencies"])
-def insert_agency(payload: AgencyInsert, user_id: str = Depends(get_authenticated_user_id)):
+async def insert_agency(payload: AgencyInsert, user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/agencies"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = payload.dict()
     data["user_id"] = user_id
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
+    etag_cache.invalidate("agency", user_id)
 
     return {"message": "Agency profile created", "data": response.json()}
 
 # ======= Update =======
 
 @router.put("/agencies/update", tags=["Agencies"])
-def update_agency(payload: AgencyUpdate, user_id: str = Depends(get_authenticated_user_id)):
+async def update_agency(payload: AgencyUpdate, user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/agencies?user_id=eq.{user_id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     update_data = {k: v for k, v in payload.dict().items() if v is not None}
 
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    response = requests.patch(url, json=update_data, headers=headers)
+    response = await supabase_rest.patch(url, json=update_data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 204):
         raise HTTPException(status_code=response.status_code, detail=response.text)
+    etag_cache.invalidate("agency", user_id)
 
     return {"message": "Agency profile updated", "data": response.json()}
 
 # ======= Query =======
 
 @router.get("/agencies/query", tags=["Agencies"], response_model=Optional[AgencyResponse])
-def get_agency(user_id: str = Depends(get_authenticated_user_id)):
-    url = f"{SUPABASE_URL}/rest/v1/agencies?user_id=eq.{user_id}&select=*"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
-
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+async def get_agency(request: Request, user_id: str = Depends(get_authenticated_user_id)):
+    async def fetch():
+        url = f"{SUPABASE_URL}/rest/v1/agencies?user_id=eq.{user_id}&select=*"
+
+        response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+
+        data = response.json()
+        if not data:
+            return None
 
-    data = response.json()
-    if not data:
-        return None
+        # The response is built by hand, so apply response_model here
+        return AgencyResponse.parse_obj(data[0])
 
-    return data[0]
+    return await etag_cache.conditional_json(request, ("agency", user_id, ""), fetch)
@@ -6,21 +6,14 @@ from datetime import date, datetime
 import os
 import uuid
 from auth.auth_utils import get_authenticated_user_id
-import supabase
+from supabase_client import get_supabase
 
 router = APIRouter()
 security = HTTPBearer()
 
 # Load environment variables
-SUPABASE_URL = os.getenv("SUPABASE_DB_URL", "").rstrip("/")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 SUPABASE_STORAGE_BUCKET = os.getenv("SUPABASE_BUCKET", "agreements")
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-    raise RuntimeError("Supabase environment variables are not set properly.")
-
-supabase_client = supabase.create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-
 def to_serializable(data: dict) -> dict:
     """Convert date/datetime objects to ISO 8601 strings."""
     for key, value in data.items():
@@ -65,7 +58,7 @@ def create_agreement(agreement: AgreementCreate, credentials: HTTPAuthorizationC
     data["created_on"] = datetime.utcnow()
     data = to_serializable(data)
 
-    response = supabase_client.table("agreements").insert(data).execute()
+    response = get_supabase().table("agreements").insert(data).execute()
     if not response.data:
         raise HTTPException(status_code=500, detail="Failed to create agreement")
 
@@ -81,7 +74,7 @@ def update_agreement(agreement: AgreementUpdate, credentials: HTTPAuthorizationC
     update_data = {k: v for k, v in agreement.dict().items() if v is not None and k != "id"}
     update_data = to_serializable(update_data)
 
-    response = supabase_client.table("agreements").update(update_data).eq("id", agreement.id).execute()
+    response = get_supabase().table("agreements").update(update_data).eq("id", agreement.id).execute()
 
     if not response.data:
         raise HTTPException(status_code=500, detail="Failed to update agreement")
@@ -95,7 +88,7 @@ def list_agreements(care_seeker_user_id: Optional[str] = None, caregiver_user_id
     if not user_id:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    query = supabase_client.table("agreements").select("*")
+    query = get_supabase().table("agreements").select("*")
 
     if care_seeker_user_id:
         query = query.eq("care_seeker_user_id", care_seeker_user_id)
@@ -124,7 +117,7 @@ def check_existing_agreement(
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     try:
-        query = supabase_client.table("agreements").select("*")
+        query = get_supabase().table("agreements").select("*")
 
         if care_request_id:
             query = query.eq("care_request_id", care_request_id)
@@ -5,7 +5,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from typing import Optional
 import jwt
-import requests
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 from config import settings
 from auth.auth_utils import get_authenticated_user_id
 router = APIRouter()
@@ -37,19 +38,13 @@ class BackgroundDocumentResponse(BaseModel):
 # ======= Insert =======
 
 @router.post("/background-check-documents/insert", tags=["Background Check Documents"])
-def insert_document(payload: BackgroundDocumentInsert, user_id: str = Depends(get_authenticated_user_id)):
+async def insert_document(payload: BackgroundDocumentInsert, user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/background_check_documents"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = payload.dict()
     data["user_id"] = user_id
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -58,20 +53,14 @@ def insert_document(payload: BackgroundDocumentInsert, user_id: str = Depends(ge
 # ======= Update =======
 
 @router.put("/background-check-documents/update", tags=["Background Check Documents"])
-def update_document(payload: BackgroundDocumentUpdate, user_id: str = Depends(get_authenticated_user_id)):
+async def update_document(payload: BackgroundDocumentUpdate, user_id: str = Depends(get_authenticated_user_id)):
     update_data = {k: v for k, v in payload.dict().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields provided for update")
 
     url = f"{SUPABASE_URL}/rest/v1/background_check_documents?user_id=eq.{user_id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
-
-    response = requests.patch(url, json=update_data, headers=headers)
+
+    response = await supabase_rest.patch(url, json=update_data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 204):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -80,14 +69,10 @@ def update_document(payload: BackgroundDocumentUpdate, user_id: str = Depends(ge
 # ======= Query =======
 
 @router.get("/background-check-documents/query", tags=["Background Check Documents"], response_model=list[BackgroundDocumentResponse])
-def get_documents(user_id: str = Depends(get_authenticated_user_id)):
+async def get_documents(user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/background_check_documents?user_id=eq.{user_id}&select=*"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -1,12 +1,16 @@
 # backend/routers/care_applications.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
+from uuid import UUID
 from config import settings
+import asyncpg
 import jwt
-import requests
+import supabase_rest
+from db_pool import get_db_connection
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 from auth.auth_utils import get_authenticated_user_id
 
 router = APIRouter()
@@ -24,6 +28,21 @@ class CareApplicationUpdate(BaseModel):
     id: str
     status: str
 
+class ApplicationStatusChange(BaseModel):
+    id: str
+    status: str
+
+class ApplicationStatusPredicate(BaseModel):
+    care_request_id: str
+    status: str
+    exclude_ids: List[str] = []  # e.g. the application that was just accepted
+    from_statuses: Optional[List[str]] = None  # only move applications currently in these statuses
+
+class BulkStatusUpdate(BaseModel):
+    changed_by_user_role: str  # Enum from app_role, recorded in care_request_status_history
+    updates: Optional[List[ApplicationStatusChange]] = None
+    where: Optional[ApplicationStatusPredicate] = None
+
 class CareApplication(BaseModel):
     id: str
     care_request_id: str
@@ -36,24 +55,18 @@ class CareApplication(BaseModel):
 
 # Insert
 @router.post("/care_applications/insert", tags=["Care Applications"])
-def insert_care_application(
+async def insert_care_application(
     payload: CareApplicationCreate,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/care_applications"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = {
         "care_request_id": payload.care_request_id,
         "caregiver_user_id": user_id
     }
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
 
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
@@ -62,24 +75,18 @@ def insert_care_application(
 
 # Update
 @router.put("/care_applications/update", tags=["Care Applications"])
-def update_care_application(
+async def update_care_application(
     payload: CareApplicationUpdate,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/care_applications?id=eq.{payload.id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = {
         "status": payload.status,
         "careseeker_user_id": user_id
     }
 
-    response = requests.patch(url, json=data, headers=headers)
+    response = await supabase_rest.patch(url, json=data, headers=REPRESENTATION_HEADERS)
 
     if response.status_code not in (200, 204):
         raise HTTPException(status_code=response.status_code, detail=response.text)
@@ -87,17 +94,13 @@ def update_care_application(
     return {"message": "Care application updated", "data": response.json()}
 
 @router.get("/care_applications/by_request", tags=["Care Applications"], response_model=List[CareApplication])
-def query_care_applications_by_request(
+async def query_care_applications_by_request(
     care_request_id: str = Query(..., description="ID of the care request"),
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/care_applications?care_request_id=eq.{care_request_id}&select=*"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
 
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
@@ -105,7 +108,7 @@ def query_care_applications_by_request(
     return response.json()
 
 @router.get("/care_applications/query", tags=["Care Applications"], response_model=List[CareApplication])
-def query_care_applications_by_caregiver(
+async def query_care_applications_by_caregiver(
     caregiver_user_id: Optional[str] = Query(None, description="Logged-in caregiver user ID"),
     user_id: str = Depends(get_authenticated_user_id)
 ):
@@ -113,14 +116,163 @@ def query_care_applications_by_caregiver(
     caregiver_id = caregiver_user_id or user_id
 
     url = f"{SUPABASE_URL}/rest/v1/care_applications?caregiver_user_id=eq.{caregiver_id}&select=*"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
 
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
     return response.json()
+
+# Upper bound on applications moved by one bulk_update call
+MAX_BULK_UPDATES = 500
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        UUID(value)
+        return True
+    except ValueError:
+        return False
+
+
+# Database errors caused by the submitted values rather than by the batch as a whole
+ROW_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError)
+
+# Enum-typed columns the bulk update writes
+ENUM_COLUMNS = (
+    ("care_applications", "status"),
+    ("care_request_status_history", "status"),
+    ("care_request_status_history", "changed_by_user_role"),
+)
+
+
+async def _enum_labels(conn) -> Dict[tuple, set]:
+    """{(table, column): labels} for those of ENUM_COLUMNS that are enum-typed."""
+    rows = await conn.fetch("""
+        SELECT c.relname AS table_name, a.attname AS column_name, array_agg(e.enumlabel::text) AS labels
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = 'public'
+        JOIN pg_enum e ON e.enumtypid = a.atttypid
+        WHERE (c.relname::text, a.attname::text) IN (SELECT * FROM unnest($1::text[], $2::text[]))
+        GROUP BY c.relname, a.attname
+    """, [t for t, _ in ENUM_COLUMNS], [c for _, c in ENUM_COLUMNS])
+    return {(row["table_name"], row["column_name"]): set(row["labels"]) for row in rows}
+
+
+def _allowed(labels: Dict[tuple, set], *columns: tuple) -> Optional[set]:
+    """Values valid for every one of `columns`; None when none of them is an enum."""
+    sets = [labels[c] for c in columns if c in labels]
+    return set.intersection(*sets) if sets else None
+
+
+async def _resolve_predicate(conn, where: ApplicationStatusPredicate, user_id: str) -> List[ApplicationStatusChange]:
+    """Applications of the caller's care request selected by `where`, locked for the update."""
+    rows = await conn.fetch("""
+        SELECT a.id::text AS id
+        FROM public.care_applications a
+        JOIN public.care_requests r ON r.id = a.care_request_id
+        WHERE a.care_request_id = $1::uuid AND r.user_id = $2::uuid
+          AND NOT (a.id = ANY($3::uuid[]))
+          AND ($4::text[] IS NULL OR a.status::text = ANY($4::text[]))
+        ORDER BY a.created_at, a.id
+        FOR UPDATE OF a
+    """, where.care_request_id, user_id, [i for i in where.exclude_ids if _is_uuid(i)], where.from_statuses)
+    return [ApplicationStatusChange(id=row["id"], status=where.status) for row in rows]
+
+
+@router.put("/care_applications/bulk_update", tags=["Care Applications"])
+async def bulk_update_care_applications(
+    payload: BulkStatusUpdate,
+    http_response: Response,
+    user_id: str = Depends(get_authenticated_user_id),
+    conn: asyncpg.Connection = Depends(get_db_connection)
+):
+    """
+    Move many applications of the caller's care requests to new statuses in one
+    transaction, recording a care_request_status_history row per change. Takes
+    either `updates: [{id, status}]` or `where: {care_request_id, status,
+    exclude_ids, from_statuses}` (e.g. reject everyone but the hire). Returns
+    a per-id outcome; applications already in the target status are left as is.
+    """
+    if (payload.updates is None) == (payload.where is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of `updates` or `where`")
+    if payload.where and not _is_uuid(payload.where.care_request_id):
+        raise HTTPException(status_code=400, detail="care_request_id must be a UUID")
+
+    # Enum values are checked up front: one bad value would otherwise abort the whole transaction
+    labels = await _enum_labels(conn)
+    roles = _allowed(labels, ("care_request_status_history", "changed_by_user_role"))
+    if roles is not None and payload.changed_by_user_role not in roles:
+        raise HTTPException(status_code=422, detail=f"Unknown changed_by_user_role: {payload.changed_by_user_role}")
+    statuses = _allowed(labels, ("care_applications", "status"), ("care_request_status_history", "status"))
+    if payload.where and statuses is not None and payload.where.status not in statuses:
+        raise HTTPException(status_code=422, detail=f"Unknown status: {payload.where.status}")
+
+    results: Dict[int, dict] = {}
+    async with conn.transaction():
+        changes = payload.updates if payload.updates is not None else \
+            await _resolve_predicate(conn, payload.where, user_id)
+        if len(changes) > MAX_BULK_UPDATES:
+            raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_UPDATES} applications per call")
+
+        wanted = {}
+        for index, change in enumerate(changes):
+            if not _is_uuid(change.id) or not change.status:
+                results[index] = {"id": change.id, "status_code": 422, "error": "Invalid id or status"}
+                continue
+            application_id = str(UUID(change.id))  # canonical form, as the database returns it
+            if statuses is not None and change.status not in statuses:
+                results[index] = {"id": change.id, "status_code": 422, "error": f"Unknown status: {change.status}"}
+            elif application_id in wanted:
+                results[index] = {"id": change.id, "status_code": 400, "error": "Application appears more than once"}
+            else:
+                wanted[application_id] = (index, change)
+
+        # Lock the caller's applications among the requested ids
+        current = {row["id"]: row for row in await conn.fetch("""
+            SELECT a.id::text AS id, a.status::text AS status, a.care_request_id::text AS care_request_id
+            FROM public.care_applications a
+            JOIN public.care_requests r ON r.id = a.care_request_id
+            WHERE a.id = ANY($1::uuid[]) AND r.user_id = $2::uuid
+            FOR UPDATE OF a
+        """, list(wanted), user_id)}
+
+        by_status: Dict[str, List[str]] = {}
+        history = []
+        for application_id, (index, change) in wanted.items():
+            row = current.get(application_id)
+            if row is None:
+                results[index] = {"id": change.id, "status_code": 404, "error": "Care application not found"}
+            elif row["status"] == change.status:
+                results[index] = {"id": change.id, "status_code": 200, "status": change.status, "changed": False}
+            else:
+                by_status.setdefault(change.status, []).append(application_id)
+                history.append((row["care_request_id"], change.status, payload.changed_by_user_role, user_id))
+                results[index] = {"id": change.id, "status_code": 200, "status": change.status,
+                                  "previous_status": row["status"], "changed": True}
+
+        # One UPDATE per target status (a handful at most) and one batched history insert
+        try:
+            for new_status, ids in by_status.items():
+                await conn.execute(
+                    "UPDATE public.care_applications SET status = $1, careseeker_user_id = $2 "
+                    "WHERE id = ANY($3::uuid[])",
+                    new_status, user_id, ids
+                )
+            if history:
+                await conn.executemany(
+                    "INSERT INTO public.care_request_status_history "
+                    "(care_request_id, status, changed_by_user_role, changed_by_user_id) VALUES ($1, $2, $3, $4)",
+                    history
+                )
+        except ROW_ERRORS as e:
+            # Rolls the transaction back; nothing in the batch was applied
+            raise HTTPException(status_code=422 if isinstance(e, asyncpg.DataError) else 409, detail=str(e))
+
+    ordered = [results[i] for i in sorted(results)]
+    failed = sum(1 for r in ordered if "error" in r)
+    # 207: some ids failed; each result carries its own status_code
+    http_response.status_code = 207 if failed else 200
+    return {"updated": sum(1 for r in ordered if r.get("changed")), "failed": failed, "results": ordered}
@@ -5,7 +5,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from typing import Optional
 import jwt
-import requests
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 from config import settings
 from auth.auth_utils import get_authenticated_user_id
 router = APIRouter()
@@ -38,19 +39,13 @@ class DisputeUpdate(BaseModel):
 # ======= Insert =======
 
 @router.post("/care-disputes/insert", tags=["Care Disputes"])
-def insert_dispute(payload: DisputeCreate, user_id: str = Depends(get_authenticated_user_id)):
+async def insert_dispute(payload: DisputeCreate, user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/care_disputes"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = payload.dict()
     data["care_receiver_user_id"] = user_id
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -59,20 +54,14 @@ def insert_dispute(payload: DisputeCreate, user_id: str = Depends(get_authentica
 # ======= Update =======
 
 @router.put("/care-disputes/update", tags=["Care Disputes"])
-def update_dispute(dispute_id: str, payload: DisputeUpdate, user_id: str = Depends(get_authenticated_user_id)):
+async def update_dispute(dispute_id: str, payload: DisputeUpdate, user_id: str = Depends(get_authenticated_user_id)):
     update_data = {k: v for k, v in payload.dict().items() if v is not None}
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields provided for update")
 
     url = f"{SUPABASE_URL}/rest/v1/care_disputes?id=eq.{dispute_id}&care_receiver_user_id=eq.{user_id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
-
-    response = requests.patch(url, json=update_data, headers=headers)
+
+    response = await supabase_rest.patch(url, json=update_data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 204):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -81,14 +70,10 @@ def update_dispute(dispute_id: str, payload: DisputeUpdate, user_id: str = Depen
 # ======= Query =======
 
 @router.get("/care-disputes/query", tags=["Care Disputes"])
-def query_my_disputes(user_id: str = Depends(get_authenticated_user_id)):
+async def query_my_disputes(user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/care_disputes?care_receiver_user_id=eq.{user_id}&select=*"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-    }
 
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
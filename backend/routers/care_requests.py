@@ -1,8 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
 from fastapi.security import HTTPBearer
-from pydantic import BaseModel
-from typing import List, Optional
-import requests
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+from uuid import UUID
+import asyncio
+import asyncpg
+import base64
+import json
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
+import feed_cache
+import etag_cache
+import care_request_search
+import geocoding
+from db_pool import get_db_connection
+from query_filters import CARE_REQUEST_FILTERS, FilterSet
 import os
 from dotenv import load_dotenv
 from auth.auth_utils import get_authenticated_user_id
@@ -23,6 +36,16 @@ if not SUPABASE_SERVICE_ROLE_KEY:
 router = APIRouter()
 security = HTTPBearer()
 
+# Listing endpoints page with an opaque (created_at, id) keyset cursor
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+PAGE_ORDER = "created_at.desc,id.desc"
+
+# near= radius search (geohash-indexed, see geocoding.py)
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 500.0
+NEAR_MAX_CANDIDATES = 2000
+
 # ========= Pydantic Models =========
 
 class CareRequestBase(BaseModel):
@@ -49,69 +72,424 @@ class CareRequestCreate(CareRequestBase):
 class CareRequestUpdate(CareRequestBase):
     status: Optional[str]
 
+# ========= Field projection =========
+
+# Columns a client may ask for with `fields=`; anything else is rejected
+CARE_REQUEST_COLUMNS = ("id", "user_id", "status", "created_at", "latitude", "longitude") + tuple(CareRequestBase.__fields__)
+
+# Named projections; "card" is what the feed/list cards render
+FIELD_PRESETS = {
+    "card": (
+        "id", "status", "created_at", "location", "recipient_age_range", "care_services_needed",
+        "care_duration", "care_start_date_preference", "daily_working_hours", "estimated_budget",
+    ),
+}
+
+
+def parse_fields(fields: Optional[str], required: Tuple[str, ...] = ()) -> str:
+    """Turn `fields=` (column list or preset name) into a PostgREST select clause."""
+    if not fields:
+        return "*"
+    if fields in FIELD_PRESETS:
+        columns = list(FIELD_PRESETS[fields])
+    else:
+        columns = [c.strip() for c in fields.split(",") if c.strip()]
+        unknown = sorted(set(columns) - set(CARE_REQUEST_COLUMNS))
+        if unknown or not columns:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown) or '(none given)'}. "
+                       f"Allowed: {', '.join(CARE_REQUEST_COLUMNS)} or a preset: {', '.join(FIELD_PRESETS)}"
+            )
+    for column in required:
+        if column not in columns:
+            columns.append(column)
+    return ",".join(dict.fromkeys(columns))
+
 # ========= Create =========
 
 @router.post("/care_requests", tags=["Care Requests"])
-def create_care_request(payload: CareRequestCreate, user_id: str = Depends(get_authenticated_user_id)):
+async def create_care_request(payload: CareRequestCreate, user_id: str = Depends(get_authenticated_user_id)):
     data = payload.dict()
     data["user_id"] = user_id
+    data.update(await geocoding.location_columns(data.get("location")))
 
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
-
-    response = requests.post(
+    response = await supabase_rest.post(
         f"{SUPABASE_URL}/rest/v1/care_requests",
         json=data,
-        headers=headers
+        headers=REPRESENTATION_HEADERS
     )
 
     if response.status_code >= 400:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
-    return response.json()
+    created = response.json()
+    await feed_cache.invalidate_rows(created if isinstance(created, list) else [created])
+    return created
 
 # ========= Update =========
 
 @router.put("/care_requests/{request_id}", tags=["Care Requests"])
-def update_care_request(
+async def update_care_request(
     request_id: str,
     payload: CareRequestUpdate,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     data = payload.dict(exclude_unset=True)
+    if "location" in data:
+        data.update(await geocoding.location_columns(data["location"]))
 
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
-
-    response = requests.patch(
+    response = await supabase_rest.patch(
         f"{SUPABASE_URL}/rest/v1/care_requests?id=eq.{request_id}&user_id=eq.{user_id}",
         json=data,
-        headers=headers
+        headers=REPRESENTATION_HEADERS
     )
 
     if response.status_code >= 400:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
+    etag_cache.invalidate("care_request", request_id)
     try:
-        return response.json()
+        updated = response.json()
     except Exception:
+        await feed_cache.invalidate_rows([])
         return {"message": "Update successful, but no JSON returned."}
+    await feed_cache.invalidate_rows(updated if isinstance(updated, list) else [updated])
+    return updated
+
+# ========= Bulk create / update =========
+
+# Upper bound on items per bulk call
+MAX_BULK_ITEMS = 100
+
+# Columns a bulk update may change (id, user_id and generated columns such as search_vector are left out)
+UPDATABLE_COLUMNS = ("status",) + tuple(CareRequestBase.__fields__) + ("latitude", "longitude", "geohash")
+
+# Database errors caused by an item's values rather than by the batch as a whole
+ROW_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError)
+
+# One UPDATE for the whole batch. $1 is a JSON array of patches, each with its
+# `id`; jsonb_populate_record() overlays a patch on the row as it is at update
+# time, so keys a patch leaves out keep their current values. Rows that are
+# missing or not owned by $2 are simply not matched: an update never inserts.
+BULK_UPDATE_SQL = f"""
+    UPDATE public.care_requests r
+    SET ({', '.join(UPDATABLE_COLUMNS)}) = (
+        SELECT {', '.join(f'p.{c}' for c in UPDATABLE_COLUMNS)} FROM jsonb_populate_record(r, v.patch) p
+    )
+    FROM jsonb_array_elements($1::jsonb) AS v(patch)
+    WHERE r.id = (v.patch->>'id')::uuid AND r.user_id = $2::uuid
+    RETURNING to_jsonb(r) - 'search_vector' AS row
+"""
+
+
+def _check_bulk_size(items: list):
+    if not items:
+        raise HTTPException(status_code=400, detail="Expected a non-empty JSON array")
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per bulk request")
+
+
+def _item_error(index: int, status_code: int, error) -> dict:
+    return {"index": index, "status_code": status_code, "error": error}
+
+
+async def _geocode_locations(locations) -> dict:
+    """{location: geo columns}, geocoding each distinct location once, concurrently."""
+    distinct = list(dict.fromkeys(locations))
+    columns = await asyncio.gather(*(geocoding.location_columns(loc) for loc in distinct))
+    return dict(zip(distinct, columns))
+
+
+async def _write_batch(url: str, rows: List[dict], headers: dict) -> List[Tuple[int, object]]:
+    """
+    Write `rows` in one PostgREST call; returns (status_code, row or error) per row.
+    PostgREST applies a batch atomically, so when the database rejects it the
+    rows are retried one by one to pin the failure on the offending items.
+    """
+    response = await supabase_rest.post(url, json=rows, headers=headers)
+    if response.status_code < 400:
+        written = response.json()
+        return [(response.status_code, row) for row in written]
+    if response.status_code >= 500 or len(rows) == 1:
+        return [(response.status_code, response.text)] * len(rows)
+
+    results = []
+    for row in rows:
+        single = await supabase_rest.post(url, json=[row], headers=headers)
+        results.append((single.status_code, single.json()[0]) if single.status_code < 400
+                       else (single.status_code, single.text))
+    return results
+
+
+async def _update_rows(conn: asyncpg.Connection, patches: List[dict], user_id: str) -> List[dict]:
+    rows = await conn.fetch(BULK_UPDATE_SQL, patches, user_id)
+    return [row["row"] for row in rows]
+
+
+def _bulk_response(results: List[dict], http_response: Response, ok_status: int) -> dict:
+    results.sort(key=lambda r: r["index"])
+    failed = sum(1 for r in results if "error" in r)
+    # 207: some items failed; each item carries its own status_code
+    http_response.status_code = 207 if failed else ok_status
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+@router.post("/care_requests/bulk", tags=["Care Requests"])
+async def bulk_create_care_requests(
+    http_response: Response,
+    items: List[dict] = Body(...),
+    user_id: str = Depends(get_authenticated_user_id)
+):
+    """
+    Create up to MAX_BULK_ITEMS care requests in one batched insert. Items are
+    validated individually; invalid ones are reported and the rest are written.
+    """
+    _check_bulk_size(items)
+    results, valid = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, CareRequestCreate.parse_obj(item).dict()))
+        except ValidationError as e:
+            results.append(_item_error(index, 422, e.errors()))
+
+    if valid:
+        geo = await _geocode_locations(data["location"] for _, data in valid)
+        rows = [{**data, "user_id": user_id, **geo[data["location"]]} for _, data in valid]
+        written = await _write_batch(f"{SUPABASE_URL}/rest/v1/care_requests", rows, REPRESENTATION_HEADERS)
+        for (index, _), (status_code, outcome) in zip(valid, written):
+            results.append({"index": index, "status_code": 201, "data": outcome} if status_code < 400
+                           else _item_error(index, status_code, outcome))
+        await feed_cache.invalidate_rows([r["data"] for r in results if "data" in r])
+
+    return _bulk_response(results, http_response, 201)
+
+
+@router.patch("/care_requests/bulk", tags=["Care Requests"])
+async def bulk_update_care_requests(
+    http_response: Response,
+    items: List[dict] = Body(...),
+    user_id: str = Depends(get_authenticated_user_id),
+    conn: asyncpg.Connection = Depends(get_db_connection)
+):
+    """
+    Update up to MAX_BULK_ITEMS of the caller's care requests. Each item is a
+    CareRequestUpdate plus its `id`; unset optional fields keep their stored
+    values. All items are applied by one UPDATE (BULK_UPDATE_SQL) that only
+    matches rows the caller owns.
+    """
+    _check_bulk_size(items)
+    results, valid, seen = [], [], set()
+    for index, item in enumerate(items):
+        request_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(request_id, str) or not request_id:
+            results.append(_item_error(index, 422, "Each item needs a string `id`"))
+            continue
+        try:
+            request_id = str(UUID(request_id))  # canonical form, as the database returns it
+        except ValueError:
+            results.append(_item_error(index, 422, "`id` must be a UUID"))
+            continue
+        if request_id in seen:
+            results.append(_item_error(index, 400, f"Care request {request_id} appears more than once"))
+            continue
+        try:
+            data = CareRequestUpdate.parse_obj(item).dict(exclude_unset=True)
+        except ValidationError as e:
+            results.append(_item_error(index, 422, e.errors()))
+            continue
+        seen.add(request_id)
+        valid.append((index, request_id, data))
+
+    if valid:
+        geo = await _geocode_locations(data["location"] for _, _, data in valid if "location" in data)
+        patches = [{**data, **geo.get(data.get("location"), {}), "id": request_id} for _, request_id, data in valid]
+        try:
+            updated = {row["id"]: row for row in await _update_rows(conn, patches, user_id)}
+            failures = {}
+        except ROW_ERRORS:
+            # The statement is atomic; rerun item by item to pin the failure on the offending items
+            updated, failures = {}, {}
+            for patch in patches:
+                try:
+                    updated.update((row["id"], row) for row in await _update_rows(conn, [patch], user_id))
+                except ROW_ERRORS as e:
+                    failures[patch["id"]] = (422 if isinstance(e, asyncpg.DataError) else 409, str(e))
+
+        for index, request_id, _ in valid:
+            etag_cache.invalidate("care_request", request_id)
+            if request_id in updated:
+                results.append({"index": index, "status_code": 200, "data": updated[request_id]})
+            elif request_id in failures:
+                results.append(_item_error(index, *failures[request_id]))
+            else:
+                results.append(_item_error(index, 404, f"Care request {request_id} not found"))
+        await feed_cache.invalidate_rows(list(updated.values()))
+
+    return _bulk_response(results, http_response, 200)
+
+# ========= Keyset pagination =========
+
+def encode_cursor(row: dict) -> str:
+    raw = json.dumps([row["created_at"], row["id"]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        if not isinstance(created_at, str) or not isinstance(row_id, str):
+            raise ValueError
+        return created_at, row_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_clause(cursor: str) -> str:
+    """Rows strictly after the cursor in (created_at desc, id desc) order."""
+    created_at, row_id = decode_cursor(cursor)
+    ts = quote(f'"{created_at}"', safe="")
+    rid = quote(f'"{row_id}"', safe="")
+    return f"or=(created_at.lt.{ts},and(created_at.eq.{ts},id.lt.{rid}))"
+
+
+async def _fetch_page(filter_clauses: List[str], limit: int, cursor: Optional[str],
+                      count: Optional[str], http_response: Response, fields: Optional[str] = None) -> list:
+    """
+    Fetch one page of care requests. The next-page cursor is returned in the
+    X-Next-Cursor header (absent on the last page) and, when `count` is set,
+    the total number of matches in X-Total-Count.
+    """
+    # The cursor is built from created_at and id, so a projection always keeps them
+    clauses = [f"select={parse_fields(fields, required=('id', 'created_at'))}"] + list(filter_clauses)
+    if cursor:
+        clauses.append(_keyset_clause(cursor))
+    # One extra row tells us whether another page exists
+    clauses += [f"order={PAGE_ORDER}", f"limit={limit + 1}"]
+
+    headers = {**SERVICE_HEADERS, "Prefer": f"count={count}"} if count else SERVICE_HEADERS
+    url = f"{SUPABASE_URL}/rest/v1/care_requests?{'&'.join(clauses)}"
+
+    response = await supabase_rest.get(url, headers=headers)
+
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+
+    rows = response.json()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        http_response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+    if count:
+        total = response.headers.get("content-range", "").rpartition("/")[2]
+        if total and total != "*":
+            http_response.headers["X-Total-Count"] = total
+    return rows
+
+
+async def _search_page(q: str, filters: FilterSet, limit: int, cursor: Optional[str], count: Optional[str],
+                       http_response: Response, fields: Optional[str] = None,
+                       user_id: Optional[str] = None) -> list:
+    """`q=` mode: relevance-ranked full-text matches with highlights (see care_request_search)."""
+    # Cached feed pages are invalidated by the ids they hold, so a projection always keeps id
+    select = parse_fields(fields, required=("id",))
+    columns = None if select == "*" else select.split(",")
+    rows, next_cursor, total = await care_request_search.search(
+        q, filters, limit, user_id=user_id, cursor=cursor, columns=columns, with_count=bool(count)
+    )
+    if next_cursor:
+        http_response.headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        http_response.headers["X-Total-Count"] = str(total)
+    return rows
+
+
+def parse_near(near: str) -> Tuple[float, float]:
+    try:
+        lat, lon = (float(part) for part in near.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="near must be 'lat,lon'")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise HTTPException(status_code=400, detail="near is out of range")
+    return lat, lon
+
+
+def _encode_near_cursor(distance: float, row_id: str) -> str:
+    raw = json.dumps([distance, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_near_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        distance, row_id = json.loads(raw)
+        if not isinstance(distance, (int, float)) or not isinstance(row_id, str):
+            raise ValueError
+        return float(distance), row_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _near_page(filter_clauses: List[str], near: str, radius_km: float, limit: int, cursor: Optional[str],
+                     count: Optional[str], http_response: Response, fields: Optional[str] = None) -> list:
+    """
+    `near=` mode: requests within radius_km of a point, nearest first, each
+    with `distance_km`. Candidates come from the geohash cells covering the
+    circle (at most NEAR_MAX_CANDIDATES); exact distances are computed here.
+    Pages continue from an opaque (distance, id) cursor.
+    """
+    origin = parse_near(near)
+    after = _decode_near_cursor(cursor) if cursor else None
+    prefixes = geocoding.covering_prefixes(origin[0], origin[1], radius_km)
+
+    clauses = [f"select={parse_fields(fields, required=('id', 'latitude', 'longitude'))}"] + list(filter_clauses)
+    clauses.append(f"or=({','.join(f'geohash.like.{prefix}*' for prefix in prefixes)})")
+    clauses.append(f"limit={NEAR_MAX_CANDIDATES}")
+    url = f"{SUPABASE_URL}/rest/v1/care_requests?{'&'.join(clauses)}"
+
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
+
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+
+    candidates = response.json()
+    if len(candidates) >= NEAR_MAX_CANDIDATES:
+        http_response.headers["X-Results-Truncated"] = "true"
+
+    in_radius = []
+    for row in candidates:
+        if row.get("latitude") is None or row.get("longitude") is None:
+            continue
+        distance = geocoding.haversine_km(origin, (row["latitude"], row["longitude"]))
+        if distance <= radius_km:
+            in_radius.append((distance, row["id"], row))
+    matches = sorted((m for m in in_radius if after is None or m[:2] > after), key=lambda m: m[:2])
+
+    if len(matches) > limit:
+        http_response.headers["X-Next-Cursor"] = _encode_near_cursor(*matches[limit - 1][:2])
+    if count:
+        http_response.headers["X-Total-Count"] = str(len(in_radius))
+    rows = []
+    for distance, _, row in matches[:limit]:
+        row["distance_km"] = round(distance, 3)
+        rows.append(row)
+    return rows
+
+
+async def _store_feed_page(cache_key: str, filters: FilterSet, rows: list, http_response: Response) -> list:
+    page_headers = {k: v for k, v in http_response.headers.items() if k in ("x-next-cursor", "x-total-count")}
+    if await feed_cache.store(cache_key, filters.as_dict(), rows, page_headers):
+        http_response.headers["X-Cache"] = "miss"
+    return rows
 
 # ========= My Care Requests (for care seekers) =========
 
 @router.get("/my-care-requests", tags=["Care Requests"])
-def list_my_care_requests(
+async def list_my_care_requests(
+    http_response: Response,
     location: Optional[str] = Query(None),
     recipient_age_range: Optional[str] = Query(None),
-    care_services_needed: Optional[str] = Query(None),  # match any one
+    care_services_needed: Optional[str] = Query(None),  # match any one (comma-separated)
     primary_location_type: Optional[str] = Query(None),
     care_duration: Optional[str] = Query(None),
     care_start_date_preference: Optional[str] = Query(None),
@@ -125,67 +503,33 @@ def list_my_care_requests(
     estimated_budget: Optional[str] = Query(None),
     special_needs: Optional[str] = Query(None),
     additional_expectations: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, description="Comma-separated statuses to include"),
+    created_after: Optional[str] = Query(None, description="ISO timestamp, inclusive"),
+    created_before: Optional[str] = Query(None, description="ISO timestamp, exclusive"),
+    q: Optional[str] = Query(None, description="Full-text search; results ranked by relevance with highlights"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    count: Optional[str] = Query(None, regex="^(exact|estimated|planned)$", description="Also return X-Total-Count"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or a preset: card"),
     user_id: str = Depends(get_authenticated_user_id)  # Secure with JWT
 ):
     """Get care requests created by the authenticated user (for care seekers)"""
-    filter_clauses = [f"user_id=eq.{user_id}"]
-
-    if location:
-        filter_clauses.append(f"location=ilike.*{location}*")
-    if recipient_age_range:
-        filter_clauses.append(f"recipient_age_range=eq.{recipient_age_range}")
-    if care_services_needed:
-        filter_clauses.append(f"care_services_needed=cs.{{{care_services_needed}}}")
-    if primary_location_type:
-        filter_clauses.append(f"primary_location_type=eq.{primary_location_type}")
-    if care_duration:
-        filter_clauses.append(f"care_duration=eq.{care_duration}")
-    if care_start_date_preference:
-        filter_clauses.append(f"care_start_date_preference=eq.{care_start_date_preference}")
-    if specific_start_date:
-        filter_clauses.append(f"specific_start_date=eq.{specific_start_date}")
-    if caregiver_requirements:
-        filter_clauses.append(f"caregiver_requirements=ilike.*{caregiver_requirements}*")
-    if transportation_provided is not None:
-        filter_clauses.append(f"transportation_provided=eq.{str(transportation_provided).lower()}")
-    if accommodation_provided is not None:
-        filter_clauses.append(f"accommodation_provided=eq.{str(accommodation_provided).lower()}")
-    if food_provided is not None:
-        filter_clauses.append(f"food_provided=eq.{str(food_provided).lower()}")
-    if daily_working_hours:
-        filter_clauses.append(f"daily_working_hours=eq.{daily_working_hours}")
-    if excluded_schedule_days:
-        filter_clauses.append(f"excluded_schedule_days=ilike.*{excluded_schedule_days}*")
-    if estimated_budget:
-        filter_clauses.append(f"estimated_budget=eq.{estimated_budget}")
-    if special_needs:
-        filter_clauses.append(f"special_needs=ilike.*{special_needs}*")
-    if additional_expectations:
-        filter_clauses.append(f"additional_expectations=ilike.*{additional_expectations}*")
-
-    query_string = "&".join(filter_clauses)
-
-    url = f"{SUPABASE_URL}/rest/v1/care_requests?{query_string}&order=created_at.desc"
-
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-    }
-
-    response = requests.get(url, headers=headers)
+    filters = CARE_REQUEST_FILTERS.parse(dict(locals()))
+    if q:
+        return await _search_page(q, filters, limit, cursor, count, http_response, fields, user_id=user_id)
 
-    if response.status_code >= 400:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+    filter_clauses = [f"user_id=eq.{user_id}"] + filters.to_postgrest()
 
-    return response.json()
+    return await _fetch_page(filter_clauses, limit, cursor, count, http_response, fields)
 
 # ========= Find Available Care Requests (for caregivers) =========
 
 @router.get("/available-care-requests", tags=["Care Requests"])
-def find_available_care_requests(
+async def find_available_care_requests(
+    http_response: Response,
     location: Optional[str] = Query(None),
     recipient_age_range: Optional[str] = Query(None),
-    care_services_needed: Optional[str] = Query(None),  # match any one
+    care_services_needed: Optional[str] = Query(None),  # match any one (comma-separated)
     primary_location_type: Optional[str] = Query(None),
     care_duration: Optional[str] = Query(None),
     care_start_date_preference: Optional[str] = Query(None),
@@ -199,97 +543,83 @@ def find_available_care_requests(
     estimated_budget: Optional[str] = Query(None),
     special_needs: Optional[str] = Query(None),
     additional_expectations: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, description="Comma-separated statuses to include"),
+    created_after: Optional[str] = Query(None, description="ISO timestamp, inclusive"),
+    created_before: Optional[str] = Query(None, description="ISO timestamp, exclusive"),
+    q: Optional[str] = Query(None, description="Full-text search; results ranked by relevance with highlights"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    count: Optional[str] = Query(None, regex="^(exact|estimated|planned)$", description="Also return X-Total-Count"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or a preset: card"),
+    near: Optional[str] = Query(None, description="lat,lon - only requests within radius_km, nearest first"),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, le=MAX_RADIUS_KM),
     user_id: str = Depends(get_authenticated_user_id)  # Secure with JWT
 ):
     """Find available care requests for caregivers to apply to"""
-    # Start with basic filters - show all care requests (not filtering by status for now)
-    filter_clauses = []
-
-    # Add search filters
-    if location:
-        filter_clauses.append(f"location=ilike.*{location}*")
-    if recipient_age_range:
-        filter_clauses.append(f"recipient_age_range=eq.{recipient_age_range}")
-    if care_services_needed:
-        filter_clauses.append(f"care_services_needed=cs.{{{care_services_needed}}}")
-    if primary_location_type:
-        filter_clauses.append(f"primary_location_type=eq.{primary_location_type}")
-    if care_duration:
-        filter_clauses.append(f"care_duration=eq.{care_duration}")
-    if care_start_date_preference:
-        filter_clauses.append(f"care_start_date_preference=eq.{care_start_date_preference}")
-    if specific_start_date:
-        filter_clauses.append(f"specific_start_date=eq.{specific_start_date}")
-    if caregiver_requirements:
-        filter_clauses.append(f"caregiver_requirements=ilike.*{caregiver_requirements}*")
-    if transportation_provided is not None:
-        filter_clauses.append(f"transportation_provided=eq.{str(transportation_provided).lower()}")
-    if accommodation_provided is not None:
-        filter_clauses.append(f"accommodation_provided=eq.{str(accommodation_provided).lower()}")
-    if food_provided is not None:
-        filter_clauses.append(f"food_provided=eq.{str(food_provided).lower()}")
-    if daily_working_hours:
-        filter_clauses.append(f"daily_working_hours=eq.{daily_working_hours}")
-    if excluded_schedule_days:
-        filter_clauses.append(f"excluded_schedule_days=ilike.*{excluded_schedule_days}*")
-    if estimated_budget:
-        filter_clauses.append(f"estimated_budget=eq.{estimated_budget}")
-    if special_needs:
-        filter_clauses.append(f"special_needs=ilike.*{special_needs}*")
-    if additional_expectations:
-        filter_clauses.append(f"additional_expectations=ilike.*{additional_expectations}*")
-
-    query_string = "&".join(filter_clauses)
+    if q and near:
+        raise HTTPException(status_code=400, detail="q and near cannot be combined")
+    # The feed is the same for every caregiver, so identical filter sets share a cache entry
+    filters = CARE_REQUEST_FILTERS.parse(dict(locals()))
+    cache_key = feed_cache.make_key(filters.as_dict(), q=q, near=near, radius_km=radius_km if near else None,
+                                    limit=limit, cursor=cursor, count=count, fields=fields)
+    cached = await feed_cache.lookup(cache_key)
+    if cached is not None:
+        http_response.headers.update(cached["headers"])
+        http_response.headers["X-Cache"] = "hit"
+        return cached["rows"]
+
+    if q:
+        rows = await _search_page(q, filters, limit, cursor, count, http_response, fields)
+        return await _store_feed_page(cache_key, filters, rows, http_response)
+
+    # No status filter unless the caller asks for one
+    filter_clauses = filters.to_postgrest()
 
     # Get care requests without profile join
-    url = f"{SUPABASE_URL}/rest/v1/care_requests?{query_string}&order=created_at.desc"
+    if near:
+        rows = await _near_page(filter_clauses, near, radius_km, limit, cursor, count, http_response, fields)
+    else:
+        rows = await _fetch_page(filter_clauses, limit, cursor, count, http_response, fields)
+    return await _store_feed_page(cache_key, filters, rows, http_response)
 
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-    }
-
-    response = requests.get(url, headers=headers)
-
-    if response.status_code >= 400:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
-
-    return response.json()
 
 # ========= Get Single Care Request =========
 
 @router.get("/care_requests/{request_id}", tags=["Care Requests"])
-def get_care_request(
+async def get_care_request(
+    request: Request,
     request_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or a preset: card"),
     user_id: str = Depends(get_authenticated_user_id)
 ):
-    """Get a specific care request by ID"""
-    url = f"{SUPABASE_URL}/rest/v1/care_requests?id=eq.{request_id}"
+    """Get a specific care request by ID (ETag / If-None-Match aware)"""
+    select = parse_fields(fields)
 
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-    }
+    async def fetch():
+        url = f"{SUPABASE_URL}/rest/v1/care_requests?select={select}&id=eq.{request_id}"
 
-    response = requests.get(url, headers=headers)
+        response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
 
-    if response.status_code >= 400:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code >= 400:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+
+        result = response.json()
+
+        if not result:
+            raise HTTPException(status_code=404, detail="Care request not found")
+
+        return result[0]
 
-    result = response.json()
-    
-    if not result:
-        raise HTTPException(status_code=404, detail="Care request not found")
-    
-    return result[0]
+    return await etag_cache.conditional_json(request, ("care_request", request_id, select), fetch)
 
 # ========= Legacy endpoint (kept for backward compatibility) =========
 
 @router.get("/care_requests", tags=["Care Requests"])
-def list_care_requests(
+async def list_care_requests(
+    http_response: Response,
     location: Optional[str] = Query(None),
     recipient_age_range: Optional[str] = Query(None),
-    care_services_needed: Optional[str] = Query(None),  # match any one
+    care_services_needed: Optional[str] = Query(None),  # match any one (comma-separated)
     primary_location_type: Optional[str] = Query(None),
     care_duration: Optional[str] = Query(None),
     care_start_date_preference: Optional[str] = Query(None),
@@ -303,11 +633,19 @@ def list_care_requests(
     estimated_budget: Optional[str] = Query(None),
     special_needs: Optional[str] = Query(None),
     additional_expectations: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, description="Comma-separated statuses to include"),
+    created_after: Optional[str] = Query(None, description="ISO timestamp, inclusive"),
+    created_before: Optional[str] = Query(None, description="ISO timestamp, exclusive"),
+    q: Optional[str] = Query(None, description="Full-text search; results ranked by relevance with highlights"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    count: Optional[str] = Query(None, regex="^(exact|estimated|planned)$", description="Also return X-Total-Count"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or a preset: card"),
     user_id: str = Depends(get_authenticated_user_id)  # Secure with JWT
 ):
     """Legacy endpoint - now redirects to my-care-requests for backward compatibility"""
     # Redirect to the new endpoint
-    return list_my_care_requests(
+    return await list_my_care_requests(
         location=location,
         recipient_age_range=recipient_age_range,
         care_services_needed=care_services_needed,
@@ -324,5 +662,14 @@ def list_care_requests(
         estimated_budget=estimated_budget,
         special_needs=special_needs,
         additional_expectations=additional_expectations,
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+        q=q,
+        limit=limit,
+        cursor=cursor,
+        count=count,
+        fields=fields,
+        http_response=http_response,
         user_id=user_id
     ) 
\ No newline at end of file
@@ -4,7 +4,8 @@ from pydantic import BaseModel
 from typing import Optional, List
 from config import settings
 import jwt
-import requests
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 from auth.auth_utils import get_authenticated_user_id
 from fastapi import Query
 router = APIRouter()
@@ -58,22 +59,16 @@ class CareService(BaseModel):
 # ======= INSERT =======
 
 @router.post("/care_services/insert", tags=["Care Services"])
-def insert_care_service(
+async def insert_care_service(
     payload: CareServiceInsert,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/care_services"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = payload.dict()
     data["caregiver_user_id"] = user_id
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -82,23 +77,17 @@ def insert_care_service(
 # ======= UPDATE =======
 
 @router.put("/care_services/update", tags=["Care Services"])
-def update_care_service(
+async def update_care_service(
     payload: CareServiceUpdate,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/care_services?id=eq.{payload.id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = {k: v for k, v in payload.dict().items() if v is not None}
     if "cancellation_reason" in data:
         data["cancellation_requested_by"] = user_id
 
-    response = requests.patch(url, json=data, headers=headers)
+    response = await supabase_rest.patch(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 204):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -107,7 +96,7 @@ def update_care_service(
 # ======= QUERY (All Services for Caregiver) =======
 
 @router.get("/care_services/query", tags=["Care Services"], response_model=List[CareService])
-def get_my_care_services(
+async def get_my_care_services(
     caregiver_user_id: Optional[str] = Depends(get_authenticated_user_id),
     id: Optional[str] = Query(None),
     care_request_id: Optional[str] = Query(None),
@@ -155,12 +144,7 @@ def get_my_care_services(
     query_string = "&".join(filters)
     url = f"{base_url}?select=*" + (f"&{query_string}" if filters else "")
 
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
-
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
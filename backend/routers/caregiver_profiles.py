@@ -1,10 +1,12 @@
 # backend/routers/caregiver_profiles.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-import requests
+import supabase_rest
+import etag_cache
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 import jwt
 from config import settings
 from auth.auth_utils import get_authenticated_user_id
@@ -32,44 +34,34 @@ class CaregiverProfile(BaseModel):
 
 # ---- INSERT Profile ----
 @router.post("/insert")
-def insert_caregiver_profile(
+async def insert_caregiver_profile(
     payload: CaregiverProfile,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{settings.SUPABASE_DB_URL}/rest/v1/caregiver_profiles"
-    headers = {
-        "apikey": settings.SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {settings.SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = payload.dict()
     data["user_id"] = user_id
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code >= 400:
         raise HTTPException(status_code=response.status_code, detail=response.text)
+    etag_cache.invalidate("caregiver_profile", user_id)
 
     return response.json()
 
 # ---- UPDATE Profile ----
 @router.put("/update")
-def update_caregiver_profile(
+async def update_caregiver_profile(
     payload: CaregiverProfile,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{settings.SUPABASE_DB_URL}/rest/v1/caregiver_profiles?user_id=eq.{user_id}"
-    headers = {
-        "apikey": settings.SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {settings.SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
-
-    response = requests.patch(url, json=payload.dict(), headers=headers)
+
+    response = await supabase_rest.patch(url, json=payload.dict(), headers=REPRESENTATION_HEADERS)
     if response.status_code >= 400:
         raise HTTPException(status_code=response.status_code, detail=response.text)
+    etag_cache.invalidate("caregiver_profile", user_id)
 
     try:
         return response.json()
@@ -78,22 +70,22 @@ def update_caregiver_profile(
 
 # ---- GET Current User's Profile ----
 @router.get("/query")
-def get_my_caregiver_profile(
+async def get_my_caregiver_profile(
+    request: Request,
     caregiver_user_id: str = Query(default=None),
     user_id: str = Depends(get_authenticated_user_id)
 ):
     # Use caregiver_user_id if provided; otherwise, fallback to the authenticated user
     target_user_id = caregiver_user_id or user_id
 
-    url = f"{settings.SUPABASE_DB_URL}/rest/v1/caregiver_profiles?user_id=eq.{target_user_id}"
-    headers = {
-        "apikey": settings.SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {settings.SUPABASE_SERVICE_ROLE_KEY}"
-    }
+    async def fetch():
+        url = f"{settings.SUPABASE_DB_URL}/rest/v1/caregiver_profiles?user_id=eq.{target_user_id}"
 
-    response = requests.get(url, headers=headers)
+        response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
 
-    if response.status_code >= 400:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
+        if response.status_code >= 400:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
 
-    return response.json()
+        return response.json()
+
+    return await etag_cache.conditional_json(request, ("caregiver_profile", target_user_id, ""), fetch)
@@ -4,7 +4,8 @@ from pydantic import BaseModel
 from typing import Optional, List
 from config import settings
 import jwt
-import requests
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 from auth.auth_utils import get_authenticated_user_id
 router = APIRouter()
 security = HTTPBearer()
@@ -36,22 +37,16 @@ class CaregiverReference(BaseModel):
 # ======= Insert =======
 
 @router.post("/caregiver_references/insert", tags=["Caregiver References"])
-def insert_reference(
+async def insert_reference(
     payload: CaregiverReferenceInsert,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/caregiver_references"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = payload.dict()
     data["caregiver_user_id"] = user_id
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -60,23 +55,17 @@ def insert_reference(
 # ======= Update =======
 
 @router.put("/caregiver_references/update", tags=["Caregiver References"])
-def update_reference(
+async def update_reference(
     payload: CaregiverReferenceUpdate,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/caregiver_references?id=eq.{payload.id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = {k: v for k, v in payload.dict().items() if v is not None}
     if "referenced_by_user_id" not in data:
         data["referenced_by_user_id"] = user_id
 
-    response = requests.patch(url, json=data, headers=headers)
+    response = await supabase_rest.patch(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 204):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -85,14 +74,10 @@ def update_reference(
 # ======= Query (All References for Logged-In Caregiver) =======
 
 @router.get("/caregiver_references/query", tags=["Caregiver References"], response_model=List[CaregiverReference])
-def query_references(user_id: str = Depends(get_authenticated_user_id)):
+async def query_references(user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/caregiver_references?caregiver_user_id=eq.{user_id}&select=*"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
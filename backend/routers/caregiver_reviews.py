@@ -6,7 +6,8 @@ from pydantic import BaseModel
 from typing import Optional, List
 from config import settings
 import jwt
-import requests
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 from auth.auth_utils import get_authenticated_user_id
 router = APIRouter()
 security = HTTPBearer()
@@ -38,7 +39,7 @@ class CaregiverReview(BaseModel):
 # ======= Insert =======
 
 @router.post("/caregiver_reviews/insert", tags=["Caregiver Reviews"])
-def insert_review(
+async def insert_review(
     payload: CaregiverReviewInsert,
     reviewer_user_id: str = Depends(get_authenticated_user_id)
 ):
@@ -46,17 +47,11 @@ def insert_review(
         raise HTTPException(status_code=400, detail="Reviewer cannot be the caregiver")
 
     url = f"{SUPABASE_URL}/rest/v1/caregiver_reviews"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = payload.dict()
     data["reviewer_user_id"] = reviewer_user_id
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -65,21 +60,15 @@ def insert_review(
 # ======= Update =======
 
 @router.put("/caregiver_reviews/update", tags=["Caregiver Reviews"])
-def update_review(
+async def update_review(
     payload: CaregiverReviewUpdate,
     reviewer_user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/caregiver_reviews?id=eq.{payload.id}&reviewer_user_id=eq.{reviewer_user_id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = {k: v for k, v in payload.dict().items() if v is not None}
 
-    response = requests.patch(url, json=data, headers=headers)
+    response = await supabase_rest.patch(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 204):
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -88,14 +77,10 @@ def update_review(
 # ======= Query (Get My Submitted Reviews) =======
 
 @router.get("/caregiver_reviews/query", tags=["Caregiver Reviews"], response_model=List[CaregiverReview])
-def query_my_reviews(reviewer_user_id: str = Depends(get_authenticated_user_id)):
+async def query_my_reviews(reviewer_user_id: str = Depends(get_authenticated_user_id)):
     url = f"{SUPABASE_URL}/rest/v1/caregiver_reviews?reviewer_user_id=eq.{reviewer_user_id}&select=*"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
@@ -1,57 +1,59 @@
 # routers/count_care_applications_by_status.py
 
 from fastapi import APIRouter, Query, Depends, HTTPException
-import httpx
-import os
-from dotenv import load_dotenv
+from typing import Dict, List, Optional
+from uuid import UUID
+import asyncpg
 from auth.auth_utils import get_authenticated_user_id
-
-load_dotenv()
+from db_pool import get_db_connection
+from application_counters import status_counts
 
 care_app_status_router = APIRouter()
 
-SUPABASE_URL = os.getenv("SUPABASE_DB_URL")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+# Upper bound on care_request_ids per call
+MAX_CARE_REQUEST_IDS = 200
+
+
+def by_status(rows: List[dict]) -> List[dict]:
+    """Fold per-request rows into [{"status", "count"}] totals."""
+    totals: Dict[str, int] = {}
+    for row in rows:
+        totals[row["status"]] = totals.get(row["status"], 0) + row["count"]
+    return [{"status": k, "count": v} for k, v in totals.items()]
+
+
+def parse_request_ids(value: str) -> List[str]:
+    ids = list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+    if not ids:
+        raise HTTPException(status_code=400, detail="care_request_ids is empty")
+    if len(ids) > MAX_CARE_REQUEST_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CARE_REQUEST_IDS} care_request_ids per call")
+    try:
+        return [str(UUID(i)) for i in ids]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="care_request_ids must be UUIDs")
 
-headers = {
-    "apikey": SUPABASE_SERVICE_ROLE_KEY,
-    "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-    "Content-Type": "application/json"
-}
 
 @care_app_status_router.get("/care-applications/status-count", tags=["Care Applications"])
 async def count_care_applications_by_status(
     care_request_id: str = Query(default=None),
-    user_id: str = Depends(get_authenticated_user_id)
+    care_request_ids: Optional[str] = Query(None, description="Comma-separated ids: counts per care request"),
+    user_id: str = Depends(get_authenticated_user_id),
+    conn: asyncpg.Connection = Depends(get_db_connection)
 ):
     """
     Count the number of care applications by status.
-    Requires authentication and uses the current user's ID for careseeker filtering.
+    Requires authentication and counts applications to the current user's care requests.
+    Counts come from the trigger-maintained counters (application_counters.py).
+    With care_request_ids, returns {care_request_id: [{status, count}]} for every
+    listed request (empty when it has no applications), from a single query.
     """
-    filters = [f"careseeker_user_id=eq.{user_id}"]
-
-    if care_request_id:
-        filters.append(f"care_request_id=eq.{care_request_id}")
-
-    filter_query = "&".join(filters)
-    url = f"{SUPABASE_URL}/rest/v1/care_applications?select=status"
-    if filter_query:
-        url += f"&{filter_query}"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
-
-    records = response.json()
-
-    # Count statuses
-    status_counts = {}
-    for record in records:
-        status = record.get("status")
-        if status:
-            status_counts[status] = status_counts.get(status, 0) + 1
-
-    # Convert to list
-    return [{"status": k, "count": v} for k, v in status_counts.items()]
+    if care_request_ids:
+        ids = parse_request_ids(care_request_ids)
+        grouped: Dict[str, List[dict]] = {request_id: [] for request_id in ids}
+        for row in await status_counts(conn, ids, careseeker_user_id=user_id):
+            grouped[row["care_request_id"]].append({"status": row["status"], "count": row["count"]})
+        return grouped
+
+    ids = parse_request_ids(care_request_id) if care_request_id else None
+    return by_status(await status_counts(conn, ids, careseeker_user_id=user_id))
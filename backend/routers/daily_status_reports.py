@@ -7,6 +7,7 @@ from datetime import datetime
 import os
 import asyncpg
 from auth.auth_utils import get_authenticated_user_id
+from db_pool import get_db_connection
 
 router = APIRouter()
 security = HTTPBearer()
@@ -28,50 +29,39 @@ class DailyStatusReportOut(DailyStatusReportIn):
     created_at: datetime
     updated_at: datetime
 
-# ------------------- DB Connection -------------------
-
-async def get_connection():
-    db_dsn = os.getenv("SUPABASE_DB")
-    if not db_dsn:
-        raise RuntimeError("SUPABASE_DB environment variable is not set")
-    return await asyncpg.connect(dsn=db_dsn)
-
 #-------------------Insert Daily Status Report ----------------------#
 @router.post("/daily-status-reports/insert", tags=["Daily Status Reports"])
 async def insert_daily_status_report(
     report: DailyStatusReportIn,
-    caregiver_user_id: UUID = Depends(get_authenticated_user_id)
+    caregiver_user_id: UUID = Depends(get_authenticated_user_id),
+    conn: asyncpg.Connection = Depends(get_db_connection)
 ):
-    conn = await get_connection()
-    try:
-        await conn.execute("""
-            INSERT INTO daily_status_reports (
-                id,
-                care_service_id,
-                caregiver_user_id,
-                report_timestamp,
-                health_report,
-                mental_health_report,
-                diet_routine,
-                medicines_taken,
-                other_notes
-            )
-            VALUES (
-                gen_random_uuid(), $1, $2, $3, $4, $5, $6, $7, $8
-            )
-        """,
-        report.care_service_id,
-        caregiver_user_id,
-        report.report_timestamp,
-        report.health_report,
-        report.mental_health_report,
-        report.diet_routine,
-        report.medicines_taken,
-        report.other_notes
+    await conn.execute("""
+        INSERT INTO daily_status_reports (
+            id,
+            care_service_id,
+            caregiver_user_id,
+            report_timestamp,
+            health_report,
+            mental_health_report,
+            diet_routine,
+            medicines_taken,
+            other_notes
+        )
+        VALUES (
+            gen_random_uuid(), $1, $2, $3, $4, $5, $6, $7, $8
         )
-        return {"message": "Daily status report inserted"}
-    finally:
-        await conn.close()
+    """,
+    report.care_service_id,
+    caregiver_user_id,
+    report.report_timestamp,
+    report.health_report,
+    report.mental_health_report,
+    report.diet_routine,
+    report.medicines_taken,
+    report.other_notes
+    )
+    return {"message": "Daily status report inserted"}
 
 
 # ------------------- Query Endpoint -------------------
@@ -90,6 +80,7 @@ async def query_daily_status_reports(
     other_notes: Optional[str] = Query(None),
     created_at: Optional[datetime] = Query(None),
     updated_at: Optional[datetime] = Query(None),
+    conn: asyncpg.Connection = Depends(get_db_connection),
 ):
     # Dynamic WHERE clause
     filters = ["caregiver_user_id = $1"]
@@ -144,9 +135,5 @@ async def query_daily_status_reports(
     where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
     query = f"SELECT * FROM daily_status_reports {where_clause} ORDER BY report_timestamp DESC"
 
-    conn = await get_connection()
-    try:
-        rows = await conn.fetch(query, *values)
-        return [dict(row) for row in rows]
-    finally:
-        await conn.close()
+    rows = await conn.fetch(query, *values)
+    return [dict(row) for row in rows]
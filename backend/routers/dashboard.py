@@ -0,0 +1,132 @@
+# backend/routers/dashboard.py
+"""
+Composite dashboard payloads, so a page load is one round trip instead of
+one per widget.
+
+GET /careseeker gathers, concurrently over the shared REST client and the
+asyncpg pool:
+
+  * care_requests       - the caller's newest requests (card projection)
+  * interviews          - interview requests the caller made
+  * agreements          - agreements the caller is party to
+  * application_counts  - per listed request and status, from the counter tables
+  * care_services       - services booked against the listed requests
+
+The last two are chained after care_requests, which supplies their ids,
+and are joined onto their requests server-side. Every
+section is timed into `timings_ms`; a section that fails is reported under
+`errors` and left empty, rather than failing the whole dashboard.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Dict, List
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from config import settings
+import db_pool
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
+from auth.auth_utils import get_authenticated_user_id
+from query_filters import quote_item
+from routers.care_requests import parse_fields
+from application_counters import status_counts
+
+logger = logging.getLogger("careconnect.dashboard")
+
+router = APIRouter()
+
+SUPABASE_URL = settings.SUPABASE_DB_URL
+
+DEFAULT_REQUEST_LIMIT = 20
+MAX_REQUEST_LIMIT = 100
+
+
+async def _rest_rows(path: str) -> List[dict]:
+    response = await supabase_rest.get(f"{SUPABASE_URL}/rest/v1/{path}", headers=SERVICE_HEADERS)
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json()
+
+
+async def _timed(name: str, section: Awaitable, timings: Dict[str, float], errors: Dict[str, str]):
+    """Await one section, recording its wall time; failures become an `errors` entry and None."""
+    start = time.perf_counter()
+    try:
+        return await section
+    except Exception as exc:
+        logger.warning("dashboard section %s failed: %s", name, exc)
+        errors[name] = exc.detail if isinstance(exc, HTTPException) else str(exc) or type(exc).__name__
+        return None
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+@router.get("/careseeker", tags=["Dashboard"])
+async def careseeker_dashboard(
+    limit: int = Query(DEFAULT_REQUEST_LIMIT, ge=1, le=MAX_REQUEST_LIMIT, description="Newest care requests to include"),
+    user_id: str = Depends(get_authenticated_user_id)
+):
+    """Everything the careseeker dashboard renders, fetched concurrently in one call"""
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+    started = time.perf_counter()
+
+    async def requests_and_details():
+        select = parse_fields("card", required=("id",))
+        care_requests = await _timed("care_requests", _rest_rows(
+            f"care_requests?user_id=eq.{user_id}&select={select}&order=created_at.desc,id.desc&limit={limit}"
+        ), timings, errors)
+        if not care_requests:
+            return care_requests, [], []
+        # Counts and services only for the listed requests, both at once
+        request_ids = [r["id"] for r in care_requests]
+        in_list = quote(",".join(quote_item(i) for i in request_ids), safe=",")
+
+        async def application_counts():
+            # Hold a pooled connection only for the counts query, not the whole request
+            pool = await db_pool.get_pool()
+            async with pool.acquire() as conn:
+                return await status_counts(conn, care_request_ids=request_ids)
+
+        counts, services = await asyncio.gather(
+            _timed("application_counts", application_counts(), timings, errors),
+            _timed("care_services", _rest_rows(
+                f"care_services?care_request_id=in.({in_list})&select=*&order=start_date.desc"
+            ), timings, errors),
+        )
+        return care_requests, counts, services
+
+    (care_requests, counts, services), interviews, agreements = await asyncio.gather(
+        requests_and_details(),
+        _timed("interviews", _rest_rows(
+            f"interview_requests?requester_id=eq.{user_id}&order=created_at.desc"
+        ), timings, errors),
+        _timed("agreements", _rest_rows(
+            f"agreements?care_seeker_user_id=eq.{user_id}&select=*&order=created_on.desc"
+        ), timings, errors),
+    )
+
+    # Join counts and services onto the requests they belong to
+    counts_by_request: Dict[str, Dict[str, int]] = {}
+    for row in counts or []:
+        counts_by_request.setdefault(row["care_request_id"], {})[row["status"]] = row["count"]
+    services_by_request: Dict[str, List[dict]] = {}
+    for service in services or []:
+        services_by_request.setdefault(service["care_request_id"], []).append(service)
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    return {
+        "care_requests": [
+            {**r, "application_counts": counts_by_request.get(r["id"], {}),
+             "care_services": services_by_request.get(r["id"], [])}
+            for r in care_requests or []
+        ],
+        "interviews": interviews or [],
+        "agreements": agreements or [],
+        "timings_ms": timings,
+        "errors": errors,
+    }
@@ -9,21 +9,12 @@ import uuid
 import hashlib
 import json
 from auth.auth_utils import get_authenticated_user_id
-import supabase
+from supabase_client import get_supabase
 import base64
 
 router = APIRouter()
 security = HTTPBearer()
 
-# Load environment variables
-SUPABASE_URL = os.getenv("SUPABASE_DB_URL", "").rstrip("/")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-
-if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
-    raise RuntimeError("Supabase environment variables are not set properly.")
-
-supabase_client = supabase.create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-
 class DigitalSignatureCreate(BaseModel):
     agreement_id: str
     signer_user_id: str
@@ -83,7 +74,7 @@ def create_signature_request(
 
     try:
         # Check if user has already signed this agreement
-        existing_signature_response = supabase_client.table("digital_signatures").select("*").eq("agreement_id", signature_data.agreement_id).eq("signer_user_id", signature_data.signer_user_id).execute()
+        existing_signature_response = get_supabase().table("digital_signatures").select("*").eq("agreement_id", signature_data.agreement_id).eq("signer_user_id", signature_data.signer_user_id).execute()
         
         if existing_signature_response.data:
             return {
@@ -117,7 +108,7 @@ def create_signature_request(
         
         # Store in database
         try:
-            response = supabase_client.table("digital_signature_requests").insert(signature_request).execute()
+            response = get_supabase().table("digital_signature_requests").insert(signature_request).execute()
             
             if not response.data:
                 raise HTTPException(status_code=500, detail="Failed to create signature request")
@@ -153,7 +144,7 @@ def sign_agreement(
 
     try:
         # Check if user has already signed this agreement
-        existing_signature_response = supabase_client.table("digital_signatures").select("*").eq("agreement_id", agreement_id).eq("signer_user_id", user_id).execute()
+        existing_signature_response = get_supabase().table("digital_signatures").select("*").eq("agreement_id", agreement_id).eq("signer_user_id", user_id).execute()
         
         if existing_signature_response.data:
             return {
@@ -164,7 +155,7 @@ def sign_agreement(
             }
         
         # Verify the signature request
-        response = supabase_client.table("digital_signature_requests").select("*").eq("agreement_id", agreement_id).eq("verification_code", verification_code).eq("status", "pending").execute()
+        response = get_supabase().table("digital_signature_requests").select("*").eq("agreement_id", agreement_id).eq("verification_code", verification_code).eq("status", "pending").execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Invalid or expired signature request")
@@ -203,16 +194,16 @@ def sign_agreement(
         }
         
         # Store signature
-        sig_response = supabase_client.table("digital_signatures").insert(signature_record).execute()
+        sig_response = get_supabase().table("digital_signatures").insert(signature_record).execute()
         
         if not sig_response.data:
             raise HTTPException(status_code=500, detail="Failed to store signature")
         
         # Update signature request status
-        supabase_client.table("digital_signature_requests").update({"status": "completed"}).eq("id", signature_request["id"]).execute()
+        get_supabase().table("digital_signature_requests").update({"status": "completed"}).eq("id", signature_request["id"]).execute()
         
         # Update agreement status
-        supabase_client.table("agreements").update({"signed_on": timestamp}).eq("id", agreement_id).execute()
+        get_supabase().table("agreements").update({"signed_on": timestamp}).eq("id", agreement_id).execute()
         
         return {
             "success": True,
@@ -240,7 +231,7 @@ def verify_signature(
 
     try:
         # Get signature record
-        response = supabase_client.table("digital_signatures").select("*").eq("id", signature_id).execute()
+        response = get_supabase().table("digital_signatures").select("*").eq("id", signature_id).execute()
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Signature not found")
@@ -288,12 +279,12 @@ def get_agreement_signatures(
 
     try:
         # Get all signatures for the agreement
-        response = supabase_client.table("digital_signatures").select("*").eq("agreement_id", agreement_id).execute()
+        response = get_supabase().table("digital_signatures").select("*").eq("agreement_id", agreement_id).execute()
         
         signatures = response.data if response.data else []
         
         # Get signature requests
-        req_response = supabase_client.table("digital_signature_requests").select("*").eq("agreement_id", agreement_id).execute()
+        req_response = get_supabase().table("digital_signature_requests").select("*").eq("agreement_id", agreement_id).execute()
         signature_requests = req_response.data if req_response.data else []
         
         return {
@@ -321,7 +312,7 @@ def generate_signed_pdf(
 
     try:
         # Get agreement
-        agreement_response = supabase_client.table("agreements").select("*").eq("id", agreement_id).execute()
+        agreement_response = get_supabase().table("agreements").select("*").eq("id", agreement_id).execute()
         
         if not agreement_response.data:
             raise HTTPException(status_code=404, detail="Agreement not found")
@@ -329,7 +320,7 @@ def generate_signed_pdf(
         agreement = agreement_response.data[0]
         
         # Get signatures
-        signatures_response = supabase_client.table("digital_signatures").select("*").eq("agreement_id", agreement_id).execute()
+        signatures_response = get_supabase().table("digital_signatures").select("*").eq("agreement_id", agreement_id).execute()
         signatures = signatures_response.data if signatures_response.data else []
         
         if not signatures:
@@ -366,7 +357,7 @@ def health_check():
 def test_database():
     try:
         # Test if we can connect to the database
-        response = supabase_client.table("agreements").select("id").limit(1).execute()
+        response = get_supabase().table("agreements").select("id").limit(1).execute()
         return {
             "status": "success",
             "message": "Database connection working",
@@ -383,10 +374,10 @@ def test_database():
 def test_signature_tables():
     try:
         # Test digital_signature_requests table
-        req_response = supabase_client.table("digital_signature_requests").select("id").limit(1).execute()
+        req_response = get_supabase().table("digital_signature_requests").select("id").limit(1).execute()
         
         # Test digital_signatures table
-        sig_response = supabase_client.table("digital_signatures").select("id").limit(1).execute()
+        sig_response = get_supabase().table("digital_signatures").select("id").limit(1).execute()
         
         return {
             "status": "success",
@@ -406,7 +397,7 @@ def check_agreement_signed(agreement_id: str):
     """Check if an agreement is already signed"""
     try:
         # Check for existing signatures
-        response = supabase_client.table("digital_signatures").select("*").eq("agreement_id", agreement_id).execute()
+        response = get_supabase().table("digital_signatures").select("*").eq("agreement_id", agreement_id).execute()
         
         signatures = response.data if response.data else []
         
@@ -449,7 +440,7 @@ def check_user_signed(agreement_id: str, user_id: str):
     """Check if a specific user has signed the agreement"""
     try:
         # Check for existing signature by this user
-        response = supabase_client.table("digital_signatures").select("*").eq("agreement_id", agreement_id).eq("signer_user_id", user_id).execute()
+        response = get_supabase().table("digital_signatures").select("*").eq("agreement_id", agreement_id).eq("signer_user_id", user_id).execute()
         
         signatures = response.data if response.data else []
         
@@ -8,10 +8,10 @@ import asyncpg
 import os
 import jwt
 from auth.auth_utils import get_authenticated_user_id
+from db_pool import get_db_connection
 router = APIRouter()
 security = HTTPBearer()
 
-DATABASE_URL = os.getenv("SUPABASE_DB_URL")
 JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
 
@@ -29,19 +29,15 @@ class QueryPayload(BaseModel):
     aggregate_column: Optional[str] = None
     raw_sql: Optional[str] = None  # Optional complete SQL
 
-async def get_connection():
-    return await asyncpg.connect(DATABASE_URL)
-
-
 @router.post("/query", tags=["Dynamic Query"])
 async def execute_query(
     query_payload: QueryPayload,
-    user_id: str = Depends(get_authenticated_user_id)
+    user_id: str = Depends(get_authenticated_user_id),
+    conn: asyncpg.Connection = Depends(get_db_connection)
 ):
     if not query_payload.raw_sql and not query_payload.table:
         raise HTTPException(status_code=400, detail="Either raw_sql or table must be provided.")
 
-    conn = await get_connection()
     try:
         if query_payload.raw_sql:
             sql = query_payload.raw_sql
@@ -83,5 +79,3 @@ async def execute_query(
 
     except asyncpg.PostgresError as e:
         raise HTTPException(status_code=500, detail=f"PostgreSQL error: {str(e)}")
-    finally:
-        await conn.close()
@@ -0,0 +1,184 @@
+# backend/routers/export.py
+"""
+Streaming exports of marketplace tables as NDJSON or CSV.
+
+Rows are read from PostgREST in (created_at desc, id desc) keyset pages of
+EXPORT_PAGE_SIZE and written out page by page, so a worker holds at most
+two pages (the one being sent and the one being prefetched) however large
+the export. Filters are the same as on the list endpoints
+(query_filters.CARE_REQUEST_FILTERS / CARE_APPLICATION_FILTERS).
+
+Only users holding one of EXPORT_ROLES in user_roles may export. The first
+page is fetched before the response starts, so bad filters still get a
+proper error status; a failure later on aborts the stream, leaving the
+client with a truncated body.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from config import settings
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
+from auth.auth_utils import get_authenticated_user_id
+from query_filters import CARE_APPLICATION_FILTERS, CARE_REQUEST_FILTERS
+from routers.care_requests import parse_fields
+
+logger = logging.getLogger("careconnect.export")
+
+router = APIRouter()
+
+SUPABASE_URL = settings.SUPABASE_DB_URL
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+FORMAT_QUERY = Query("ndjson", regex="^(ndjson|csv)$", description="ndjson (one JSON object per line) or csv")
+
+
+async def require_exporter(user_id: str = Depends(get_authenticated_user_id)) -> str:
+    allowed = {role.strip() for role in settings.EXPORT_ROLES.split(",") if role.strip()}
+    if not allowed:
+        return user_id
+    response = await supabase_rest.get(
+        f"{SUPABASE_URL}/rest/v1/user_roles?select=role&user_id=eq.{user_id}", headers=SERVICE_HEADERS
+    )
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    if not allowed & {row["role"] for row in response.json()}:
+        raise HTTPException(status_code=403, detail="Exports are limited to administrators")
+    return user_id
+
+
+def _after(row: dict) -> str:
+    """Rows strictly after `row` in (created_at desc, id desc) order."""
+    ts = quote(f'"{row["created_at"]}"', safe="")
+    rid = quote(f'"{row["id"]}"', safe="")
+    return f"or=(created_at.lt.{ts},and(created_at.eq.{ts},id.lt.{rid}))"
+
+
+async def _fetch(table: str, clauses: List[str], last: Optional[dict]) -> List[dict]:
+    query = list(clauses) + ([_after(last)] if last else [])
+    query += ["order=created_at.desc,id.desc", f"limit={settings.EXPORT_PAGE_SIZE}"]
+    response = await supabase_rest.get(f"{SUPABASE_URL}/rest/v1/{table}?{'&'.join(query)}", headers=SERVICE_HEADERS)
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json()
+
+
+async def _pages(table: str, clauses: List[str], first: List[dict]) -> AsyncIterator[List[dict]]:
+    """Yield `first` and every following page, fetching each next page while the previous one is sent."""
+    page = first
+    while page:
+        more = len(page) == settings.EXPORT_PAGE_SIZE
+        upcoming = asyncio.ensure_future(_fetch(table, clauses, page[-1])) if more else None
+        try:
+            yield page
+        except BaseException:
+            if upcoming:
+                upcoming.cancel()
+            raise
+        page = await upcoming if upcoming else []
+
+
+def _csv_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+async def _encode(fmt: str, pages: AsyncIterator[List[dict]], columns: Optional[List[str]]) -> AsyncIterator[str]:
+    if fmt == "ndjson":
+        async for page in pages:
+            yield "".join(json.dumps(row, separators=(",", ":"), default=str) + "\n" for row in page)
+        return
+
+    buffer = io.StringIO()
+    writer = None
+    async for page in pages:
+        if writer is None:
+            # Without an explicit projection the header follows the first row's columns
+            writer = csv.DictWriter(buffer, fieldnames=columns or list(page[0]), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerows({key: _csv_cell(value) for key, value in row.items()} for row in page)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is None and columns:
+        yield ",".join(columns) + "\r\n"
+
+
+async def _stream(table: str, fmt: str, clauses: List[str], columns: Optional[List[str]]) -> StreamingResponse:
+    first = await _fetch(table, clauses, None)
+
+    async def body():
+        try:
+            async for chunk in _encode(fmt, _pages(table, clauses, first), columns):
+                yield chunk
+        except Exception:
+            logger.exception("%s export aborted", table)
+            raise
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[fmt], headers={
+        "Content-Disposition": f'attachment; filename="{table}-{stamp}.{fmt}"',
+        "Cache-Control": "no-store",
+    })
+
+
+@router.get("/care_requests", tags=["Export"])
+async def export_care_requests(
+    format: str = FORMAT_QUERY,
+    location: Optional[str] = Query(None),
+    recipient_age_range: Optional[str] = Query(None),
+    care_services_needed: Optional[str] = Query(None),  # match any one (comma-separated)
+    primary_location_type: Optional[str] = Query(None),
+    care_duration: Optional[str] = Query(None),
+    care_start_date_preference: Optional[str] = Query(None),
+    specific_start_date: Optional[str] = Query(None),
+    caregiver_requirements: Optional[str] = Query(None),
+    transportation_provided: Optional[bool] = Query(None),
+    accommodation_provided: Optional[bool] = Query(None),
+    food_provided: Optional[bool] = Query(None),
+    daily_working_hours: Optional[str] = Query(None),
+    excluded_schedule_days: Optional[str] = Query(None),
+    estimated_budget: Optional[str] = Query(None),
+    special_needs: Optional[str] = Query(None),
+    additional_expectations: Optional[str] = Query(None),
+    status: Optional[str] = Query(None, description="Comma-separated statuses to include"),
+    created_after: Optional[str] = Query(None, description="ISO timestamp, inclusive"),
+    created_before: Optional[str] = Query(None, description="ISO timestamp, exclusive"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or a preset: card"),
+    user_id: str = Depends(require_exporter)
+):
+    """Every care request matching the filters, newest first, streamed as NDJSON or CSV"""
+    filters = CARE_REQUEST_FILTERS.parse(dict(locals()))
+    # Paging continues from the last row's created_at and id, so keep them in the projection
+    select = parse_fields(fields, required=("id", "created_at"))
+    columns = None if select == "*" else select.split(",")
+    return await _stream("care_requests", format, [f"select={select}"] + filters.to_postgrest(), columns)
+
+
+@router.get("/care_applications", tags=["Export"])
+async def export_care_applications(
+    format: str = FORMAT_QUERY,
+    care_request_id: Optional[str] = Query(None, description="Comma-separated care request ids"),
+    caregiver_user_id: Optional[str] = Query(None, description="Comma-separated caregiver user ids"),
+    careseeker_user_id: Optional[str] = Query(None, description="Comma-separated care seeker user ids"),
+    status: Optional[str] = Query(None, description="Comma-separated statuses to include"),
+    created_after: Optional[str] = Query(None, description="ISO timestamp, inclusive"),
+    created_before: Optional[str] = Query(None, description="ISO timestamp, exclusive"),
+    user_id: str = Depends(require_exporter)
+):
+    """Every care application matching the filters, newest first, streamed as NDJSON or CSV"""
+    filters = CARE_APPLICATION_FILTERS.parse(dict(locals()))
+    return await _stream("care_applications", format, ["select=*"] + filters.to_postgrest(), None)
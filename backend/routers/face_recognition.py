@@ -1,16 +1,12 @@
 # routers/face_recognition.py
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from fastapi.responses import JSONResponse
-from supabase import create_client, Client
-import numpy as np
 import shutil
 import os
 import uuid
 import hashlib
 from typing import Optional
-from PIL import Image
 import io
-import cv2
 
 # Import your auth middleware
 import sys
@@ -18,33 +14,47 @@ import os
 # Add the parent directory to the path so we can import auth
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from auth.auth_utils import get_authenticated_user_id
+from supabase_client import get_supabase
+import tracing
 
 # Supabase config
-SUPABASE_URL = os.getenv("SUPABASE_DB_URL", "<your-supabase-url>")
-SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "<your-service-role-key>")
 SUPABASE_BUCKET = "onboarding"  # Make sure this bucket exists in Supabase
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
 router = APIRouter()
 
-# Load OpenCV face detection cascade
-try:
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    if face_cascade is not None:
-        print("✓ OpenCV face detection cascade loaded successfully")
-    else:
-        print("⚠ OpenCV face detection cascade not loaded")
-        face_cascade = None
-except Exception as e:
-    print(f"⚠ OpenCV face detection not available: {e}")
-    face_cascade = None
+# OpenCV, NumPy and PIL are imported on first use so that importing this
+# router (and booting a worker) does not pay for them.
+face_cascade = None
+_face_cascade_loaded = False
+
+def get_face_cascade():
+    """
+    Load the OpenCV face detection cascade on first use
+    """
+    global face_cascade, _face_cascade_loaded
+    if not _face_cascade_loaded:
+        _face_cascade_loaded = True
+        try:
+            import cv2
+            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+            if face_cascade is not None:
+                print("✓ OpenCV face detection cascade loaded successfully")
+            else:
+                print("⚠ OpenCV face detection cascade not loaded")
+                face_cascade = None
+        except Exception as e:
+            print(f"⚠ OpenCV face detection not available: {e}")
+            face_cascade = None
+    return face_cascade
 
 def detect_faces_opencv(image_path):
     """
     Detect faces using OpenCV Haar Cascade
     """
     try:
+        import cv2
+        face_cascade = get_face_cascade()
+
         # Load image with OpenCV
         image = cv2.imread(image_path)
         if image is None:
@@ -72,6 +82,7 @@ def create_hash_encoding(image):
     """
     Create hash-based encoding for image comparison
     """
+    import numpy as np
     try:
         # Create hash from image bytes
         image_hash = hashlib.md5(image.tobytes()).hexdigest()
@@ -96,6 +107,7 @@ def calculate_similarity(encoding1, encoding2):
     """
     Calculate similarity between two encodings
     """
+    import numpy as np
     try:
         # Calculate Euclidean distance
         distance = np.linalg.norm(encoding1 - encoding2)
@@ -146,6 +158,7 @@ async def upload_face(
 
             # Convert image to RGB format using PIL
             try:
+                from PIL import Image
                 print(f"Converting image: size={len(file_content)} bytes")
                 pil_image = Image.open(io.BytesIO(file_content))
                 print(f"Original image mode: {pil_image.mode}, size: {pil_image.size}")
@@ -222,8 +235,9 @@ async def upload_face(
             storage_path = f"{userId}/{angle}/{filename}"
             
             # Upload the converted image file
-            with open(local_path, "rb") as f:
-                upload_result = supabase.storage.from_(SUPABASE_BUCKET).upload(
+            with open(local_path, "rb") as f, tracing.span("storage", SUPABASE_BUCKET, "upload") as span:
+                span["sent"] = os.path.getsize(local_path)
+                upload_result = get_supabase().storage.from_(SUPABASE_BUCKET).upload(
                     storage_path, 
                     f, 
                     {"content-type": "image/jpeg"}
@@ -233,7 +247,7 @@ async def upload_face(
                 raise HTTPException(status_code=500, detail=f"Supabase upload failed: {upload_result.error}")
 
             try:
-                public_url = supabase.storage.from_(SUPABASE_BUCKET).get_public_url(storage_path)
+                public_url = get_supabase().storage.from_(SUPABASE_BUCKET).get_public_url(storage_path)
             except Exception:
                 public_url = None
 
@@ -264,8 +278,10 @@ async def validate_face(
     file: UploadFile = File(...),
     current_user_id: str = Depends(get_authenticated_user_id)
 ):
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Supabase client not initialized.")
+    try:
+        supabase = get_supabase()
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=f"Supabase client not initialized: {str(e)}")
 
     debug_dir = "debug_faces"
     os.makedirs(debug_dir, exist_ok=True)
@@ -283,6 +299,7 @@ async def validate_face(
 
         # Process the new image
         file_content = await file.read()
+        from PIL import Image
         pil_image = Image.open(io.BytesIO(file_content))
         if pil_image.mode != 'RGB':
             pil_image = pil_image.convert('RGB')
@@ -320,7 +337,8 @@ async def validate_face(
         for subdir in [None, "front", "left", "right"]:
             path = userId if subdir is None else f"{userId}/{subdir}"
             try:
-                files = supabase.storage.from_(SUPABASE_BUCKET).list(path)
+                with tracing.span("storage", SUPABASE_BUCKET, "list"):
+                    files = supabase.storage.from_(SUPABASE_BUCKET).list(path)
                 print(f"Found {len(files)} files in {path}")
                 for file_info in files:
                     print(f"  - File: {file_info.get('name', 'unknown')}")
@@ -332,7 +350,8 @@ async def validate_face(
         if not all_user_files:
             print("No files found in specific paths, trying fallback...")
             try:
-                all_bucket_files = supabase.storage.from_(SUPABASE_BUCKET).list("")
+                with tracing.span("storage", SUPABASE_BUCKET, "list"):
+                    all_bucket_files = supabase.storage.from_(SUPABASE_BUCKET).list("")
                 print(f"Total files in bucket: {len(all_bucket_files)}")
                 for file_info in all_bucket_files:
                     full_path = file_info.get('name', '')
@@ -362,7 +381,9 @@ async def validate_face(
             temp_path = None
             try:
                 # Download stored file
-                content = supabase.storage.from_(SUPABASE_BUCKET).download(file_path)
+                with tracing.span("storage", SUPABASE_BUCKET, "download") as span:
+                    content = supabase.storage.from_(SUPABASE_BUCKET).download(file_path)
+                    span["received"] = len(content)
                 temp_path = os.path.join(debug_dir, f"temp_{uuid.uuid4().hex}_{file_name}")
                 with open(temp_path, 'wb') as f:
                     f.write(content)
@@ -508,8 +529,10 @@ async def test_face_recognition():
     try:
         print("=== TESTING FACE RECOGNITION ===")
         
+        import numpy as np
+
         # Test OpenCV face detection
-        if face_cascade is None:
+        if get_face_cascade() is None:
             return {
                 "message": "OpenCV face detection not available",
                 "face_detection_available": False,
@@ -549,15 +572,15 @@ async def debug_storage(user_id: str, current_user_id: str = Depends(get_authent
         
         # List all files in the bucket
         try:
-            all_files = supabase.storage.from_(SUPABASE_BUCKET).list()
+            all_files = get_supabase().storage.from_(SUPABASE_BUCKET).list()
             print(f"All files in bucket: {all_files}")
             
             # List files for specific user
-            user_files = supabase.storage.from_(SUPABASE_BUCKET).list(user_id)
+            user_files = get_supabase().storage.from_(SUPABASE_BUCKET).list(user_id)
             print(f"Files for user {user_id}: {user_files}")
             
             # List files in root directory
-            root_files = supabase.storage.from_(SUPABASE_BUCKET).list("")
+            root_files = get_supabase().storage.from_(SUPABASE_BUCKET).list("")
             print(f"Files in root: {root_files}")
             
             return JSONResponse(content={
@@ -4,17 +4,17 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.responses import StreamingResponse
 from starlette.status import HTTP_403_FORBIDDEN
-import httpx
 import os
 from datetime import datetime
 import uuid
 from io import BytesIO
 from auth.auth_utils import get_authenticated_user_id
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
 router = APIRouter()
 security = HTTPBearer()
 
-SUPABASE_URL = os.getenv("SUPABASE_DB_URL")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+SUPABASE_URL = supabase_rest.SUPABASE_URL
 BUCKET = "background-check-documents"
 ALLOWED_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".doc", ".docx"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
@@ -41,13 +41,9 @@ async def upload_document(
     filepath = f"{user_id}/{filename}"
 
     upload_url = f"{SUPABASE_URL}/storage/v1/object/{BUCKET}/{filepath}"
-    headers = {
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/octet-stream"
-    }
+    headers = {**SERVICE_HEADERS, "Content-Type": "application/octet-stream"}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.put(upload_url, content=content, headers=headers)
+    response = await supabase_rest.put(upload_url, content=content, headers=headers)
 
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=f"Upload failed: {response.text}")
@@ -70,10 +66,7 @@ async def download_document(
         raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Access denied")
 
     download_url = f"{SUPABASE_URL}/storage/v1/object/{BUCKET}/{file_path}"
-    headers = {"Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"}
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(download_url, headers=headers)
+    response = await supabase_rest.get(download_url, headers=SERVICE_HEADERS)
 
     if response.status_code != 200:
         raise HTTPException(status_code=404, detail="File not found")
@@ -90,10 +83,7 @@ async def delete_document(
         raise HTTPException(status_code=403, detail="Access denied")
 
     delete_url = f"{SUPABASE_URL}/storage/v1/object/{BUCKET}/{file_path}"
-    headers = {"Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"}
-
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(delete_url, headers=headers)
+    response = await supabase_rest.delete(delete_url, headers=SERVICE_HEADERS)
 
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail="Delete failed")
@@ -3,7 +3,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from config import settings
 import jwt
-import requests
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS, REPRESENTATION_HEADERS
 from typing import Optional, List
 from auth.auth_utils import get_authenticated_user_id
 
@@ -33,22 +34,16 @@ class InterviewCreate(BaseModel):
 
 
 @router.put("/update")
-def update_interview_request(
+async def update_interview_request(
     payload: InterviewUpdate,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/interview_requests?id=eq.{payload.id}"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = {k: v for k, v in payload.dict().items() if v is not None}
     data["requester_id"] = user_id
 
-    response = requests.patch(url, json=data, headers=headers)
+    response = await supabase_rest.patch(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 204):
         raise HTTPException(
             status_code=response.status_code,
@@ -59,17 +54,11 @@ def update_interview_request(
 
 
 @router.post("/create")
-def insert_interview_request(
+async def insert_interview_request(
     payload: InterviewCreate,
     user_id: str = Depends(get_authenticated_user_id)
 ):
     url = f"{SUPABASE_URL}/rest/v1/interview_requests"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
 
     data = {
         "care_request_id": payload.care_request_id,
@@ -79,7 +68,7 @@ def insert_interview_request(
         "requester_id": user_id
     }
 
-    response = requests.post(url, json=data, headers=headers)
+    response = await supabase_rest.post(url, json=data, headers=REPRESENTATION_HEADERS)
     if response.status_code not in (200, 201):
         raise HTTPException(
             status_code=response.status_code,
@@ -90,7 +79,7 @@ def insert_interview_request(
 
 
 @router.get("/query")
-def get_interview_requests(
+async def get_interview_requests(
     user_id: Optional[str] = Query(None, description="User ID for auth context"),
     requester_id: Optional[str] = Query(None, description="Filter by requester_id"),
     caregiver_user_id: Optional[str] = Query(None, description="Filter by caregiver_user_id"),
@@ -117,12 +106,8 @@ def get_interview_requests(
     filter_query = "&".join(filters)
 
     url = f"{SUPABASE_URL}/rest/v1/interview_requests?{filter_query}&order=created_at.desc"
-    headers = {
-        "apikey": SUPABASE_SERVICE_ROLE_KEY,
-        "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}"
-    }
 
-    response = requests.get(url, headers=headers)
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
     if response.status_code != 200:
         raise HTTPException(
             status_code=response.status_code,
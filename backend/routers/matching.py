@@ -0,0 +1,60 @@
+# backend/routers/matching.py
+
+import sys
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query
+import supabase_rest
+from supabase_rest import SERVICE_HEADERS
+from config import settings
+from auth.auth_utils import get_authenticated_user_id
+
+router = APIRouter()
+
+
+def get_engine():
+    """Import the NumPy matching engine on first use rather than at app startup."""
+    import matching
+
+    return matching
+
+
+def index_stats() -> dict:
+    engine = sys.modules.get("matching")
+    return engine.index_stats() if engine else {"loaded": False}
+
+
+async def _fetch_one(table: str, key: str, value: str, columns) -> dict:
+    url = f"{settings.SUPABASE_DB_URL}/rest/v1/{table}?select={','.join(columns)}&{key}=eq.{quote(value, safe='')}&limit=1"
+    response = await supabase_rest.get(url, headers=SERVICE_HEADERS)
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    rows = response.json()
+    return rows[0] if rows else None
+
+
+@router.get("/requests-for-me")
+async def match_requests_for_me(
+    limit: int = Query(20, ge=1, le=100),
+    user_id: str = Depends(get_authenticated_user_id)
+):
+    """Open care requests ranked for the authenticated caregiver, with a per-feature score breakdown"""
+    engine = get_engine()
+    profile = await _fetch_one("caregiver_profiles", "user_id", user_id, engine.CAREGIVER_COLUMNS)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Caregiver profile not found")
+    return await engine.requests_for_caregiver(profile, limit)
+
+
+@router.get("/caregivers-for-request/{request_id}")
+async def match_caregivers_for_request(
+    request_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    user_id: str = Depends(get_authenticated_user_id)
+):
+    """Caregivers ranked for a care request, with a per-feature score breakdown"""
+    engine = get_engine()
+    request = await _fetch_one("care_requests", "id", request_id, engine.REQUEST_COLUMNS)
+    # Only the requester may see who ranks for their request; others get the same 404
+    if request is None or request.get("user_id") != user_id:
+        raise HTTPException(status_code=404, detail="Care request not found")
+    return await engine.caregivers_for_request(request, limit)
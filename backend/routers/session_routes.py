@@ -3,7 +3,7 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import datetime
 from auth.auth_utils import get_authenticated_user_id
-from supabase_client import supabase  # assumes you created this wrapper
+from supabase_client import create_auth_client, get_supabase
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 router = APIRouter()
@@ -31,7 +31,7 @@ def register_user(user: UserRegister):
     """Register user via Supabase Auth + create profile"""
     try:
         # 1. Create user via Supabase Auth (email/password or OAuth)
-        auth_response = supabase.auth.sign_up({
+        auth_response = create_auth_client().auth.sign_up({
             "email": user.email,
             "password": user.password
         })
@@ -41,8 +41,8 @@ def register_user(user: UserRegister):
 
         user_id = auth_response.user["id"]
 
-        # 2. Create user profile
-        supabase.table("profiles").insert({
+        # 2. Create user profile (as the service role, on the shared client)
+        get_supabase().table("profiles").insert({
             "id": user_id,
             "first_name": user.first_name,
             "last_name": user.last_name,
@@ -64,7 +64,7 @@ def register_user(user: UserRegister):
 def login_user(user: UserLogin):
     """Login via Supabase Auth email/password or external provider"""
     try:
-        response = supabase.auth.sign_in_with_password({
+        response = create_auth_client().auth.sign_in_with_password({
             "email": user.email,
             "password": user.password
         })
@@ -89,7 +89,7 @@ async def logout_user(credentials: HTTPAuthorizationCredentials = Depends(securi
         token = credentials.credentials
 
         # Supabase client supports signOut() using REST if you store refresh tokens
-        supabase.auth.sign_out()
+        create_auth_client().auth.sign_out()
 
         return {"message": "Successfully logged out"}
     except Exception as e:
@@ -8,11 +8,9 @@ from datetime import datetime
 from config import settings
 import asyncpg
 from auth.auth_utils import get_authenticated_user_id
+from db_pool import get_db_connection
 router = APIRouter()
 
-# Use DB URL from config
-DATABASE_URL = settings.SUPABASE_DB
-
 # Pydantic model for response
 class UserRoleOut(BaseModel):
     id: UUID
@@ -20,10 +18,6 @@ class UserRoleOut(BaseModel):
     role: str
     created_at: datetime
 
-# Simple function to get DB connection
-async def get_connection():
-    return await asyncpg.connect(DATABASE_URL)
-
 # Dependency to extract user_id from JWT manually (can be refined later)
 async def get_user_id_from_token():
     # This can be enhanced to extract JWT from header and decode it
@@ -32,18 +26,17 @@ async def get_user_id_from_token():
 @router.get("/api/user-roles", response_model=List[UserRoleOut], tags=["User Roles"])
 async def get_user_roles(
     user_id: str = Query(..., description="User ID to get roles for"),
-    user_id_from_token: str = Depends(get_authenticated_user_id)
+    user_id_from_token: str = Depends(get_authenticated_user_id),
+    conn: asyncpg.Connection = Depends(get_db_connection)
 ):
     """
     Get user roles for a specific user from `user_roles` table.
     """
     try:
-        conn = await get_connection()
         records = await conn.fetch(
             "SELECT id, user_id, role, created_at FROM user_roles WHERE user_id = $1",
             user_id
         )
-        await conn.close()
         return [dict(r) for r in records]
     except Exception as e:
         print(f"❌ Error fetching user roles: {e}")
@@ -1,12 +1,53 @@
 # backend/supabase_client.py
 
-from supabase import create_client, Client
 import os
+import threading
+from typing import Optional, TYPE_CHECKING
 
-SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+if TYPE_CHECKING:
+    from supabase import Client
 
-if not SUPABASE_DB_URL or not SUPABASE_SERVICE_ROLE_KEY:
-    raise ValueError("Missing SUPABASE_DB_URL or SUPABASE_SERVICE_ROLE_KEY environment variables")
+_client: Optional["Client"] = None
+_client_lock = threading.Lock()
 
-supabase: Client = create_client(SUPABASE_DB_URL, SUPABASE_SERVICE_ROLE_KEY)
+
+def get_supabase() -> "Client":
+    """
+    Return the process-wide Supabase SDK client, building it on first use.
+
+    Every data and storage caller shares this one instance, so the PostgREST
+    and Storage sessions it holds are reused instead of being rebuilt per
+    module, and importing a router never requires the environment to be
+    configured. Never sign in on it: see create_auth_client().
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from supabase import create_client
+
+                url = os.getenv("SUPABASE_DB_URL", "").rstrip("/")
+                key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+                if not url or not key:
+                    raise RuntimeError("Missing SUPABASE_DB_URL or SUPABASE_SERVICE_ROLE_KEY environment variables")
+                _client = create_client(url, key)
+    return _client
+
+
+def create_auth_client() -> "Client":
+    """
+    A new, unshared client for one sign-up / sign-in / sign-out.
+
+    supabase-py switches a client's Authorization header to the user's access
+    token on every auth event, so auth flows must not run on the shared
+    service-role client from get_supabase(). This one is discarded after the
+    call and does not keep or refresh the session.
+    """
+    from supabase import create_client
+    from supabase.lib.client_options import ClientOptions
+
+    url = os.getenv("SUPABASE_DB_URL", "").rstrip("/")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        raise RuntimeError("Missing SUPABASE_DB_URL or SUPABASE_SERVICE_ROLE_KEY environment variables")
+    return create_client(url, key, options=ClientOptions(auto_refresh_token=False, persist_session=False))
@@ -0,0 +1,162 @@
+# backend/supabase_rest.py
+
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+from config import settings
+import tracing
+
+logger = logging.getLogger("careconnect.rest")
+
+SUPABASE_URL = settings.SUPABASE_DB_URL
+SUPABASE_SERVICE_ROLE_KEY = settings.SUPABASE_SERVICE_ROLE_KEY
+
+# Service-role headers shared by every PostgREST / Storage call
+SERVICE_HEADERS = {
+    "apikey": SUPABASE_SERVICE_ROLE_KEY,
+    "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
+}
+
+# Writes that should echo the affected rows back
+REPRESENTATION_HEADERS = {
+    **SERVICE_HEADERS,
+    "Content-Type": "application/json",
+    "Prefer": "return=representation",
+}
+
+_client: Optional[httpx.AsyncClient] = None
+
+# Per-call latency bookkeeping, exposed through client_stats()
+_LATENCY_WINDOW = 1024
+_latencies_ms = deque(maxlen=_LATENCY_WINDOW)
+_stats = {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.REST_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.REST_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.REST_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(settings.REST_TIMEOUT, connect=settings.REST_CONNECT_TIMEOUT)
+    return httpx.AsyncClient(http2=settings.REST_HTTP2, limits=limits, timeout=timeout)
+
+
+async def open_client() -> httpx.AsyncClient:
+    """Create the app-lifetime client. Called from the FastAPI lifespan."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_client():
+    """Close the pooled connections. Called from the FastAPI lifespan."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifespan (scripts, tests)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def _record(method: str, url: str, elapsed_ms: float, failed: bool):
+    _stats["calls"] += 1
+    _stats["total_ms"] += elapsed_ms
+    _stats["max_ms"] = max(_stats["max_ms"], elapsed_ms)
+    if failed:
+        _stats["errors"] += 1
+    _latencies_ms.append(elapsed_ms)
+    logger.debug("%s %s took %.1f ms", method, url.split("?", 1)[0], elapsed_ms)
+
+
+def _payload_sizes(response: Optional[httpx.Response]):
+    if response is None:
+        return 0, 0
+    try:
+        sent = len(response.request.content)
+    except (httpx.RequestNotRead, RuntimeError):
+        sent = 0
+    return sent, len(response.content)
+
+
+async def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request through the shared pool and record its latency."""
+    start = time.perf_counter()
+    failed = True
+    response = None
+    try:
+        response = await get_client().request(method, url, **kwargs)
+        failed = response.status_code >= 400
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        _record(method, url, elapsed * 1000, failed)
+        kind, target, op = tracing.classify_url(method, url)
+        sent, received = _payload_sizes(response)
+        tracing.record(kind, target, op, elapsed, sent=sent, received=received, error=failed)
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    return await request("POST", url, **kwargs)
+
+
+async def patch(url: str, **kwargs) -> httpx.Response:
+    return await request("PATCH", url, **kwargs)
+
+
+async def put(url: str, **kwargs) -> httpx.Response:
+    return await request("PUT", url, **kwargs)
+
+
+async def delete(url: str, **kwargs) -> httpx.Response:
+    return await request("DELETE", url, **kwargs)
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def client_stats() -> dict:
+    """Pool configuration and recent call latency, for the health endpoint."""
+    calls = _stats["calls"]
+    recent = list(_latencies_ms)
+    return {
+        "open": _client is not None and not _client.is_closed,
+        "http2": settings.REST_HTTP2,
+        "pool": {
+            "max_connections": settings.REST_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.REST_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry_s": settings.REST_KEEPALIVE_EXPIRY,
+        },
+        "timeouts": {
+            "connect_s": settings.REST_CONNECT_TIMEOUT,
+            "total_s": settings.REST_TIMEOUT,
+        },
+        "latency_ms": {
+            "calls": calls,
+            "errors": _stats["errors"],
+            "avg": round(_stats["total_ms"] / calls, 2) if calls else 0.0,
+            "max": round(_stats["max_ms"], 2),
+            "p50": round(_percentile(recent, 50), 2),
+            "p95": round(_percentile(recent, 95), 2),
+            "p99": round(_percentile(recent, 99), 2),
+        },
+    }
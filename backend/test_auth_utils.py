@@ -0,0 +1,77 @@
+# backend/test_auth_utils.py
+"""
+Verified-token cache in auth_utils.get_authenticated_user_id.
+
+Run from backend/:
+    python -m pytest -q test_auth_utils.py
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from auth import auth_utils
+from supabase_stub import make_access_token
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Count the signature checks that actually run."""
+    auth_utils.clear_token_cache()
+    calls = []
+    real_decode = auth_utils.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_utils.jwt, "decode", counting_decode)
+    yield calls
+    auth_utils.clear_token_cache()
+
+
+def _authenticate(token):
+    return auth_utils.get_authenticated_user_id(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+def test_cache_hit_skips_signature_check(decodes):
+    token = make_access_token("user-1")
+
+    assert _authenticate(token) == "user-1"
+    assert _authenticate(token) == "user-1"
+
+    assert len(decodes) == 1
+    assert auth_utils.token_cache_stats()["hits"] == 1
+
+
+def test_cached_token_is_rejected_once_it_expires(decodes, monkeypatch):
+    token = make_access_token("user-1", ttl=60)
+    assert _authenticate(token) == "user-1"
+
+    later = time.time() + 120
+    monkeypatch.setattr(auth_utils, "time", SimpleNamespace(time=lambda: later))
+    with pytest.raises(HTTPException) as rejected:
+        _authenticate(token)
+
+    assert rejected.value.status_code == 401
+    assert rejected.value.detail == "Token expired"
+    assert len(decodes) == 1
+    assert auth_utils.token_cache_stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used_tokens(decodes, monkeypatch):
+    monkeypatch.setattr(auth_utils, "JWT_CACHE_SIZE", 3)
+    tokens = [make_access_token(f"user-{i}") for i in range(5)]
+
+    for token in tokens:
+        _authenticate(token)
+    _authenticate(tokens[-1])
+    _authenticate(tokens[0])
+
+    assert auth_utils.token_cache_stats()["size"] == 3
+    # The newest token was still cached; the oldest had been evicted and is verified again
+    assert decodes.count(tokens[-1]) == 1
+    assert decodes.count(tokens[0]) == 2
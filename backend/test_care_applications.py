@@ -0,0 +1,289 @@
+# backend/test_care_applications.py
+"""
+Care application routes. Postgres-backed routes get a small in-memory
+connection standing in for asyncpg and the counter tables.
+
+Run from backend/:
+    python -m pytest -q test_care_applications.py
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import db_pool
+from routers import count_care_applications_by_status
+
+SEEKER = "00000000-0000-0000-0000-00000000a001"
+REQ_A = "00000000-0000-0000-0000-0000000000aa"
+REQ_B = "00000000-0000-0000-0000-0000000000bb"
+REQ_C = "00000000-0000-0000-0000-0000000000cc"
+REQ_OTHER = "00000000-0000-0000-0000-0000000000dd"
+
+
+class _FakeConnection:
+    """Answers the status-count counter lookups from application rows and request owners."""
+
+    def __init__(self, applications, owners):
+        self.applications = applications
+        self.owners = owners
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        seeker = args[0] if "JOIN public.care_requests" in query else None
+        request_ids = args[-1] if "ANY(" in query else None
+        counts = {}
+        for a in self.applications:
+            if seeker and self.owners.get(a["care_request_id"]) != seeker:
+                continue
+            if request_ids is not None and a["care_request_id"] not in request_ids:
+                continue
+            key = (a["care_request_id"], a["status"])
+            counts[key] = counts.get(key, 0) + 1
+        return [{"care_request_id": r, "status": s, "count": n} for (r, s), n in counts.items()]
+
+
+@pytest.fixture
+def conn():
+    rows = [(REQ_A, "pending")] * 3 + [(REQ_A, "accepted"), (REQ_B, "pending"), (REQ_OTHER, "pending")]
+    applications = [{"care_request_id": r, "status": s} for r, s in rows]
+    return _FakeConnection(applications, {REQ_A: SEEKER, REQ_B: SEEKER, REQ_C: SEEKER, REQ_OTHER: "someone-else"})
+
+
+@pytest.fixture
+def client(supabase_stub, conn):
+    app = FastAPI()
+    app.include_router(count_care_applications_by_status.care_app_status_router, prefix="/api")
+    app.dependency_overrides[db_pool.get_db_connection] = lambda: conn
+    return TestClient(app)
+
+
+def test_status_counts_come_from_the_counter_table(client, conn, auth_headers):
+    url, headers = "/api/care-applications/status-count", auth_headers(SEEKER)
+
+    overall = client.get(url, headers=headers).json()
+    single = client.get(url, params={"care_request_id": REQ_A}, headers=headers).json()
+
+    assert sorted((c["status"], c["count"]) for c in overall) == [("accepted", 1), ("pending", 4)]
+    assert sorted((c["status"], c["count"]) for c in single) == [("accepted", 1), ("pending", 3)]
+    assert all("care_application_counts" in q and "r.user_id" in q for q in conn.queries)
+
+
+def test_status_counts_for_many_requests_in_one_query(client, conn, auth_headers):
+    response = client.get("/api/care-applications/status-count",
+                          params={"care_request_ids": f"{REQ_A},{REQ_B},{REQ_C},{REQ_A}"}, headers=auth_headers(SEEKER))
+
+    assert response.status_code == 200
+    body = {k: sorted((c["status"], c["count"]) for c in v) for k, v in response.json().items()}
+    assert body == {REQ_A: [("accepted", 1), ("pending", 3)], REQ_B: [("pending", 1)], REQ_C: []}
+    assert len(conn.queries) == 1
+
+    bad = client.get("/api/care-applications/status-count", params={"care_request_ids": "nope"},
+                     headers=auth_headers(SEEKER))
+    assert bad.status_code == 400
+
+
+def test_review_loads_applicant_profiles_in_one_batch(supabase_stub):
+    from review_care_applications import review_router
+
+    supabase_stub.seed("care_applications", [{
+        "id": f"app-{i:02d}", "care_request_id": REQ_A, "caregiver_user_id": f"cg-{i}",
+        "status": "pending" if i % 2 else "accepted", "created_at": f"2025-01-01T00:00:{i:02d}+00:00",
+    } for i in range(12)])
+    supabase_stub.seed("caregiver_profiles", [{
+        "user_id": f"cg-{i}", "full_name": f"Caregiver {i}", "care_services": ["meals"], "education": "BSc",
+    } for i in range(12) if i != 7])
+    app = FastAPI()
+    app.include_router(review_router)
+    client = TestClient(app)
+
+    pages, cursor = [], None
+    while True:
+        supabase_stub.requests.clear()
+        params = {"care_request_id": REQ_A, "limit": 5, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/review-care-applications", params=params).json()
+        assert len(supabase_stub.requests) == 2  # applications + one batched profile read
+        pages.append(body["caregiver_applications"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    merged = [p for page in pages for p in page]
+    assert [p["application_id"] for p in merged] == [f"app-{i:02d}" for i in range(11, -1, -1) if i != 7]
+    assert merged[0]["application_status"] == "pending" and merged[0]["full_name"] == "Caregiver 11"
+    assert "education" not in merged[0]
+
+    full = client.get("/api/review-care-applications", params={"care_request_id": REQ_A, "fields": "*"}).json()
+    assert full["caregiver_applications"][0]["education"] == "BSc"
+
+    bad = client.get("/api/review-care-applications", params={"care_request_id": REQ_A, "cursor": "not-json"})
+    assert bad.status_code == 200 and bad.json() == {"error": "Invalid cursor"}
+
+
+class _FakeTransactionConnection:
+    """Applications, request owners and history rows behind the bulk_update statements."""
+
+    def __init__(self, applications, owners, enums=None, fail_with=None):
+        self.applications = {a["id"]: dict(a) for a in applications}
+        self.owners = owners
+        self.enums = enums or {}
+        self.fail_with = fail_with
+        self.history = []
+        self.statements = []
+        self.committed = False
+
+    def transaction(self):
+        conn = self
+
+        class _Transaction:
+            async def __aenter__(self):
+                conn.snapshot = {k: dict(v) for k, v in conn.applications.items()}, list(conn.history)
+
+            async def __aexit__(self, exc_type, exc, tb):
+                if exc_type:
+                    conn.applications, conn.history = conn.snapshot
+                else:
+                    conn.committed = True
+        return _Transaction()
+
+    def _owned(self, user_id):
+        return [a for a in self.applications.values() if self.owners.get(a["care_request_id"]) == user_id]
+
+    async def fetch(self, query, *args):
+        self.statements.append(query)
+        if "pg_enum" in query:
+            return [{"table_name": t, "column_name": c, "labels": labels} for (t, c), labels in self.enums.items()]
+        if "NOT (a.id = ANY" in query:
+            request_id, user_id, exclude, statuses = args
+            return [{"id": a["id"]} for a in self._owned(user_id) if a["care_request_id"] == request_id
+                    and a["id"] not in exclude and (statuses is None or a["status"] in statuses)]
+        ids, user_id = args
+        return [a for a in self._owned(user_id) if a["id"] in ids]
+
+    async def execute(self, query, new_status, user_id, ids):
+        self.statements.append(query)
+        if self.fail_with:
+            raise self.fail_with
+        for application_id in ids:
+            self.applications[application_id]["status"] = new_status
+
+    async def executemany(self, query, rows):
+        self.statements.append(query)
+        self.history.extend(rows)
+
+
+APP = "00000000-0000-0000-0000-0000000001{:02d}".format
+APPLICATION_STATUSES = ["pending", "shortlisted", "interview_scheduled", "accepted", "rejected", "withdrawn"]
+ENUMS = {
+    ("care_applications", "status"): APPLICATION_STATUSES,
+    # History rows only know some of the application statuses
+    ("care_request_status_history", "status"): ["pending", "shortlisted", "accepted", "rejected"],
+    ("care_request_status_history", "changed_by_user_role"): ["careseeker", "caregiver", "admin"],
+}
+
+
+@pytest.fixture
+def tx_conn():
+    applications = [{"id": APP(i), "care_request_id": REQ_A, "status": "pending"} for i in range(5)]
+    applications.append({"id": APP(50), "care_request_id": REQ_OTHER, "status": "pending"})
+    applications[4]["status"] = "rejected"
+    return _FakeTransactionConnection(applications, {REQ_A: SEEKER, REQ_OTHER: "someone-else"}, enums=ENUMS)
+
+
+@pytest.fixture
+def tx_client(supabase_stub, tx_conn):
+    from routers import care_applications
+
+    app = FastAPI()
+    app.include_router(care_applications.router, prefix="/api")
+    app.dependency_overrides[db_pool.get_db_connection] = lambda: tx_conn
+    return TestClient(app)
+
+
+def test_bulk_update_by_ids_reports_per_id_outcomes(tx_client, tx_conn, auth_headers):
+    body = {"changed_by_user_role": "careseeker", "updates": [
+        {"id": APP(0), "status": "shortlisted"}, {"id": APP(1), "status": "rejected"},
+        {"id": APP(50), "status": "rejected"}, {"id": "not-a-uuid", "status": "rejected"},
+        {"id": APP(4), "status": "rejected"}, {"id": APP(0), "status": "accepted"},
+    ]}
+
+    response = tx_client.put("/api/care_applications/bulk_update", json=body, headers=auth_headers(SEEKER))
+
+    assert response.status_code == 207
+    assert [r["status_code"] for r in response.json()["results"]] == [200, 200, 404, 422, 200, 400]
+    assert response.json()["updated"] == 2
+    assert tx_conn.applications[APP(0)]["status"] == "shortlisted"
+    assert tx_conn.applications[APP(50)]["status"] == "pending"
+    assert sorted(row[1] for row in tx_conn.history) == ["rejected", "shortlisted"]
+    assert tx_conn.committed
+
+
+def test_bulk_update_catches_duplicates_written_in_another_case(tx_client, tx_conn, auth_headers):
+    mixed = "00000000-0000-0000-0000-0000000001ab"
+    tx_conn.applications[mixed] = {"id": mixed, "care_request_id": REQ_A, "status": "pending"}
+    body = {"changed_by_user_role": "careseeker", "updates": [
+        {"id": mixed, "status": "shortlisted"}, {"id": mixed.upper(), "status": "rejected"},
+    ]}
+
+    response = tx_client.put("/api/care_applications/bulk_update", json=body, headers=auth_headers(SEEKER))
+
+    assert [(r["id"], r["status_code"]) for r in response.json()["results"]] == [(mixed, 200), (mixed.upper(), 400)]
+    assert tx_conn.applications[mixed]["status"] == "shortlisted"
+    assert len(tx_conn.history) == 1
+
+
+def test_bulk_update_rejects_everyone_else_in_one_transaction(tx_client, tx_conn, auth_headers):
+    body = {"changed_by_user_role": "careseeker",
+            "where": {"care_request_id": REQ_A, "status": "rejected", "exclude_ids": [APP(2)],
+                      "from_statuses": ["pending"]}}
+
+    response = tx_client.put("/api/care_applications/bulk_update", json=body, headers=auth_headers(SEEKER))
+
+    assert response.status_code == 200
+    assert sorted(r["id"] for r in response.json()["results"]) == [APP(0), APP(1), APP(3)]
+    assert {a["id"]: a["status"] for a in tx_conn.applications.values()} == {
+        APP(0): "rejected", APP(1): "rejected", APP(2): "pending", APP(3): "rejected", APP(4): "rejected",
+        APP(50): "pending"}
+    assert len(tx_conn.history) == 3
+    assert sum(s.startswith("UPDATE") for s in tx_conn.statements) == 1
+
+    neither = tx_client.put("/api/care_applications/bulk_update", json={"changed_by_user_role": "careseeker"},
+                            headers=auth_headers(SEEKER))
+    assert neither.status_code == 400
+
+
+def test_bulk_update_rejects_unknown_enum_values_before_writing(tx_client, tx_conn, auth_headers):
+    body = {"changed_by_user_role": "careseeker", "updates": [
+        {"id": APP(0), "status": "rejected"}, {"id": APP(1), "status": "hired"},
+        {"id": APP(2), "status": "withdrawn"},
+    ]}
+
+    response = tx_client.put("/api/care_applications/bulk_update", json=body, headers=auth_headers(SEEKER))
+
+    assert response.status_code == 207
+    # "withdrawn" is an application status but not a care_request_status, so its history row could not be written
+    assert [r["status_code"] for r in response.json()["results"]] == [200, 422, 422]
+    assert [a["status"] for a in (tx_conn.applications[APP(i)] for i in range(3))] == ["rejected", "pending", "pending"]
+
+    bad_role = tx_client.put("/api/care_applications/bulk_update",
+                             json={**body, "changed_by_user_role": "superuser"}, headers=auth_headers(SEEKER))
+    bad_where = tx_client.put("/api/care_applications/bulk_update",
+                              json={"changed_by_user_role": "careseeker",
+                                    "where": {"care_request_id": REQ_A, "status": "hired"}},
+                              headers=auth_headers(SEEKER))
+    assert (bad_role.status_code, bad_where.status_code) == (422, 422)
+    assert tx_conn.applications[APP(3)]["status"] == "pending"
+
+
+def test_bulk_update_turns_database_errors_into_4xx(tx_client, tx_conn, auth_headers):
+    import asyncpg
+
+    tx_conn.fail_with = asyncpg.exceptions.InvalidTextRepresentationError("invalid input value for enum")
+    body = {"changed_by_user_role": "careseeker", "updates": [{"id": APP(0), "status": "rejected"}]}
+
+    response = tx_client.put("/api/care_applications/bulk_update", json=body, headers=auth_headers(SEEKER))
+
+    assert response.status_code == 422
+    assert "invalid input value" in response.json()["detail"]
+    assert tx_conn.applications[APP(0)]["status"] == "pending" and not tx_conn.committed
@@ -0,0 +1,513 @@
+# backend/test_care_requests.py
+"""
+care_requests router behaviour against the in-process Supabase stand-in.
+
+Run from backend/:
+    python -m pytest -q test_care_requests.py
+"""
+
+import asyncpg
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import care_requests
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(care_requests.router, prefix="/api/care_requests")
+    return TestClient(app)
+
+
+def _seed(stub, count, user_id="seeker-1"):
+    # Every third pair shares a created_at, so the id tie-breaker matters
+    return stub.seed("care_requests", [{
+        "id": f"{i:08d}-0000-0000-0000-000000000000",
+        "user_id": user_id,
+        "location": "Kochi" if i % 2 else "Delhi",
+        "care_services_needed": ["meals"],
+        "created_at": f"2025-01-01T00:{(i // 2) // 60:02d}:{(i // 2) % 60:02d}+00:00",
+    } for i in range(count)])
+
+
+def _walk(client, url, headers, **params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(url, params=query, headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return pages
+
+
+def test_available_feed_pages_through_every_row_once(supabase_stub, auth_headers):
+    rows = _seed(supabase_stub, 130)
+    client = _client()
+
+    pages = _walk(client, "/api/care_requests/available-care-requests", auth_headers("caregiver-1"), limit=25)
+
+    assert [len(p) for p in pages] == [25, 25, 25, 25, 25, 5]
+    seen = [r["id"] for page in pages for r in page]
+    expected = sorted(rows, key=lambda r: (r["created_at"], r["id"]), reverse=True)
+    assert seen == [r["id"] for r in expected]
+
+
+def test_default_limit_and_total_count(supabase_stub, auth_headers):
+    _seed(supabase_stub, care_requests.DEFAULT_PAGE_SIZE + 10)
+    client = _client()
+
+    response = client.get("/api/care_requests/my-care-requests", params={"location": "koch", "count": "exact"},
+                          headers=auth_headers("seeker-1"))
+
+    assert len(response.json()) == (care_requests.DEFAULT_PAGE_SIZE + 10) // 2
+    assert response.headers["x-total-count"] == str((care_requests.DEFAULT_PAGE_SIZE + 10) // 2)
+    assert "x-next-cursor" not in response.headers
+
+    response = client.get("/api/care_requests/my-care-requests", headers=auth_headers("seeker-1"))
+    assert len(response.json()) == care_requests.DEFAULT_PAGE_SIZE
+    assert "x-next-cursor" in response.headers
+
+
+def test_legacy_alias_is_paginated(supabase_stub, auth_headers):
+    _seed(supabase_stub, 12)
+    pages = _walk(_client(), "/api/care_requests/care_requests", auth_headers("seeker-1"), limit=5)
+    assert [len(p) for p in pages] == [5, 5, 2]
+
+
+def test_invalid_cursor_is_rejected(supabase_stub, auth_headers):
+    response = _client().get("/api/care_requests/available-care-requests", params={"cursor": "not-a-cursor"},
+                             headers=auth_headers("caregiver-1"))
+    assert response.status_code == 400
+
+
+def test_fields_projection_and_card_preset(supabase_stub, auth_headers):
+    _seed(supabase_stub, 3)
+    client = _client()
+    headers = auth_headers("caregiver-1")
+
+    rows = client.get("/api/care_requests/available-care-requests", params={"fields": "location"},
+                      headers=headers).json()
+    assert set(rows[0]) == {"location", "id", "created_at"}
+
+    card = client.get("/api/care_requests/available-care-requests", params={"fields": "card"}, headers=headers).json()
+    assert set(card[0]) == set(care_requests.FIELD_PRESETS["card"])
+
+    single = client.get(f"/api/care_requests/care_requests/{rows[0]['id']}", params={"fields": "location,user_id"},
+                        headers=headers).json()
+    assert single == {"location": rows[0]["location"], "user_id": "seeker-1"}
+
+
+def test_unknown_fields_are_rejected(supabase_stub, auth_headers):
+    response = _client().get("/api/care_requests/available-care-requests", params={"fields": "location,password"},
+                             headers=auth_headers("caregiver-1"))
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_available_feed_is_cached_and_invalidated_by_writes(supabase_stub, auth_headers):
+    _seed(supabase_stub, 3)
+    client = _client()
+    caregiver, seeker = auth_headers("caregiver-1"), auth_headers("seeker-1")
+    feed = "/api/care_requests/available-care-requests"
+
+    first = client.get(feed, params={"location": "koch"}, headers=caregiver)
+    second = client.get(feed, params={"location": "koch"}, headers=caregiver)
+    other = client.get(feed, params={"location": "delhi"}, headers=caregiver)
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("miss", "hit")
+    assert second.json() == first.json()
+    upstream_reads = sum(1 for method, path in supabase_stub.requests if method == "GET")
+    assert upstream_reads == 2
+
+    # A new Kochi request retires the Kochi pages but leaves the Delhi ones alone
+    payload = {field: None for field in care_requests.CareRequestBase.__fields__}
+    payload.update(location="Kochi", recipient_age_range="60-70", care_services_needed=["meals"],
+                   primary_location_type="home", care_duration="long_term", care_start_date_preference="now",
+                   transportation_provided=False, accommodation_provided=False, food_provided=True,
+                   daily_working_hours="8", estimated_budget="1000")
+    created = client.post("/api/care_requests/care_requests", json=payload, headers=seeker).json()[0]
+
+    after = client.get(feed, params={"location": "koch"}, headers=caregiver)
+    assert after.headers["x-cache"] == "miss"
+    assert created["id"] in [r["id"] for r in after.json()]
+    assert client.get(feed, params={"location": "delhi"}, headers=caregiver).json() == other.json()
+    assert client.get(feed, params={"location": "delhi"}, headers=caregiver).headers["x-cache"] == "hit"
+
+    # Moving it to Delhi must refresh both the Kochi pages (old) and the Delhi pages (new)
+    client.put(f"/api/care_requests/care_requests/{created['id']}", json={**payload, "location": "Delhi"},
+               headers=seeker)
+    assert client.get(feed, params={"location": "koch"}, headers=caregiver).headers["x-cache"] == "miss"
+    delhi = client.get(feed, params={"location": "delhi"}, headers=caregiver)
+    assert delhi.headers["x-cache"] == "miss"
+    assert created["id"] in [r["id"] for r in delhi.json()]
+
+
+class _FakeSearchPool:
+    """Stands in for the asyncpg pool: records statements, returns canned search rows."""
+
+    def __init__(self, records, total=0):
+        self.records, self.total, self.statements = records, total, []
+
+    def acquire(self):
+        pool = self
+
+        class _Conn:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def fetch(self, sql, *args):
+                pool.statements.append((sql, args))
+                return pool.records[:args[-1]]
+
+            async def fetchval(self, sql, *args):
+                pool.statements.append((sql, args))
+                return pool.total
+
+        return _Conn()
+
+
+def test_search_mode_ranks_highlights_and_pages(supabase_stub, auth_headers, monkeypatch):
+    import db_pool
+
+    records = [{
+        "row": {"id": f"{i:08d}-0000-0000-0000-000000000000", "user_id": "seeker-1", "location": "Kochi",
+                "created_at": "2025-01-01T00:00:00+00:00", "caregiver_requirements": "dementia care"},
+        "rank": 0.5 - i / 10,
+        "highlights": {"caregiver_requirements": "<mark>dementia</mark> care"},
+    } for i in range(3)]
+    pool = _FakeSearchPool(records, total=3)
+
+    async def get_pool():
+        return pool
+
+    monkeypatch.setattr(db_pool, "get_pool", get_pool)
+    client = _client()
+
+    response = client.get("/api/care_requests/my-care-requests",
+                          params={"q": "dementia", "location": "50%", "limit": 2, "count": "exact",
+                                  "fields": "id,location"},
+                          headers=auth_headers("seeker-1"))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["search_rank"] for r in body] == [0.5, 0.4]
+    assert body[0] == {"id": records[0]["row"]["id"], "location": "Kochi", "search_rank": 0.5,
+                       "highlights": {"caregiver_requirements": "<mark>dementia</mark> care"}}
+    assert response.headers["x-total-count"] == "3"
+    sql, args = pool.statements[0]
+    assert "websearch_to_tsquery" in sql and "ORDER BY rank DESC" in sql
+    assert args == ("dementia", "seeker-1", "%50\\%%", 3)  # user filter, escaped ilike, limit + 1
+    assert supabase_stub.requests == []
+
+    # The cursor resumes strictly after the last row in (rank, created_at, id) order
+    client.get("/api/care_requests/my-care-requests",
+               params={"q": "dementia", "cursor": response.headers["x-next-cursor"]},
+               headers=auth_headers("seeker-1"))
+    sql, args = pool.statements[-1]
+    assert "< ($3::real, $4::timestamptz, $5::uuid)" in sql
+    assert args[2:5] == (0.4, "2025-01-01T00:00:00+00:00", records[1]["row"]["id"])
+
+    # Cursors from the plain listing are rejected in search mode
+    plain = client.get("/api/care_requests/my-care-requests", params={"q": "dementia", "cursor": "bm90LWpzb24"},
+                       headers=auth_headers("seeker-1"))
+    assert plain.status_code == 400
+
+
+
+def test_search_feed_pages_are_cached_with_ids_and_unmarked_when_caching_is_off(supabase_stub, auth_headers,
+                                                                                   monkeypatch):
+    import db_pool
+    import feed_cache
+    from config import settings
+
+    row_id = "00000000-0000-0000-0000-000000000001"
+    pool = _FakeSearchPool([{"row": {"id": row_id, "location": "Kochi", "created_at": "2025-01-01T00:00:00+00:00"},
+                             "rank": 0.5, "highlights": {}}])
+
+    async def get_pool():
+        return pool
+
+    monkeypatch.setattr(db_pool, "get_pool", get_pool)
+    client = _client()
+    feed, params = "/api/care_requests/available-care-requests", {"q": "dementia", "fields": "location"}
+
+    response = client.get(feed, params=params, headers=auth_headers("caregiver-1"))
+    assert response.headers["x-cache"] == "miss"
+    assert response.json()[0]["id"] == row_id
+    [(_, entry)] = feed_cache._backend._entries.values()
+    assert entry["ids"] == [row_id]
+
+    monkeypatch.setattr(settings, "FEED_CACHE_BACKEND", "none")
+    feed_cache.reset_backend()
+    uncached = client.get(feed, params=params, headers=auth_headers("caregiver-1"))
+    assert uncached.status_code == 200
+    assert "x-cache" not in uncached.headers
+
+def test_create_stores_coordinates_and_caches_the_geocode(supabase_stub, auth_headers):
+    client = _client()
+    payload = {field: None for field in care_requests.CareRequestBase.__fields__}
+    payload.update(location="Flat 2, MG Road, Cochin", recipient_age_range="60-70", care_services_needed=["meals"],
+                   primary_location_type="home", care_duration="long_term", care_start_date_preference="now",
+                   transportation_provided=False, accommodation_provided=False, food_provided=True,
+                   daily_working_hours="8", estimated_budget="1000")
+
+    created = client.post("/api/care_requests/care_requests", json=payload, headers=auth_headers("seeker-1")).json()[0]
+    unknown = client.post("/api/care_requests/care_requests", json={**payload, "location": "Atlantis"},
+                          headers=auth_headers("seeker-1")).json()[0]
+
+    assert (created["latitude"], created["longitude"]) == (9.9312, 76.2673)
+    assert created["geohash"].startswith("t9y0")
+    assert unknown["geohash"] is None
+    cached = {row["query"]: row["latitude"] for row in supabase_stub.rows("geocode_cache")}
+    assert cached == {"flat 2 mg road cochin": 9.9312, "atlantis": None}
+
+
+def test_near_filter_sorts_by_distance_and_pages(supabase_stub, auth_headers):
+    import geocoding
+
+    places = {"aluva": (10.1004, 76.3570), "kochi": (9.9312, 76.2673), "kottayam": (9.5916, 76.5222),
+              "thrissur": (10.5276, 76.2144), "delhi": (28.6139, 77.2090)}
+    supabase_stub.seed("care_requests", [{
+        "id": name, "location": name, "latitude": lat, "longitude": lon,
+        "geohash": geocoding.geohash_encode(lat, lon), "created_at": "2025-01-01T00:00:00+00:00",
+    } for name, (lat, lon) in places.items()] + [{"id": "ungeocoded", "location": "somewhere", "geohash": None}])
+    client = _client()
+    feed = "/api/care_requests/available-care-requests"
+
+    pages = _walk(client, feed, auth_headers("caregiver-1"), near="9.9312,76.2673", radius_km=50, limit=2)
+
+    rows = [r for page in pages for r in page]
+    assert [r["id"] for r in rows] == ["kochi", "aluva", "kottayam"]
+    assert rows[0]["distance_km"] == 0 and 20 < rows[1]["distance_km"] < 23
+    assert all(r["distance_km"] <= 50 for r in rows)
+
+    wider = client.get(feed, params={"near": "9.9312,76.2673", "radius_km": 80, "count": "exact"},
+                       headers=auth_headers("caregiver-1"))
+    assert [r["id"] for r in wider.json()][-1] == "thrissur"
+    assert wider.headers["x-total-count"] == "4"
+
+    bad = client.get(feed, params={"near": "north"}, headers=auth_headers("caregiver-1"))
+    assert bad.status_code == 400
+
+
+def test_filters_encode_reserved_characters_multi_values_and_ranges(supabase_stub, auth_headers):
+    supabase_stub.seed("care_requests", [
+        {"id": "a", "user_id": "s", "location": "Flat 4 (rear), MG Road", "care_duration": "long_term",
+         "status": "open", "care_services_needed": ["meals"], "created_at": "2025-01-03T00:00:00+00:00"},
+        {"id": "b", "user_id": "s", "location": "Kochi", "care_duration": "short_term",
+         "status": "open", "care_services_needed": ["bathing"], "created_at": "2025-01-02T00:00:00+00:00"},
+        {"id": "c", "user_id": "s", "location": "Kochi", "care_duration": "one_time",
+         "status": "closed", "care_services_needed": ["meals"], "created_at": "2025-01-01T00:00:00+00:00"},
+    ])
+    client = _client()
+    url = "/api/care_requests/available-care-requests"
+    headers = auth_headers("caregiver-1")
+
+    def ids(**params):
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        return [r["id"] for r in response.json()]
+
+    assert ids(location="(rear), mg") == ["a"]
+    assert ids(care_duration="short_term,long_term") == ["a", "b"]
+    assert ids(care_services_needed="bathing,meals", status="open") == ["a", "b"]
+    assert ids(created_after="2025-01-02T00:00:00Z", created_before="2025-01-03T00:00:00Z") == ["b"]
+
+    # Reordered / padded alternatives normalise to the same cached page
+    supabase_stub.requests.clear()
+    ids(care_duration="long_term, short_term")
+    ids(care_duration="short_term,long_term,")
+    assert sum(1 for method, _ in supabase_stub.requests if method == "GET") <= 1
+
+
+def test_filter_spec_compiles_parameterised_sql():
+    from query_filters import CARE_REQUEST_FILTERS
+
+    filters = CARE_REQUEST_FILTERS.parse({
+        "location": "50%_off", "status": "open,closed", "food_provided": "true",
+        "care_services_needed": ["meals"], "created_after": "2025-01-01T00:00:00Z", "unknown": "x",
+    })
+    conditions, args = filters.to_sql(start=3, alias="r")
+
+    assert conditions == [
+        "r.location ILIKE $3",
+        "r.care_services_needed::text[] && $4::text[]",
+        "r.food_provided = $5",
+        "r.status::text = ANY($6::text[])",
+        "r.created_at >= ($7::text)::timestamptz",
+    ]
+    assert args == ["%50\\%\\_off%", ["meals"], True, ["closed", "open"], "2025-01-01T00:00:00+00:00"]
+    assert filters.to_sql(start=3, alias="r")[0] is conditions  # compiled once per shape
+
+
+def _bulk_payload(**overrides):
+    payload = {field: None for field in care_requests.CareRequestBase.__fields__}
+    payload.update(location="Kochi", recipient_age_range="60-70", care_services_needed=["meals"],
+                   primary_location_type="home", care_duration="long_term", care_start_date_preference="now",
+                   transportation_provided=False, accommodation_provided=False, food_provided=True,
+                   daily_working_hours="8", estimated_budget="1000")
+    return {**payload, **overrides}
+
+
+def test_bulk_create_writes_one_batch_and_reports_invalid_items(supabase_stub, auth_headers):
+    client = _client()
+    items = [_bulk_payload(), {"location": "Delhi"}, _bulk_payload(location="Delhi"), _bulk_payload()]
+
+    response = client.post("/api/care_requests/care_requests/bulk", json=items, headers=auth_headers("seeker-1"))
+
+    assert response.status_code == 207
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (3, 1)
+    assert [r["index"] for r in body["results"]] == [0, 1, 2, 3]
+    assert [r["status_code"] for r in body["results"]] == [201, 422, 201, 201]
+    assert body["results"][2]["data"]["latitude"] is not None
+    assert {r["user_id"] for r in supabase_stub.rows("care_requests")} == {"seeker-1"}
+    writes = [path for method, path in supabase_stub.requests if method == "POST" and "care_requests" in path]
+    assert len(writes) == 1
+
+    too_many = client.post("/api/care_requests/care_requests/bulk", json=[_bulk_payload()] * 101,
+                           headers=auth_headers("seeker-1"))
+    assert too_many.status_code == 413
+
+
+MINE_1, MINE_2, THEIRS, GHOST = (f"00000000-0000-0000-0000-00000000000{i}" for i in range(1, 5))
+
+
+class _FakeUpdateConnection:
+    """Applies bulk_update_care_requests' UPDATE to the stub's rows, the way jsonb_populate_record would."""
+
+    def __init__(self, stub, before_update=None, invalid_status=None):
+        self.stub = stub
+        self.before_update = before_update
+        self.invalid_status = invalid_status
+        self.statements = []
+
+    async def fetch(self, query, patches, user_id):
+        self.statements.append(query)
+        if self.before_update:
+            self.before_update()
+        if self.invalid_status and any(p.get("status") == self.invalid_status for p in patches):
+            raise asyncpg.exceptions.InvalidTextRepresentationError("invalid input value for enum")
+        updated = []
+        for patch in patches:
+            for row in self.stub.tables.get("care_requests", []):
+                if row["id"] == patch["id"] and row["user_id"] == user_id:
+                    row.update({k: v for k, v in patch.items() if k in care_requests.UPDATABLE_COLUMNS})
+                    updated.append({"row": dict(row)})
+        return updated
+
+
+def _bulk_update_client(conn):
+    import db_pool
+
+    app = FastAPI()
+    app.include_router(care_requests.router, prefix="/api/care_requests")
+    app.dependency_overrides[db_pool.get_db_connection] = lambda: conn
+    return TestClient(app)
+
+
+def test_bulk_update_checks_ownership_and_keeps_unset_fields(supabase_stub, auth_headers):
+    supabase_stub.seed("care_requests", [
+        {**_bulk_payload(special_needs="wheelchair"), "id": MINE_1, "user_id": "seeker-1", "status": "open"},
+        {**_bulk_payload(), "id": MINE_2, "user_id": "seeker-1", "status": "open"},
+        {**_bulk_payload(), "id": THEIRS, "user_id": "seeker-2", "status": "open"},
+    ])
+    conn = _FakeUpdateConnection(supabase_stub)
+    client = _bulk_update_client(conn)
+    updates = {key: value for key, value in _bulk_payload().items() if value is not None}
+    items = [
+        {**updates, "id": MINE_1, "status": "closed"},
+        {**updates, "id": THEIRS, "status": "closed"},
+        {**updates, "id": MINE_2, "location": "Delhi"},
+        {**updates, "id": MINE_2},
+        {"id": GHOST, "status": "closed"},
+        {**updates, "id": "not-a-uuid"},
+    ]
+
+    response = client.patch("/api/care_requests/care_requests/bulk", json=items, headers=auth_headers("seeker-1"))
+
+    assert response.status_code == 207
+    assert [r["status_code"] for r in response.json()["results"]] == [200, 404, 200, 400, 422, 422]
+    rows = {r["id"]: r for r in supabase_stub.rows("care_requests")}
+    assert (rows[MINE_1]["status"], rows[MINE_1]["special_needs"]) == ("closed", "wheelchair")
+    assert rows[THEIRS]["status"] == "open"
+    assert rows[MINE_2]["location"] == "Delhi" and rows[MINE_2]["geohash"]
+    # One UPDATE for the batch, and nothing read or written through PostgREST
+    assert len(conn.statements) == 1 and conn.statements[0].lstrip().startswith("UPDATE")
+    assert not any("care_requests" in path for _, path in supabase_stub.requests)
+
+    ok = client.patch("/api/care_requests/care_requests/bulk", json=[{**updates, "id": MINE_2}],
+                      headers=auth_headers("seeker-1"))
+    assert ok.status_code == 200 and ok.json()["failed"] == 0
+
+
+def test_bulk_update_never_resurrects_or_overwrites_concurrent_changes(supabase_stub, auth_headers):
+    supabase_stub.seed("care_requests", [
+        {**_bulk_payload(), "id": MINE_1, "user_id": "seeker-1", "status": "open"},
+        {**_bulk_payload(), "id": MINE_2, "user_id": "seeker-1", "status": "open"},
+    ])
+
+    def another_writer():
+        # Between the request arriving and the UPDATE: one row is deleted, the other closed
+        table = supabase_stub.tables["care_requests"]
+        table[:] = [row for row in table if row["id"] != MINE_2]
+        table[0]["status"] = "closed"
+
+    client = _bulk_update_client(_FakeUpdateConnection(supabase_stub, before_update=another_writer))
+    updates = {key: value for key, value in _bulk_payload().items() if value is not None}
+
+    response = client.patch("/api/care_requests/care_requests/bulk",
+                            json=[{**updates, "id": MINE_1, "special_needs": "hoist"}, {**updates, "id": MINE_2}],
+                            headers=auth_headers("seeker-1"))
+
+    assert response.status_code == 207
+    assert [r["status_code"] for r in response.json()["results"]] == [200, 404]
+    rows = {r["id"]: r for r in supabase_stub.rows("care_requests")}
+    assert set(rows) == {MINE_1}
+    assert (rows[MINE_1]["status"], rows[MINE_1]["special_needs"]) == ("closed", "hoist")
+
+
+def test_get_care_request_honours_if_none_match_and_caches_the_etag(supabase_stub, auth_headers):
+    supabase_stub.seed("care_requests", [{**_bulk_payload(), "id": "req-1", "user_id": "seeker-1", "status": "open"}])
+    client = _client()
+    url, headers = "/api/care_requests/care_requests/req-1", auth_headers("seeker-1")
+
+    first = client.get(url, headers=headers)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('"')
+    assert client.get(url, params={"fields": "card"}, headers=headers).headers["etag"] != etag
+
+    supabase_stub.requests.clear()
+    again = client.get(url, headers={**headers, "If-None-Match": f'W/"other", {etag}'})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    assert supabase_stub.requests == []  # answered from the ETag cache
+
+    # A write through the API retires the cached tag; the old one no longer matches
+    client.put(url, json={**_bulk_payload(), "status": "closed"}, headers=headers)
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["status"] == "closed"
+    assert changed.headers["etag"] != etag
+
+
+def test_bulk_update_pins_database_errors_on_the_offending_items(supabase_stub, auth_headers):
+    supabase_stub.seed("care_requests", [
+        {**_bulk_payload(), "id": MINE_1, "user_id": "seeker-1", "status": "open"},
+        {**_bulk_payload(), "id": MINE_2, "user_id": "seeker-1", "status": "open"},
+    ])
+    conn = _FakeUpdateConnection(supabase_stub, invalid_status="bogus")
+    updates = {key: value for key, value in _bulk_payload().items() if value is not None}
+
+    response = _bulk_update_client(conn).patch(
+        "/api/care_requests/care_requests/bulk",
+        json=[{**updates, "id": MINE_1, "status": "closed"}, {**updates, "id": MINE_2, "status": "bogus"}],
+        headers=auth_headers("seeker-1"))
+
+    assert response.status_code == 207
+    assert [r["status_code"] for r in response.json()["results"]] == [200, 422]
+    assert {r["id"]: r["status"] for r in supabase_stub.rows("care_requests")} == {MINE_1: "closed", MINE_2: "open"}
+    assert len(conn.statements) == 3  # the batch, then each item on its own
@@ -0,0 +1,137 @@
+# backend/test_dashboard.py
+"""
+Composite /api/dashboard endpoints against the Supabase stand-in, with a
+small pool and connection standing in for the counter tables.
+
+Run from backend/:
+    python -m pytest -q test_dashboard.py
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import db_pool
+from routers import dashboard
+
+SEEKER = "00000000-0000-0000-0000-00000000a001"
+OTHER = "00000000-0000-0000-0000-00000000a002"
+REQ_A = "00000000-0000-0000-0000-0000000000aa"
+REQ_B = "00000000-0000-0000-0000-0000000000bb"
+
+
+class _CountsConnection:
+    """Answers status_counts() with fixed counter rows, or fails like a dropped connection."""
+
+    def __init__(self, rows, fail=False):
+        self.rows = rows
+        self.fail = fail
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        if self.fail:
+            raise ConnectionError("connection was closed in the middle of operation")
+        return self.rows
+
+
+@pytest.fixture
+def seeded(supabase_stub):
+    supabase_stub.seed("care_requests", [
+        {"id": REQ_A, "user_id": SEEKER, "status": "open", "location": "Kochi", "created_at": "2025-01-02T00:00:00+00:00"},
+        {"id": REQ_B, "user_id": SEEKER, "status": "closed", "location": "Pune", "created_at": "2025-01-01T00:00:00+00:00"},
+        {"id": "req-other", "user_id": OTHER, "status": "open", "created_at": "2025-01-03T00:00:00+00:00"},
+    ])
+    supabase_stub.seed("care_services", [
+        {"id": "s1", "care_request_id": REQ_A, "caregiver_user_id": "cg-1", "status": "active", "start_date": "2025-02-01"},
+        {"id": "s2", "care_request_id": "req-other", "caregiver_user_id": "cg-2", "status": "active", "start_date": "2025-02-01"},
+    ])
+    supabase_stub.seed("interview_requests", [
+        {"id": "i1", "care_request_id": REQ_A, "requester_id": SEEKER, "caregiver_id": "cg-1", "status": "scheduled"},
+        {"id": "i2", "care_request_id": "req-other", "requester_id": OTHER, "caregiver_id": "cg-2", "status": "scheduled"},
+    ])
+    supabase_stub.seed("agreements", [
+        {"id": "g1", "care_request_id": REQ_A, "care_seeker_user_id": SEEKER, "caregiver_user_id": "cg-1"},
+    ])
+    return supabase_stub
+
+
+class _CountsPool:
+    """Hands out the one connection, counting how often it is borrowed."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        yield self.conn
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A client whose pool serves `conn`; returns (client, pool)."""
+    def make(conn):
+        pool = _CountsPool(conn)
+
+        async def get_pool():
+            return pool
+
+        monkeypatch.setattr(db_pool, "get_pool", get_pool)
+        app = FastAPI()
+        app.include_router(dashboard.router, prefix="/api/dashboard")
+        return TestClient(app), pool
+    return make
+
+
+def test_careseeker_dashboard_joins_every_section(seeded, client, auth_headers):
+    conn = _CountsConnection([{"care_request_id": REQ_A, "status": "pending", "count": 3},
+                              {"care_request_id": REQ_A, "status": "accepted", "count": 1}])
+    http, pool = client(conn)
+
+    response = http.get("/api/dashboard/careseeker", headers=auth_headers(SEEKER))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["id"] for r in body["care_requests"]] == [REQ_A, REQ_B]
+    first, second = body["care_requests"]
+    assert first["application_counts"] == {"pending": 3, "accepted": 1}
+    assert [s["id"] for s in first["care_services"]] == ["s1"]
+    assert second["application_counts"] == {} and second["care_services"] == []
+    assert [i["id"] for i in body["interviews"]] == ["i1"]
+    assert [a["id"] for a in body["agreements"]] == ["g1"]
+    assert body["errors"] == {}
+    assert set(body["timings_ms"]) == {"care_requests", "care_services", "application_counts",
+                                       "interviews", "agreements", "total"}
+    # Counts are read only for the listed requests
+    query, args = conn.queries[0]
+    assert "ANY(" in query and args == ([REQ_A, REQ_B],)
+    assert pool.acquired == 1
+    reads = [path for method, path in seeded.requests if method == "GET"]
+    assert len(reads) == 4
+
+
+def test_failed_section_is_reported_without_failing_the_dashboard(seeded, client, auth_headers):
+    http, _ = client(_CountsConnection([], fail=True))
+
+    response = http.get("/api/dashboard/careseeker", headers=auth_headers(SEEKER))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "connection was closed" in body["errors"]["application_counts"]
+    assert [r["application_counts"] for r in body["care_requests"]] == [{}, {}]
+    assert [i["id"] for i in body["interviews"]] == ["i1"]
+
+
+def test_dashboard_with_no_care_requests_skips_the_dependent_sections(supabase_stub, client, auth_headers):
+    conn = _CountsConnection([])
+    http, pool = client(conn)
+
+    body = http.get("/api/dashboard/careseeker", headers=auth_headers(SEEKER)).json()
+
+    assert body["care_requests"] == [] and body["errors"] == {}
+    assert conn.queries == [] and pool.acquired == 0
+    assert "application_counts" not in body["timings_ms"] and "care_services" not in body["timings_ms"]
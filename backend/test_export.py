@@ -0,0 +1,78 @@
+# backend/test_export.py
+"""
+Streaming /api/export endpoints against the Supabase stand-in.
+
+Run from backend/:
+    python -m pytest -q test_export.py
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config import settings
+from routers import export
+
+
+@pytest.fixture
+def client(supabase_stub, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_PAGE_SIZE", 7)
+    supabase_stub.seed("user_roles", [{"id": "r1", "user_id": "admin-1", "role": "admin"},
+                                      {"id": "r2", "user_id": "seeker-1", "role": "careseeker"}])
+    app = FastAPI()
+    app.include_router(export.router, prefix="/api/export")
+    return TestClient(app)
+
+
+def _seed_requests(stub, count):
+    return stub.seed("care_requests", [{
+        "id": f"{i:08d}-0000-0000-0000-000000000000",
+        "user_id": "seeker-1",
+        "status": "open" if i % 3 else "closed",
+        "location": "Kochi, Kerala",
+        "care_services_needed": ["meals", "bathing"],
+        "created_at": f"2025-01-01T00:00:{i // 2:02d}+00:00",
+    } for i in range(count)])
+
+
+def test_ndjson_export_pages_through_every_matching_row(client, supabase_stub, auth_headers):
+    rows = _seed_requests(supabase_stub, 40)
+
+    response = client.get("/api/export/care_requests", params={"status": "open"}, headers=auth_headers("admin-1"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    expected = sorted((r for r in rows if r["status"] == "open"), key=lambda r: (r["created_at"], r["id"]), reverse=True)
+    assert [r["id"] for r in exported] == [r["id"] for r in expected]
+    reads = [path for method, path in supabase_stub.requests if method == "GET" and "care_requests" in path]
+    assert len(reads) == len(expected) // 7 + 1
+
+
+def test_csv_export_projects_columns_and_encodes_lists(client, supabase_stub, auth_headers):
+    _seed_requests(supabase_stub, 9)
+
+    response = client.get("/api/export/care_requests", params={"format": "csv", "fields": "location,care_services_needed"},
+                          headers=auth_headers("admin-1"))
+
+    table = list(csv.reader(io.StringIO(response.text)))
+    assert table[0] == ["location", "care_services_needed", "id", "created_at"]
+    assert len(table) == 10
+    assert table[1][:2] == ["Kochi, Kerala", '["meals","bathing"]']
+
+
+def test_export_requires_an_exporting_role(client, supabase_stub, auth_headers):
+    supabase_stub.seed("care_applications", [{"id": "a1", "care_request_id": "r1", "caregiver_user_id": "c1",
+                                              "status": "applied", "created_at": "2025-01-01T00:00:00+00:00"}])
+
+    denied = client.get("/api/export/care_applications", headers=auth_headers("seeker-1"))
+    allowed = client.get("/api/export/care_applications", params={"status": "applied,hired"},
+                         headers=auth_headers("admin-1"))
+
+    assert denied.status_code == 403
+    assert [json.loads(line)["id"] for line in allowed.text.splitlines()] == ["a1"]
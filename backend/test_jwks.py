@@ -0,0 +1,168 @@
+# backend/test_jwks.py
+"""
+JWKS cache tests against a local stub JWKS endpoint.
+
+Run from backend/:
+    python -m pytest -q test_jwks.py
+"""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+
+from auth.jwks import JWKSCache
+
+
+def _oct_jwk(kid: str, secret: bytes) -> dict:
+    return {"kty": "oct", "kid": kid, "alg": "HS256", "k": base64.urlsafe_b64encode(secret).rstrip(b"=").decode()}
+
+
+class StubJWKS:
+    """Serves whatever key set is assigned to `self.jwks` and counts hits."""
+
+    def __init__(self):
+        self.jwks = {"keys": []}
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                body = json.dumps(stub.jwks).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/auth/v1/keys"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubJWKS()
+    yield server
+    server.close()
+
+
+def _token(kid: str, secret: bytes, alg: str = "HS256") -> str:
+    return jwt.encode({"sub": "user-1", "exp": int(time.time()) + 60}, secret, algorithm=alg, headers={"kid": kid})
+
+
+def test_keys_are_fetched_once(stub):
+    stub.jwks = {"keys": [_oct_jwk("k1", b"a" * 32)]}
+    cache = JWKSCache(stub.url, ttl=3600, min_refetch_interval=3600)
+    try:
+        token = _token("k1", b"a" * 32)
+        for _ in range(50):
+            key = cache.get_signing_key_from_jwt(token)
+            assert jwt.decode(token, key.key, algorithms=["HS256"])["sub"] == "user-1"
+        assert stub.hits == 1
+    finally:
+        cache.stop()
+
+
+def test_unknown_kid_refetches_once(stub):
+    stub.jwks = {"keys": [_oct_jwk("k1", b"a" * 32)]}
+    cache = JWKSCache(stub.url, ttl=3600, min_refetch_interval=0)
+    try:
+        cache.get_signing_key("k1")
+        stub.jwks = {"keys": [_oct_jwk("k1", b"a" * 32), _oct_jwk("k2", b"b" * 32)]}
+        assert cache.get_signing_key("k2").key_id == "k2"
+        assert stub.hits == 2
+        cache.get_signing_key("k2")
+        assert stub.hits == 2
+    finally:
+        cache.stop()
+
+
+def test_unknown_kid_refetch_is_rate_limited(stub):
+    stub.jwks = {"keys": [_oct_jwk("k1", b"a" * 32)]}
+    cache = JWKSCache(stub.url, ttl=3600, min_refetch_interval=3600)
+    try:
+        cache.get_signing_key("k1")
+        for kid in ("bogus-1", "bogus-2", "bogus-3"):
+            with pytest.raises(jwt.InvalidTokenError):
+                cache.get_signing_key(kid)
+        assert stub.hits == 1
+    finally:
+        cache.stop()
+
+
+def test_background_refresh_picks_up_rotation(stub):
+    stub.jwks = {"keys": [_oct_jwk("k1", b"a" * 32)]}
+    cache = JWKSCache(stub.url, ttl=0.05, min_refetch_interval=3600)
+    try:
+        cache.get_signing_key("k1")
+        stub.jwks = {"keys": [_oct_jwk("k2", b"b" * 32)]}
+        deadline = time.time() + 2
+        while "k2" not in cache._keys and time.time() < deadline:
+            time.sleep(0.01)
+        assert "k2" in cache._keys
+        assert cache.get_signing_key("k2").key_id == "k2"
+    finally:
+        cache.stop()
+
+
+def test_stale_keys_survive_failed_refresh(stub):
+    stub.jwks = {"keys": [_oct_jwk("k1", b"a" * 32)]}
+    cache = JWKSCache(stub.url, ttl=3600, min_refetch_interval=3600)
+    try:
+        cache.get_signing_key("k1")
+        stub.close()
+        assert cache.refresh() is False
+        assert cache.get_signing_key("k1").key_id == "k1"
+    finally:
+        cache.stop()
+
+
+def test_rs256_get_current_user_id(stub, monkeypatch):
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from fastapi.security import HTTPAuthorizationCredentials
+    from jwt.algorithms import RSAAlgorithm
+    import auth.jwks as jwks
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    public_jwk.update(kid="rsa-1", alg="RS256", use="sig")
+    stub.jwks = {"keys": [public_jwk]}
+    cache = JWKSCache(stub.url, ttl=3600, min_refetch_interval=3600)
+    monkeypatch.setattr(jwks, "_jwks_cache", cache)
+    try:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=_token("rsa-1", private_key, "RS256"))
+        for _ in range(10):
+            assert jwks.get_current_user_id(credentials) == "user-1"
+        assert stub.hits == 1
+    finally:
+        cache.stop()
+
+
+def test_endpoint_down_at_boot_fails_fast_between_attempts(stub):
+    stub.close()
+    cache = JWKSCache(stub.url, ttl=3600, min_refetch_interval=3600)
+    try:
+        with pytest.raises(jwt.InvalidTokenError):
+            cache.get_signing_key("k1")
+        start = time.monotonic()
+        for _ in range(20):
+            with pytest.raises(jwt.InvalidTokenError):
+                cache.get_signing_key("k1")
+        assert cache.fetches == 1
+        assert time.monotonic() - start < 0.5
+    finally:
+        cache.stop()
@@ -0,0 +1,109 @@
+# backend/test_matching.py
+"""
+Matching engine scoring and the /api/match endpoints against the Supabase stand-in.
+
+Run from backend/:
+    python -m pytest -q test_matching.py
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import matching  # noqa: E402
+from routers import matching as matching_router  # noqa: E402
+
+KOCHI, DELHI = (9.9312, 76.2673), (28.6139, 77.2090)
+
+
+@pytest.fixture
+def client(supabase_stub):
+    matching.invalidate()
+    app = FastAPI()
+    app.include_router(matching_router.router, prefix="/api/match")
+    return TestClient(app)
+
+
+def _request(id, services, point=KOCHI, **extra):
+    return {"id": id, "user_id": "seeker-1", "status": "open", "location": "somewhere",
+            "latitude": point[0] if point else None, "longitude": point[1] if point else None,
+            "care_services_needed": services, "recipient_age_range": "60-70",
+            "estimated_budget": "20000", "care_start_date_preference": "flexible", **extra}
+
+
+def test_parsers():
+    assert matching.parse_amounts("15k - 20,000/month") == (15000.0, 20000.0)
+    assert matching.parse_amounts("2 lakh") == (200000.0, 200000.0)
+    assert np.isnan(matching.parse_amounts("negotiable")[0])
+    assert matching.parse_age_range("80+") == (80.0, matching.OPEN_AGE)
+    assert matching.parse_age_range("70-60") == (60.0, 70.0)
+    assert matching.split_locations("Kochi, Thrissur and Aluva; Kochi") == ["kochi", "thrissur", "aluva"]
+
+
+def test_score_requests_ranks_by_weighted_features():
+    requests = matching.RequestMatrix([
+        _request("perfect", ["Meals", "bathing"]),
+        _request("far", ["meals", "bathing"], point=DELHI),
+        _request("half", ["meals", "night_care"]),
+        _request("pricey", ["meals"], estimated_budget="10000"),
+        _request("urgent", ["meals"], care_start_date_preference="Immediately"),
+        _request("unknown", [], point=None, recipient_age_range=None, estimated_budget=None),
+    ])
+    caregiver = {"care_services": ["meals", "Bathing"], "expected_charges": "20,000", "age_range": "60-80",
+                 "start_immediately": False}
+
+    scores, parts = matching.score_requests(requests, caregiver, [KOCHI])
+
+    ids = [requests.rows[i]["id"] for i in matching.top_k(scores, 6)]
+    assert ids[0] == "perfect" and scores[0] == pytest.approx(1.0)
+    assert parts["services"][2] == 0.5
+    assert parts["budget"][3] == 0.5
+    assert parts["start"][4] == 0.0
+    assert parts["location"][1] < 1e-10
+    assert {name: values[5] for name, values in parts.items()} == {
+        "services": matching.UNKNOWN, "location": matching.UNKNOWN, "budget": matching.UNKNOWN,
+        "age": matching.UNKNOWN, "start": 1.0}
+    assert [requests.rows[i]["id"] for i in matching.top_k(scores, 2)] == ids[:2]
+
+
+def test_requests_for_me_endpoint(client, supabase_stub, auth_headers):
+    supabase_stub.seed("care_requests", [
+        _request("a", ["meals"]), _request("b", ["bathing"]), _request("closed", ["meals"], status="closed"),
+    ])
+    supabase_stub.seed("caregiver_profiles", [{
+        "user_id": "caregiver-1", "care_services": ["meals"], "availability_locations": "Cochin",
+        "expected_charges": "18000", "age_range": "60-70", "start_immediately": True,
+    }])
+
+    response = client.get("/api/match/requests-for-me", params={"limit": 5}, headers=auth_headers("caregiver-1"))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [m["care_request"]["id"] for m in body] == ["a", "b"]
+    assert body[0]["score"] == 1.0 and body[1]["breakdown"]["services"] == 0.0
+    missing = client.get("/api/match/requests-for-me", headers=auth_headers("nobody"))
+    assert missing.status_code == 404
+
+
+def test_caregivers_for_request_endpoint(client, supabase_stub, auth_headers):
+    supabase_stub.seed("care_requests", [_request("r1", ["meals", "bathing"], point=None, location="Ernakulam")])
+    supabase_stub.seed("caregiver_profiles", [
+        {"user_id": "near", "care_services": ["meals", "bathing"], "availability_locations": "Kochi",
+         "expected_charges": "15000", "age_range": "60-70"},
+        {"user_id": "far", "care_services": ["meals", "bathing"], "availability_locations": "Delhi",
+         "expected_charges": "15000", "age_range": "60-70"},
+        {"user_id": "partial", "care_services": ["meals"], "availability_locations": "Kochi",
+         "expected_charges": "15000", "age_range": "60-70"},
+    ])
+
+    response = client.get("/api/match/caregivers-for-request/r1", headers=auth_headers("seeker-1"))
+
+    assert [m["caregiver"]["user_id"] for m in response.json()] == ["near", "partial", "far"]
+    assert client.get("/api/match/caregivers-for-request/nope", headers=auth_headers("seeker-1")).status_code == 404
+    assert client.get("/api/match/caregivers-for-request/r1", headers=auth_headers("seeker-2")).status_code == 404
+    # The id is one encoded value, not extra query parameters
+    assert client.get("/api/match/caregivers-for-request/r1&limit=5",
+                      headers=auth_headers("seeker-1")).status_code == 404
@@ -0,0 +1,130 @@
+# backend/test_supabase_stub.py
+"""
+Routers driven end to end against the in-process Supabase stand-in.
+
+Run from backend/:
+    python -m pytest -q test_supabase_stub.py
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import care_requests, file_storage
+
+CARE_REQUEST = {
+    "location": "Kochi",
+    "recipient_age_range": "60-70",
+    "care_services_needed": ["bathing", "meals"],
+    "primary_location_type": "home",
+    "care_duration": "long_term",
+    "care_start_date_preference": "immediately",
+    "specific_start_date": None,
+    "caregiver_requirements": None,
+    "transportation_provided": False,
+    "accommodation_provided": True,
+    "food_provided": True,
+    "daily_working_hours": "8",
+    "excluded_schedule_days": None,
+    "estimated_budget": "20000",
+    "special_needs": None,
+    "additional_expectations": None,
+}
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(care_requests.router, prefix="/api/care_requests")
+    app.include_router(file_storage.router, prefix="/api/background-documents")
+    return TestClient(app)
+
+
+def test_create_and_filter_care_requests(supabase_stub, auth_headers):
+    client = _client()
+    created = client.post("/api/care_requests/care_requests", json=CARE_REQUEST, headers=auth_headers("seeker-1"))
+    assert created.status_code == 200
+    assert created.json()[0]["user_id"] == "seeker-1"
+    supabase_stub.seed("care_requests", [{**CARE_REQUEST, "location": "Delhi", "user_id": "seeker-2"}])
+
+    mine = client.get("/api/care_requests/my-care-requests", params={"location": "koch"},
+                      headers=auth_headers("seeker-1"))
+    assert [r["location"] for r in mine.json()] == ["Kochi"]
+
+    available = client.get("/api/care_requests/available-care-requests",
+                           params={"care_services_needed": "meals"}, headers=auth_headers("caregiver-1"))
+    assert {r["location"] for r in available.json()} == {"Kochi", "Delhi"}
+
+
+def test_storage_round_trip(supabase_stub, auth_headers):
+    client = _client()
+    headers = auth_headers("user-1")
+    uploaded = client.post("/api/background-documents/api/background-check-documents/upload",
+                           files={"file": ("id.pdf", b"%PDF-1.4 stub", "application/pdf")},
+                           data={"document_type": "id"}, headers=headers)
+    assert uploaded.status_code == 200
+    path = uploaded.json()["file_path"]
+
+    listed = supabase_stub.list_objects(file_storage.BUCKET, "user-1")
+    assert [entry["name"] for entry in listed] == [path.split("/", 1)[1]]
+
+    downloaded = client.get(f"/api/background-documents/api/background-check-documents/download/{path}",
+                            headers=headers)
+    assert downloaded.content == b"%PDF-1.4 stub"
+
+
+def test_postgrest_filter_grammar(supabase_stub):
+    supabase_stub.seed("items", [
+        {"id": "a", "n": 1, "tags": ["x", "y"], "name": "Alpha", "flag": True},
+        {"id": "b", "n": 2, "tags": ["y"], "name": "beta", "flag": False},
+        {"id": "c", "n": 3, "tags": [], "name": None, "flag": True},
+    ])
+
+    def ids(*params):
+        rows, _ = supabase_stub.select("items", list(params) + [("order", "id.asc")])
+        return [r["id"] for r in rows]
+
+    assert ids(("n", "gte.2")) == ["b", "c"]
+    assert ids(("name", "ilike.*ALP*")) == ["a"]
+    assert ids(("tags", "cs.{y}")) == ["a", "b"]
+    assert ids(("id", "in.(a,c)")) == ["a", "c"]
+    assert ids(("id", "not.in.(a,c)")) == ["b"]
+    assert ids(("name", "is.null")) == ["c"]
+    assert ids(("flag", "eq.true"), ("or", "(n.eq.3,name.eq.Alpha)")) == ["a", "c"]
+    assert ids(("or", "(n.gt.2,and(n.eq.2,id.eq.b))")) == ["b", "c"]
+    rows, _ = supabase_stub.select("items", [("order", "name.desc"), ("select", "id")])
+    assert rows == [{"id": "c"}, {"id": "b"}, {"id": "a"}]
+
+
+def test_login_and_logout_leave_the_shared_client_on_the_service_role(supabase_stub, monkeypatch):
+    import pytest
+
+    pytest.importorskip("email_validator")
+    from routers import session_routes
+    from supabase_client import get_supabase
+    from supabase_stub import StubSupabaseClient
+
+    shared = get_supabase()
+    service_headers = dict(shared.headers)
+    auth_clients = []
+
+    def create_auth_client():
+        auth_clients.append(StubSupabaseClient(supabase_stub))
+        return auth_clients[-1]
+
+    monkeypatch.setattr(session_routes, "create_auth_client", create_auth_client)
+    app = FastAPI()
+    app.include_router(session_routes.router)
+    client = TestClient(app)
+
+    login = client.post("/api/auth/login", json={"email": "seeker@example.com", "password": "secret"})
+    assert login.status_code == 200
+    assert shared.headers == service_headers
+    # The sign-in did switch a client to the user, just not the shared one
+    assert auth_clients[0].headers["Authorization"] == f"Bearer {login.json()['access_token']}"
+
+    registered = client.post("/api/auth/register", json={"email": "new@example.com", "password": "secret",
+                                                         "first_name": "New", "last_name": None,
+                                                         "phone_number": None})
+    assert registered.status_code == 200
+    assert shared.headers == service_headers
+    assert [row["first_name"] for row in supabase_stub.rows("profiles")] == ["New"]
+    assert len(auth_clients) == 2
@@ -0,0 +1,135 @@
+# backend/tracing.py
+"""
+Upstream call instrumentation: PostgREST, Supabase Storage and asyncpg.
+
+Every outbound call is recorded twice:
+  * process-wide series on metrics.REGISTRY (count, latency, bytes, errors)
+    labelled by kind (postgrest / storage / db), target (table or bucket)
+    and operation, and
+  * a per-request tally that ServerTimingMiddleware turns into a
+    `Server-Timing` response header, e.g.
+        Server-Timing: db;dur=12.4;desc="3 calls", storage;dur=88.0;desc="1 call", app;dur=4.1, total;dur=104.5
+    so a slow endpoint shows at a glance where its time went.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+import metrics
+
+UPSTREAM_LATENCY = metrics.REGISTRY.histogram(
+    "upstream_request_duration_seconds", "Outbound call latency by kind, target and operation",
+    ("kind", "target", "op"))
+UPSTREAM_CALLS = metrics.REGISTRY.counter(
+    "upstream_requests_total", "Outbound calls by kind, target, operation and outcome",
+    ("kind", "target", "op", "outcome"))
+UPSTREAM_BYTES = metrics.REGISTRY.counter(
+    "upstream_bytes_total", "Bytes sent and received on outbound calls",
+    ("kind", "target", "direction"))
+
+# kind -> [total seconds, calls] for the request being served
+_request_timings: ContextVar[Optional[dict]] = ContextVar("request_timings", default=None)
+
+_STORAGE_PATH = re.compile(r"^/storage/v1/object/(?:(?:public|sign|authenticated|info|list)/)?([^/?]+)")
+_REST_PATH = re.compile(r"^/rest/v1/(?:rpc/)?([^/?]+)")
+_SQL_TARGET = re.compile(r"\b(?:from|into|update|join)\s+([\"\w.]+)", re.IGNORECASE)
+
+
+def classify_url(method: str, url: str) -> Tuple[str, str, str]:
+    """Map a Supabase URL to (kind, target, op) labels."""
+    path = urlsplit(url).path
+    match = _REST_PATH.match(path)
+    if match:
+        return "postgrest", match.group(1), method.lower()
+    match = _STORAGE_PATH.match(path)
+    if match:
+        return "storage", match.group(1), method.lower()
+    return "http", "other", method.lower()
+
+
+@lru_cache(maxsize=512)
+def classify_sql(query: str) -> Tuple[str, str]:
+    """(target table, operation) for a SQL statement, cached per statement text."""
+    stripped = query.lstrip()
+    op = stripped.split(None, 1)[0].lower() if stripped else "unknown"
+    match = _SQL_TARGET.search(query)
+    target = match.group(1).strip('"').split(".")[-1].strip('"') if match else "none"
+    return target, op
+
+
+def record(kind: str, target: str, op: str, elapsed: float,
+           sent: int = 0, received: int = 0, error: bool = False):
+    UPSTREAM_LATENCY.observe(elapsed, kind=kind, target=target, op=op)
+    UPSTREAM_CALLS.inc(kind=kind, target=target, op=op, outcome="error" if error else "ok")
+    if sent:
+        UPSTREAM_BYTES.inc(sent, kind=kind, target=target, direction="sent")
+    if received:
+        UPSTREAM_BYTES.inc(received, kind=kind, target=target, direction="received")
+
+    timings = _request_timings.get()
+    if timings is not None:
+        tally = timings.setdefault(kind, [0.0, 0])
+        tally[0] += elapsed
+        tally[1] += 1
+
+
+@contextmanager
+def span(kind: str, target: str, op: str):
+    """
+    Time a block that calls an upstream without going through supabase_rest
+    or the pool (e.g. the Supabase SDK). Set `info["received"]` / `info["sent"]`
+    inside the block to record payload sizes.
+    """
+    info = {"sent": 0, "received": 0}
+    start = time.perf_counter()
+    error = True
+    try:
+        yield info
+        error = False
+    finally:
+        record(kind, target, op, time.perf_counter() - start,
+               sent=info["sent"], received=info["received"], error=error)
+
+
+def server_timing_header(timings: dict, total: float) -> str:
+    parts = []
+    upstream = 0.0
+    for kind, (elapsed, calls) in sorted(timings.items()):
+        upstream += elapsed
+        label = "call" if calls == 1 else "calls"
+        parts.append(f'{kind};dur={elapsed * 1000:.1f};desc="{calls} {label}"')
+    parts.append(f"app;dur={max(total - upstream, 0.0) * 1000:.1f}")
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """Collect upstream timings for each HTTP request and emit them as Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                header = server_timing_header(timings, time.perf_counter() - start)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", header.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)